@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Admission Control for Report Generation
+
+Bounds how many report generations run at once in a worker. Requests
+beyond the limit wait in a short queue; once the queue is full, or a
+queued request waits too long, it is rejected immediately so the caller
+can answer 503 with a Retry-After hint instead of piling more work onto a
+saturated host.
+"""
+
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted; carries a Retry-After hint in seconds."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Concurrency limiter with a bounded wait queue and wait-time metrics."""
+
+    def __init__(self, max_concurrent: int = 4, max_queue: int = 8, queue_timeout: float = 5.0):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self._cond = threading.Condition()
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self._avg_service_seconds = 1.0  # Exponentially weighted, seeds Retry-After
+
+    def _retry_after(self) -> int:
+        # Time for the work already ahead of this caller to drain
+        backlog = self.active + self.waiting
+        return max(1, math.ceil(self._avg_service_seconds * backlog / self.max_concurrent))
+
+    @contextmanager
+    def slot(self):
+        """Hold one generation slot for the duration of the block or raise AdmissionRejected."""
+        start = time.monotonic()
+        with self._cond:
+            if self.active >= self.max_concurrent:
+                if self.waiting >= self.max_queue:
+                    self.rejected_queue_full += 1
+                    raise AdmissionRejected("queue full", self._retry_after())
+                self.waiting += 1
+                try:
+                    admitted = self._cond.wait_for(lambda: self.active < self.max_concurrent,
+                                                   timeout=self.queue_timeout)
+                finally:
+                    self.waiting -= 1
+                if not admitted:
+                    self.rejected_timeout += 1
+                    raise AdmissionRejected("queue wait timed out", self._retry_after())
+            self.active += 1
+            self.admitted += 1
+            waited = time.monotonic() - start
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+        service_start = time.monotonic()
+        try:
+            yield
+        finally:
+            service_time = time.monotonic() - service_start
+            with self._cond:
+                self.active -= 1
+                self._avg_service_seconds = 0.8 * self._avg_service_seconds + 0.2 * service_time
+                self._cond.notify()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'active': self.active,
+                'queue_depth': self.waiting,
+                'admitted': self.admitted,
+                'rejected_queue_full': self.rejected_queue_full,
+                'rejected_timeout': self.rejected_timeout,
+                'wait_seconds_total': round(self.total_wait_seconds, 6),
+                'wait_seconds_max': round(self.max_wait_seconds, 6),
+                'wait_seconds_avg': round(self.total_wait_seconds / self.admitted, 6) if self.admitted else 0.0,
+                'service_seconds_avg': round(self._avg_service_seconds, 6)
+            }
+
+
+def create_admission_controller_from_env() -> AdmissionController:
+    """Build the controller configured through the environment.
+
+    MATRIX_MAX_CONCURRENT_REPORTS   generations running at once per worker (default: one
+                                    less than GUNICORN_THREADS, so a thread is left for
+                                    downloads, previews and queued requests)
+    MATRIX_REPORT_QUEUE_SIZE        requests allowed to wait for a slot (default: the
+                                    threads not running a generation, at least 1; a
+                                    waiting request holds a thread, so a deeper queue
+                                    could never fill)
+    MATRIX_REPORT_QUEUE_TIMEOUT     seconds a queued request waits before rejection (default 5)
+    """
+    threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+    max_concurrent = int(os.environ.get('MATRIX_MAX_CONCURRENT_REPORTS', max(1, threads - 1)))
+    return AdmissionController(
+        max_concurrent=max_concurrent,
+        max_queue=int(os.environ.get('MATRIX_REPORT_QUEUE_SIZE', max(1, threads - max_concurrent))),
+        queue_timeout=float(os.environ.get('MATRIX_REPORT_QUEUE_TIMEOUT', '5'))
+    )
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Parallel Competitor Analysis
+
+Fans the per-competitor analyses of one report out over a thread or
+process pool and merges the results back in the order the competitors
+were selected, so the report is the same whichever analysis finishes
+first. Each competitor gets a time budget; one that runs over is left
+out of the report instead of holding up the whole request.
+"""
+
+import math
+import os
+import threading
+import time
+from concurrent.futures import (FIRST_COMPLETED, Executor, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from typing import Any, Callable, List, Optional, Tuple
+
+from cache_backends import get_cache
+
+EXECUTOR_KINDS = ('serial', 'thread', 'process')
+DEFAULT_TIMEOUT_SECONDS = 30.0
+QUEUE_POLL_SECONDS = 0.05  # How often queued analyses are checked for having started
+
+# Engine used inside process-pool workers, built once per worker process
+_process_engine = None
+
+
+def _init_process_engine() -> None:
+    global _process_engine
+    from competitive_analysis import CompetitiveAnalysisEngine
+    _process_engine = CompetitiveAnalysisEngine(cache=get_cache())
+
+
+def _analyze_in_process(competitor_name: str, selected_languages: List[str]):
+    return _process_engine.analyze_competitor(competitor_name, selected_languages)
+
+
+class CompetitorAnalysisExecutor:
+    """Run analyze_competitor for several competitors serially or on a pool."""
+
+    def __init__(self, kind: str = 'thread', max_workers: Optional[int] = None,
+                 timeout: Optional[float] = DEFAULT_TIMEOUT_SECONDS):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown analysis executor '{kind}', expected one of {', '.join(EXECUTOR_KINDS)}")
+        self.kind = kind
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.timeout = timeout
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> Executor:
+        # Created on first use, so under gunicorn each worker gets its own
+        # pool after forking rather than inheriting the master's
+        with self._lock:
+            if self._pool is None:
+                if self.kind == 'process':
+                    self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                     initializer=_init_process_engine)
+                else:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='competitor-analysis')
+            return self._pool
+
+    def analyze(self, engine, competitors: List[str], selected_languages: List[str],
+                on_result: Optional[Callable[[int, str, Any], None]] = None) -> List[Tuple[str, Any]]:
+        """Return [(competitor, analysis)] in input order; analysis is None on failure or timeout.
+
+        on_result(index, competitor, analysis) is called in the caller's
+        thread as each analysis completes, in completion order.
+        """
+        results: List[Any] = [None] * len(competitors)
+
+        if self.kind == 'serial' or len(competitors) <= 1:
+            for index, competitor in enumerate(competitors):
+                try:
+                    results[index] = engine.analyze_competitor(competitor, selected_languages)
+                except Exception as e:
+                    print(f"Error analyzing {competitor}: {e}")
+                if on_result:
+                    on_result(index, competitor, results[index])
+            return list(zip(competitors, results))
+
+        pool = self._get_pool()
+        if self.kind == 'process':
+            futures = {pool.submit(_analyze_in_process, competitor, selected_languages): index
+                       for index, competitor in enumerate(competitors)}
+        else:
+            futures = {pool.submit(engine.analyze_competitor, competitor, selected_languages): index
+                       for index, competitor in enumerate(competitors)}
+
+        # Each competitor gets `timeout` seconds from when a worker picks it
+        # up, so one hung analysis never uses up the budget of those queued
+        # behind it. A competitor still queued after every round's budget
+        # (all workers stuck) is given up on as well.
+        queue_deadline = None
+        if self.timeout:
+            queue_deadline = time.monotonic() + self.timeout * math.ceil(len(competitors) / self.max_workers)
+        started = {}
+        timed_out = []
+        pending = set(futures)
+        while pending:
+            remaining = None
+            if self.timeout:
+                now = time.monotonic()
+                for future in pending:
+                    if future not in started and future.running():
+                        started[future] = now
+                expired = {future for future in pending
+                           if now - started.get(future, now) >= self.timeout
+                           or (future not in started and now >= queue_deadline)}
+                timed_out.extend(expired)
+                pending -= expired
+                if not pending:
+                    break
+                deadlines = [started[future] + self.timeout for future in pending if future in started]
+                if len(deadlines) < len(pending):
+                    # Queued analyses start their clock when they start running
+                    deadlines.append(min(now + QUEUE_POLL_SECONDS, queue_deadline))
+                remaining = max(0.0, min(deadlines) - now)
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    print(f"Error analyzing {competitors[index]}: {e}")
+                if on_result:
+                    on_result(index, competitors[index], results[index])
+
+        for future in timed_out:
+            future.cancel()
+            print(f"Warning: Analysis of {competitors[futures[future]]} timed out after {self.timeout}s")
+        return list(zip(competitors, results))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+def create_analysis_executor_from_env() -> CompetitorAnalysisExecutor:
+    """Build the executor configured through the environment.
+
+    MATRIX_ANALYSIS_EXECUTOR   serial, thread (default) or process
+    MATRIX_ANALYSIS_WORKERS    pool size (default: CPU count, at most 8)
+    MATRIX_ANALYSIS_TIMEOUT    seconds allowed per competitor (default 30, 0 = no limit)
+    """
+    workers = os.environ.get('MATRIX_ANALYSIS_WORKERS')
+    timeout = float(os.environ.get('MATRIX_ANALYSIS_TIMEOUT', DEFAULT_TIMEOUT_SECONDS))
+    return CompetitorAnalysisExecutor(
+        kind=os.environ.get('MATRIX_ANALYSIS_EXECUTOR', 'thread').strip().lower(),
+        max_workers=int(workers) if workers else None,
+        timeout=timeout if timeout > 0 else None
+    )
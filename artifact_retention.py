@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Artifact Retention for output/
+
+Generated reports accumulate in output/ (an HTML and a CSV file per
+customer). The retention manager keeps that directory within a byte
+budget and a maximum age, evicting the least recently used artifacts
+first. Last access is tracked through the file mtime, which downloads and
+previews refresh, so every worker process and a scheduled sweep see the
+same ordering.
+
+Run a one-off sweep (for example from cron) with:
+
+    python artifact_retention.py
+"""
+
+import argparse
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(BASE_DIR, 'output')
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+DEFAULT_MAX_AGE_DAYS = 30
+DEFAULT_SWEEP_INTERVAL = 600  # seconds
+
+
+def artifact_id(filename: str) -> str:
+    """Artifact ID shared by a report's HTML and CSV files (e.g. "Acme_matrix")."""
+    return os.path.splitext(os.path.basename(filename))[0]
+
+
+class ArtifactRetentionManager:
+    """Byte- and age-bounded LRU eviction for report artifacts."""
+
+    def __init__(self, output_dir: str = OUTPUT_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_age_seconds: Optional[float] = DEFAULT_MAX_AGE_DAYS * 86400):
+        self.output_dir = output_dir
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        self.sweeps = 0
+        self.last_sweep = None
+
+    def record_access(self, path: str) -> bool:
+        """Count a hit or miss for an artifact lookup and refresh its last-access time."""
+        try:
+            os.utime(path, None)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return False
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def _scan(self) -> Dict[str, List[Tuple[str, int, float]]]:
+        artifacts = {}
+        try:
+            with os.scandir(self.output_dir) as it:
+                for entry in it:
+                    if not entry.is_file() or entry.name.endswith('.tmp'):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    artifacts.setdefault(artifact_id(entry.name), []).append(
+                        (entry.path, stat.st_size, stat.st_mtime)
+                    )
+        except FileNotFoundError:
+            pass
+        return artifacts
+
+    def _evict(self, files: List[Tuple[str, int, float]]) -> int:
+        freed = 0
+        for path, size, _ in files:
+            try:
+                os.remove(path)
+                freed += size
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Warning: Could not evict {path}: {e}")
+        with self._lock:
+            self.evictions += 1
+            self.evicted_bytes += freed
+        return freed
+
+    def sweep(self) -> Dict[str, int]:
+        """Evict expired artifacts, then least recently used ones until under the byte budget."""
+        now = time.time()
+        artifacts = self._scan()
+        # Sort oldest access first; an artifact's files are evicted together
+        ordered = sorted(
+            artifacts.values(),
+            key=lambda files: max(mtime for _, _, mtime in files)
+        )
+        total = sum(size for files in ordered for _, size, _ in files)
+        evicted = 0
+        for files in ordered:
+            last_access = max(mtime for _, _, mtime in files)
+            expired = self.max_age_seconds is not None and now - last_access > self.max_age_seconds
+            if not expired and total <= self.max_bytes:
+                break
+            total -= self._evict(files)
+            evicted += 1
+        with self._lock:
+            self.sweeps += 1
+            self.last_sweep = now
+        return {'artifacts': len(ordered) - evicted, 'bytes': total, 'evicted': evicted}
+
+    def start_background(self, interval: float = DEFAULT_SWEEP_INTERVAL) -> None:
+        """Sweep every `interval` seconds on a daemon thread (call after forking)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.sweep()
+                except Exception as e:
+                    print(f"Warning: Artifact retention sweep failed: {e}")
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=run, name='artifact-retention', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'max_bytes': self.max_bytes,
+                'max_age_seconds': self.max_age_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'evicted_bytes': self.evicted_bytes,
+                'sweeps': self.sweeps,
+                'last_sweep': self.last_sweep
+            }
+
+
+def create_retention_manager_from_env(output_dir: str = OUTPUT_DIR) -> ArtifactRetentionManager:
+    """Build the manager configured through the environment.
+
+    MATRIX_OUTPUT_MAX_BYTES      byte budget for output/ (default 500 MB)
+    MATRIX_OUTPUT_MAX_AGE_DAYS   evict artifacts not accessed for this long (default 30, 0 = never)
+    """
+    max_age_days = float(os.environ.get('MATRIX_OUTPUT_MAX_AGE_DAYS', DEFAULT_MAX_AGE_DAYS))
+    return ArtifactRetentionManager(
+        output_dir=output_dir,
+        max_bytes=int(os.environ.get('MATRIX_OUTPUT_MAX_BYTES', DEFAULT_MAX_BYTES)),
+        max_age_seconds=max_age_days * 86400 if max_age_days > 0 else None
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evict old report artifacts from output/")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help="Directory holding generated reports")
+    args = parser.parse_args()
+
+    manager = create_retention_manager_from_env(args.output_dir)
+    result = manager.sweep()
+    print(f"Evicted {result['evicted']} artifacts; {result['artifacts']} remain "
+          f"using {result['bytes']:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
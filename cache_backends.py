@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Cache Backends
+
+Pluggable cache used by the competitive analysis engine and the report
+writers. Three backends share one interface:
+
+- memory: per-process LRU (the default)
+- filesystem: one pickle file per key in a directory, shared by every
+  worker on the host
+- sqlite: a single SQLite database file, shared by every worker on the host
+
+The backend is selected through environment variables (see
+create_cache_from_env). All backends support per-entry TTLs and evict
+least-recently-used entries once their size bound is exceeded.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(BASE_DIR, 'data', 'cache')
+DEFAULT_TTL_SECONDS = 24 * 3600
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+ACCESS_UPDATE_INTERVAL = 60  # seconds; the SQLite backend refreshes recency at most this often
+
+_MISSING = object()
+
+
+def make_cache_key(namespace: str, *parts: Any) -> str:
+    """Build a stable cache key from JSON-serializable parts."""
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(',', ':'))
+    return f"{namespace}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+def _value_size(value: Any) -> int:
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    return len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+
+class CacheBackend(ABC):
+    """Common interface and hit/miss/eviction counters for all backends.
+
+    The counters are shared by every thread using the backend, so they are
+    only updated under ``_stats_lock``.
+    """
+
+    name = "base"
+
+    def __init__(self, default_ttl: Optional[float] = DEFAULT_TTL_SECONDS):
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._stats_lock = threading.Lock()
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        if amount:
+            with self._stats_lock:
+                setattr(self, counter, getattr(self, counter) + amount)
+
+    def _expires_at(self, ttl: Optional[float]) -> Optional[float]:
+        ttl = self.default_ttl if ttl is None else ttl
+        return time.time() + ttl if ttl else None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._get(key)
+        if value is _MISSING:
+            self._count('misses')
+            return default
+        self._count('hits')
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._set(key, value, self._expires_at(ttl))
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove one entry; missing keys are ignored."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                'backend': self.name,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+    @abstractmethod
+    def _get(self, key: str) -> Any:
+        """Return the stored value, or _MISSING when absent or expired."""
+
+    @abstractmethod
+    def _set(self, key: str, value: Any, expires_at: Optional[float]) -> None:
+        """Store a value with an absolute expiry time (None means never)."""
+
+
+class MemoryLRUCache(CacheBackend):
+    """In-process LRU bounded by entry count and, optionally, total bytes."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: Optional[int] = None,
+                 default_ttl: Optional[float] = DEFAULT_TTL_SECONDS):
+        super().__init__(default_ttl)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # key -> (value, expires_at, size)
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            value, expires_at, size = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                self.total_bytes -= size
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key: str, value: Any, expires_at: Optional[float]) -> None:
+        size = _value_size(value) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[2]
+            self._entries[key] = (value, expires_at, size)
+            self.total_bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes and self.total_bytes > self.max_bytes)
+            ):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self._count('evictions')
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.total_bytes -= entry[2]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats.update({'entries': len(self._entries), 'bytes': self.total_bytes})
+        return stats
+
+
+class FileSystemCache(CacheBackend):
+    """One pickle file per key; access time is tracked through the file mtime."""
+
+    name = "filesystem"
+    CULL_EVERY = 32  # Check the byte budget every N writes
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 default_ttl: Optional[float] = DEFAULT_TTL_SECONDS):
+        super().__init__(default_ttl)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._writes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.cache')
+
+    def _get(self, key: str) -> Any:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                expires_at, value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return _MISSING
+        if expires_at is not None and expires_at <= time.time():
+            self._remove(path)
+            return _MISSING
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return value
+
+    def _set(self, key: str, value: Any, expires_at: Optional[float]) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((expires_at, value), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            self._remove(tmp_path)
+            print(f"Warning: Could not write cache entry: {e}")
+            return
+        self._writes += 1
+        if self._writes % self.CULL_EVERY == 0:
+            self.cull()
+
+    def _remove(self, path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def cull(self) -> None:
+        """Drop expired entries, then least-recently-used ones until under the byte budget."""
+        entries = []
+        total = 0
+        now = time.time()
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith('.cache'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        entries.sort()
+        for mtime, size, path in entries:
+            if total <= self.max_bytes and now - mtime <= (self.default_ttl or float('inf')):
+                break
+            if self._remove(path):
+                total -= size
+                self._count('evictions')
+
+    def delete(self, key: str) -> None:
+        self._remove(self._path(key))
+
+    def clear(self) -> None:
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith('.cache'):
+                    self._remove(entry.path)
+
+
+class SQLiteCache(CacheBackend):
+    """Single SQLite file in WAL mode, safe to share between worker processes."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str = os.path.join(DEFAULT_CACHE_DIR, 'cache.sqlite3'),
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 default_ttl: Optional[float] = DEFAULT_TTL_SECONDS):
+        super().__init__(default_ttl)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache (accessed_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache (expires_at)")
+            # Running byte total, kept by triggers so writes never sum the table
+            conn.execute("CREATE TABLE IF NOT EXISTS cache_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO cache_meta (key, value) "
+                         "SELECT 'total_bytes', COALESCE(SUM(size), 0) FROM cache")
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS cache_size_insert AFTER INSERT ON cache BEGIN
+                    UPDATE cache_meta SET value = value + new.size WHERE key = 'total_bytes';
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS cache_size_delete AFTER DELETE ON cache BEGIN
+                    UPDATE cache_meta SET value = value - old.size WHERE key = 'total_bytes';
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS cache_size_update AFTER UPDATE OF size ON cache BEGIN
+                    UPDATE cache_meta SET value = value + new.size - old.size WHERE key = 'total_bytes';
+                END
+            """)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections must not cross a fork, so they are keyed by pid as well as thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _get(self, key: str) -> Any:
+        conn = self._connection()
+        row = conn.execute("SELECT value, expires_at, accessed_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return _MISSING
+        value, expires_at, accessed_at = row
+        now = time.time()
+        if expires_at is not None and expires_at <= now:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            return _MISSING
+        # Recency only needs to be coarse for LRU eviction, so most hits stay read-only
+        if now - accessed_at >= ACCESS_UPDATE_INTERVAL:
+            conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return pickle.loads(value)
+
+    def _set(self, key: str, value: Any, expires_at: Optional[float]) -> None:
+        blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # An upsert (not INSERT OR REPLACE) so the size triggers see the old row
+            conn.execute(
+                "INSERT INTO cache (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+                "expires_at = excluded.expires_at, accessed_at = excluded.accessed_at",
+                (key, sqlite3.Binary(blob), len(blob), expires_at, now)
+            )
+            expired = conn.execute("DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)).rowcount
+            total = self._total_bytes(conn)
+            evicted = 0
+            if total > self.max_bytes:
+                for old_key, size in conn.execute("SELECT key, size FROM cache ORDER BY accessed_at").fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    conn.execute("DELETE FROM cache WHERE key = ?", (old_key,))
+                    total -= size
+                    evicted += 1
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._count('evictions', expired + evicted)
+
+    def _total_bytes(self, conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT value FROM cache_meta WHERE key = 'total_bytes'").fetchone()[0]
+
+    def delete(self, key: str) -> None:
+        self._connection().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM cache")
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        conn = self._connection()
+        entries = conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        total = self._total_bytes(conn)
+        stats.update({'entries': entries, 'bytes': total})
+        return stats
+
+
+def create_cache_from_env() -> Optional[CacheBackend]:
+    """Build the cache configured through the environment.
+
+    MATRIX_CACHE_BACKEND       memory (default), filesystem, sqlite or none
+    MATRIX_CACHE_PATH          directory (filesystem) or database file (sqlite)
+    MATRIX_CACHE_TTL           default entry lifetime in seconds (0 = no expiry)
+    MATRIX_CACHE_MAX_ENTRIES   entry bound for the memory backend
+    MATRIX_CACHE_MAX_BYTES     byte bound for the filesystem and sqlite backends
+    """
+    backend = os.environ.get('MATRIX_CACHE_BACKEND', 'memory').strip().lower()
+    ttl = float(os.environ.get('MATRIX_CACHE_TTL', DEFAULT_TTL_SECONDS))
+    max_bytes = int(os.environ.get('MATRIX_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+
+    if backend in ('', 'none', 'off'):
+        return None
+    if backend == 'memory':
+        max_entries = int(os.environ.get('MATRIX_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES))
+        return MemoryLRUCache(max_entries=max_entries, default_ttl=ttl)
+    if backend == 'filesystem':
+        return FileSystemCache(os.environ.get('MATRIX_CACHE_PATH', DEFAULT_CACHE_DIR), max_bytes, ttl)
+    if backend == 'sqlite':
+        path = os.environ.get('MATRIX_CACHE_PATH', os.path.join(DEFAULT_CACHE_DIR, 'cache.sqlite3'))
+        return SQLiteCache(path, max_bytes, ttl)
+    raise ValueError(f"Unknown MATRIX_CACHE_BACKEND: {backend}")
+
+
+_shared_cache = _MISSING
+_shared_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[CacheBackend]:
+    """Return the process-wide cache configured by create_cache_from_env."""
+    global _shared_cache
+    if _shared_cache is _MISSING:
+        with _shared_cache_lock:
+            if _shared_cache is _MISSING:
+                _shared_cache = create_cache_from_env()
+    return _shared_cache
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Language Capability Index
+
+Packs each catalog language's Semgrep features (semgrep_docs in
+languages.json) into bitsets, one bit per language, so multi-criteria
+questions are answered with a few bitwise operations instead of walking
+every record:
+
+    ga and cross-file and reachability and licenses and lockfileless
+    (beta or experimental) and not malicious_dependencies
+
+Terms are case-insensitive. Each boolean feature is a term under its field
+name (reachability, open_source_licenses, malicious_dependencies,
+scan_without_lockfiles, framework_specific) and a short alias (licenses,
+malicious, lockfileless, frameworks). Maturity is `ga`, `beta` or
+`experimental` (also `maturity:ga`). Dataflow is `dataflow:cross-file`,
+`dataflow:cross-function` or `dataflow:none`; a level alone (`cross-file`)
+works too, and `dataflow` alone means any dataflow. Operators are AND, OR,
+NOT and parentheses; adjacent terms are ANDed.
+
+    python capability_index.py "ga and reachability and not lockfileless"
+"""
+
+import argparse
+import re
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from catalog import load_catalog
+
+BOOLEAN_FEATURES = {
+    'reachability': 'reachability',
+    'open_source_licenses': 'licenses',
+    'malicious_dependencies': 'malicious',
+    'scan_without_lockfiles': 'lockfileless',
+    'framework_specific': 'frameworks',
+}
+MATURITY_LEVELS = ('ga', 'beta', 'experimental')
+
+MAX_COMPILED = 1024
+_TOKEN = re.compile(r'\s*(\(|\)|[^\s()]+)')
+_OPERATORS = ('and', 'or', 'not')
+
+
+class CapabilityIndex:
+    """Feature bitsets over the catalog languages for one catalog version."""
+
+    def __init__(self, languages: List[Dict[str, Any]], version: str = ''):
+        self.version = version
+        self.languages = [lang.get('language', '') for lang in languages]
+        self.all = (1 << len(self.languages)) - 1
+        self.bitsets: Dict[str, int] = {}
+        for field, alias in BOOLEAN_FEATURES.items():
+            self.bitsets[field] = 0
+            self.bitsets[alias] = 0
+        for level in MATURITY_LEVELS:
+            self.bitsets[level] = 0
+        self.bitsets['dataflow'] = 0
+
+        for position, lang in enumerate(languages):
+            bit = 1 << position
+            docs = lang.get('semgrep_docs') or {}
+            for field, alias in BOOLEAN_FEATURES.items():
+                if docs.get(field):
+                    self.bitsets[field] |= bit
+                    self.bitsets[alias] |= bit
+            maturity = '-'.join(str(docs.get('maturity') or lang.get('maturity') or '').lower().split())
+            if maturity:
+                self._add(maturity, bit)
+                self._add(f"maturity:{maturity}", bit)
+            dataflow = '-'.join(str(docs.get('dataflow') or 'none').lower().split())
+            self._add(f"dataflow:{dataflow}", bit)
+            if dataflow != 'none':
+                self._add(dataflow, bit)
+                self.bitsets['dataflow'] |= bit
+        for level in MATURITY_LEVELS:
+            self.bitsets.setdefault(f"maturity:{level}", 0)
+
+        self._compiled: Dict[str, Tuple] = {}
+        self._lock = threading.Lock()
+
+    def _add(self, term: str, bit: int) -> None:
+        self.bitsets[term] = self.bitsets.get(term, 0) | bit
+
+    def terms(self) -> List[str]:
+        """Every term a query may use."""
+        return sorted(self.bitsets)
+
+    def compile(self, expression: str) -> Tuple:
+        """Parse an expression into a nested tuple tree; raises ValueError on a malformed query."""
+        key = ' '.join(expression.lower().split())
+        tree = self._compiled.get(key)
+        if tree is None:
+            tree = _Parser(key, self.bitsets).parse()
+            with self._lock:
+                if len(self._compiled) >= MAX_COMPILED:
+                    self._compiled.clear()
+                self._compiled[key] = tree
+        return tree
+
+    def mask(self, expression: str) -> int:
+        """Bitset of the languages matching an expression; an empty expression matches all."""
+        return self._evaluate(self.compile(expression))
+
+    def _evaluate(self, node: Tuple) -> int:
+        kind = node[0]
+        if kind == 'term':
+            return self.bitsets[node[1]]
+        if kind == 'all':
+            return self.all
+        if kind == 'not':
+            return self.all & ~self._evaluate(node[1])
+        result = self._evaluate(node[1])
+        for operand in node[2:]:
+            if kind == 'and':
+                if not result:
+                    break
+                result &= self._evaluate(operand)
+            else:
+                result |= self._evaluate(operand)
+        return result
+
+    def query(self, expression: str) -> List[str]:
+        """Names of the matching languages, in catalog order."""
+        mask = self.mask(expression)
+        return [name for position, name in enumerate(self.languages) if mask >> position & 1]
+
+
+class _Parser:
+    """Recursive descent over: or := and (OR and)*; and := not (AND? not)*; not := NOT not | term | (or)."""
+
+    def __init__(self, expression: str, bitsets: Dict[str, int]):
+        self.tokens = _TOKEN.findall(expression)
+        self.position = 0
+        self.bitsets = bitsets
+
+    def parse(self) -> Tuple:
+        if not self.tokens:
+            return ('all',)
+        node = self._or()
+        if self.position < len(self.tokens):
+            raise ValueError(f"Unexpected {self.tokens[self.position]!r} in capability query")
+        return node
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _or(self) -> Tuple:
+        operands = [self._and()]
+        while self._peek() == 'or':
+            self.position += 1
+            operands.append(self._and())
+        return operands[0] if len(operands) == 1 else ('or', *operands)
+
+    def _and(self) -> Tuple:
+        operands = [self._not()]
+        while self._peek() not in (None, 'or', ')'):
+            if self._peek() == 'and':
+                self.position += 1
+            operands.append(self._not())
+        return operands[0] if len(operands) == 1 else ('and', *operands)
+
+    def _not(self) -> Tuple:
+        token = self._peek()
+        if token is None:
+            raise ValueError("Capability query ends unexpectedly")
+        self.position += 1
+        if token == 'not':
+            return ('not', self._not())
+        if token == '(':
+            node = self._or()
+            if self._peek() != ')':
+                raise ValueError("Missing ')' in capability query")
+            self.position += 1
+            return node
+        if token in self.bitsets:
+            return ('term', token)
+        if token in _OPERATORS or token == ')':
+            raise ValueError(f"Unexpected {token!r} in capability query")
+        raise ValueError(f"Unknown capability {token!r}; use one of: {', '.join(sorted(self.bitsets))}")
+
+
+_index: Optional[CapabilityIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_capability_index(catalog=None) -> CapabilityIndex:
+    """Return the index for the current catalog, rebuilding it when the catalog changes."""
+    global _index
+    catalog = catalog or load_catalog()
+    index = _index
+    if index is not None and index.version == catalog.version:
+        return index
+    with _index_lock:
+        if _index is None or _index.version != catalog.version:
+            _index = CapabilityIndex(catalog.languages, catalog.version)
+        return _index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List catalog languages matching a capability query")
+    parser.add_argument("query", nargs='?', default='',
+                        help='e.g. "ga and cross-file and reachability and not lockfileless"')
+    parser.add_argument("--terms", action="store_true", help="List the terms a query may use")
+    args = parser.parse_args()
+
+    index = get_capability_index()
+    if args.terms:
+        print('\n'.join(index.terms()))
+        return
+    try:
+        matches = index.query(args.query)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    for name in matches:
+        print(name)
+    print(f"{len(matches)} of {len(index.languages)} languages")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Catalog Snapshot
+
+Loads languages.json and scms.json once per data version so the web
+interfaces, the analysis engine and the CLI share one parsed copy of the
+catalog instead of re-reading both files on every request. Each snapshot
+also keeps both files serialized as compact JSON, with an ETag, for the
+catalog API endpoints.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LANGUAGES_JSON = os.path.join(BASE_DIR, 'languages.json')
+SCMS_JSON = os.path.join(BASE_DIR, 'scms.json')
+
+_LIST_SEPARATORS = re.compile(r'[,;\n]')
+
+
+def split_names(value: Any) -> List[str]:
+    """Names from a catalog field stored as a list or as a delimited string, without blanks or duplicates."""
+    if not value:
+        return []
+    items = value if isinstance(value, list) else _LIST_SEPARATORS.split(str(value))
+    names = []
+    for item in items:
+        name = str(item).strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+@dataclass
+class CatalogSnapshot:
+    languages: List[Dict[str, Any]]
+    scms: List[Dict[str, Any]]
+    version: str  # Content hash of languages.json + scms.json
+    languages_by_name: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    scms_by_name: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    languages_json: bytes = b''  # Compact serialization served by /api/catalog/languages
+    scms_json: bytes = b''
+    languages_etag: str = ''
+    scms_etag: str = ''
+
+    def get_language_info(self, language_name: str) -> Optional[Dict[str, Any]]:
+        """Look up a language record by case-insensitive name."""
+        return self.languages_by_name.get(language_name.lower())
+
+    def get_scm_info(self, scm_name: str) -> Optional[Dict[str, Any]]:
+        """Look up an SCM record by case-insensitive name."""
+        return self.scms_by_name.get(scm_name.lower())
+
+
+_snapshot: Optional[CatalogSnapshot] = None
+_snapshot_signature: Optional[Tuple] = None
+_snapshot_lock = threading.Lock()
+
+
+def _file_signature(path: str) -> Tuple[str, int, int]:
+    stat = os.stat(path)
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+
+def _serialize(value: Any) -> Tuple[bytes, str]:
+    body = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return body, hashlib.sha256(body).hexdigest()[:32]
+
+
+def _build_snapshot() -> CatalogSnapshot:
+    with open(LANGUAGES_JSON, 'rb') as f:
+        languages_raw = f.read()
+    with open(SCMS_JSON, 'rb') as f:
+        scms_raw = f.read()
+
+    languages = json.loads(languages_raw)
+    scms = json.loads(scms_raw)
+
+    digest = hashlib.sha256()
+    digest.update(languages_raw)
+    digest.update(b'\0')
+    digest.update(scms_raw)
+
+    languages_by_name = {}
+    for lang in languages:
+        # First entry wins, matching the linear lookup this replaces
+        languages_by_name.setdefault(lang['language'].lower(), lang)
+    scms_by_name = {}
+    for scm in scms:
+        scms_by_name.setdefault(scm['scm'].lower(), scm)
+    languages_json, languages_etag = _serialize(languages)
+    scms_json, scms_etag = _serialize(scms)
+
+    return CatalogSnapshot(
+        languages=languages,
+        scms=scms,
+        version=digest.hexdigest()[:16],
+        languages_by_name=languages_by_name,
+        scms_by_name=scms_by_name,
+        languages_json=languages_json,
+        scms_json=scms_json,
+        languages_etag=languages_etag,
+        scms_etag=scms_etag
+    )
+
+
+def load_catalog(force_reload: bool = False) -> CatalogSnapshot:
+    """Return the current catalog snapshot, reloading only when a source file changed."""
+    global _snapshot, _snapshot_signature
+
+    signature = (_file_signature(LANGUAGES_JSON), _file_signature(SCMS_JSON))
+    snapshot = _snapshot
+    if snapshot is not None and not force_reload and signature == _snapshot_signature:
+        return snapshot
+
+    with _snapshot_lock:
+        if _snapshot is None or force_reload or signature != _snapshot_signature:
+            _snapshot = _build_snapshot()
+            _snapshot_signature = signature
+        return _snapshot
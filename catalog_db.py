@@ -0,0 +1,515 @@
+#!/usr/bin/env python3
+"""
+SQLite Catalog
+
+Optional indexed copy of languages.json, scms.json and competitors/*.json
+in one SQLite file, for questions that would otherwise scan every record:
+which languages use a package manager or framework, which SCM plans lack a
+feature, which competitors support a language or package manager, and how
+a record looked before its last change.
+
+The JSON files stay the source of truth (they are reviewed and committed by
+the update workflows). The database follows them: sync() upserts only the
+records whose JSON changed, in one transaction, so readers in other
+processes see either the old catalog or the new one. The enrichers upsert
+what they fetched the same way right after saving. Every replaced or
+removed record is kept in the history table. The web interface syncs once
+at boot; requests then only read it, and only while it holds the current
+data.
+
+Enabled through the environment:
+
+    CATALOG_DB   database file, or 1/on for data/cache/catalog.sqlite3
+                 (unset, empty or none: disabled, JSON only)
+
+    python catalog_db.py --build
+    python catalog_db.py --package-manager poetry
+    python catalog_db.py --competitors-for Kotlin
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from catalog import BASE_DIR, load_catalog, split_names
+from competitor_store import CompetitorStore
+from lockfile_index import KNOWN_LOCKFILES
+
+DEFAULT_CATALOG_DB = os.path.join(BASE_DIR, 'data', 'cache', 'catalog.sqlite3')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS languages (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    maturity TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_languages_name ON languages (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_languages_maturity ON languages (maturity COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS language_frameworks (
+    language TEXT NOT NULL,
+    framework TEXT NOT NULL,
+    support TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_language_frameworks_language ON language_frameworks (language);
+CREATE INDEX IF NOT EXISTS idx_language_frameworks_framework ON language_frameworks (framework COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS language_package_managers (
+    language TEXT NOT NULL,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_language_package_managers_language ON language_package_managers (language);
+CREATE INDEX IF NOT EXISTS idx_language_package_managers_name ON language_package_managers (name COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS scms (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scm_plans (
+    scm TEXT NOT NULL,
+    plan TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (scm, plan)
+);
+CREATE TABLE IF NOT EXISTS scm_unsupported_features (
+    scm TEXT NOT NULL,
+    plan TEXT NOT NULL,
+    feature TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scm_unsupported_features_scm ON scm_unsupported_features (scm, plan);
+CREATE INDEX IF NOT EXISTS idx_scm_unsupported_features_feature ON scm_unsupported_features (feature COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS competitors (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    last_updated TEXT,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS competitor_languages (
+    competitor TEXT NOT NULL,
+    product TEXT NOT NULL,
+    language TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_competitor_languages_competitor ON competitor_languages (competitor, product);
+CREATE INDEX IF NOT EXISTS idx_competitor_languages_language ON competitor_languages (language COLLATE NOCASE, product);
+CREATE TABLE IF NOT EXISTS competitor_package_managers (
+    competitor TEXT NOT NULL,
+    package_manager TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_competitor_package_managers_competitor ON competitor_package_managers (competitor);
+CREATE INDEX IF NOT EXISTS idx_competitor_package_managers_name ON competitor_package_managers (package_manager COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS history (
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    replaced_at REAL NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_history_record ON history (kind, name, replaced_at);
+"""
+
+# Child tables of each record kind, by the column naming the record
+_CHILD_TABLES = {
+    'languages': (('language_frameworks', 'language'), ('language_package_managers', 'language')),
+    'scms': (('scm_plans', 'scm'), ('scm_unsupported_features', 'scm')),
+    'competitors': (('competitor_languages', 'competitor'), ('competitor_package_managers', 'competitor')),
+}
+_FRAMEWORK_FIELDS = (('main_frameworks', 'main'), ('limited_support_fw_lib', 'limited'),
+                     ('no_support_fw_lib', 'none'))
+_COMPETITOR_PRODUCTS = ('sast', 'sca')
+
+
+def _encode(record: Dict[str, Any]) -> str:
+    return json.dumps(record, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+
+
+def _index_language(conn: sqlite3.Connection, name: str, lang: Dict[str, Any]) -> None:
+    for field, support in _FRAMEWORK_FIELDS:
+        conn.executemany("INSERT INTO language_frameworks (language, framework, support) VALUES (?, ?, ?)",
+                         [(name, framework, support) for framework in split_names(lang.get(field))])
+    docs = lang.get('semgrep_docs') or {}
+    managers = split_names(docs.get('package_managers'))
+    lockfiles = split_names(docs.get('lockfiles'))
+    if not (managers or lockfiles):
+        # Same fallback as the lockfile index, until the docs enricher fills these in
+        known = KNOWN_LOCKFILES.get(name, {})
+        managers = list(known)
+        lockfiles = split_names([lockfile for names in known.values() for lockfile in names])
+    conn.executemany("INSERT INTO language_package_managers (language, name, kind) VALUES (?, ?, ?)",
+                     [(name, value, 'package_manager') for value in managers]
+                     + [(name, value, 'lockfile') for value in lockfiles])
+
+
+def _index_scm(conn: sqlite3.Connection, name: str, scm: Dict[str, Any]) -> None:
+    conn.executemany("INSERT OR IGNORE INTO scm_plans (scm, plan, position) VALUES (?, ?, ?)",
+                     [(name, plan, position) for position, plan in enumerate(scm.get('plans') or [])])
+    for plan, features in (scm.get('unsupported_features_by_plan') or {}).items():
+        conn.executemany("INSERT INTO scm_unsupported_features (scm, plan, feature) VALUES (?, ?, ?)",
+                         [(name, plan, feature) for feature in split_names(features)])
+
+
+def _index_competitor(conn: sqlite3.Connection, name: str, data: Dict[str, Any]) -> None:
+    products = data.get('products') or {}
+    for product in _COMPETITOR_PRODUCTS:
+        conn.executemany("INSERT INTO competitor_languages (competitor, product, language) VALUES (?, ?, ?)",
+                         [(name, product, language)
+                          for language in split_names((products.get(product) or {}).get('languages_supported'))])
+    conn.executemany("INSERT INTO competitor_package_managers (competitor, package_manager) VALUES (?, ?)",
+                     [(name, manager)
+                      for manager in split_names((products.get('sca') or {}).get('package_managers'))])
+
+
+_INDEXERS = {'languages': _index_language, 'scms': _index_scm, 'competitors': _index_competitor}
+
+
+def _language_rows(languages: List[Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+    return [(lang['language'], lang, {'position': position, 'maturity': lang.get('maturity')})
+            for position, lang in enumerate(languages)]
+
+
+def _scm_rows(scms: List[Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+    return [(scm['scm'], scm, {'position': position}) for position, scm in enumerate(scms)]
+
+
+class CatalogDB:
+    """The catalog in SQLite, with one connection per thread and process."""
+
+    def __init__(self, path: str = DEFAULT_CATALOG_DB):
+        self.path = path
+        self._local = threading.local()
+        self._memory = None  # An in-memory database has a single connection
+        self._synced: Optional[Tuple[str, str]] = None  # (catalog version, competitors version) last synced
+        self._store: Optional[CompetitorStore] = None
+        self._sync_lock = threading.Lock()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self.path == ':memory:':
+            if self._memory is None:
+                self._memory = sqlite3.connect(':memory:', isolation_level=None, check_same_thread=False)
+            return self._memory
+        # Connections must not cross a fork, so they are keyed by pid as well as thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _transaction(self, write) -> Any:
+        """Run write(conn) inside one IMMEDIATE transaction, rolling back on any error."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = write(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
+
+    # Writing
+
+    def _meta(self, conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, conn: sqlite3.Connection, key: str, value: str) -> None:
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _delete_record(self, conn: sqlite3.Connection, kind: str, name: str, now: float) -> None:
+        conn.execute("INSERT INTO history (kind, name, replaced_at, record) "
+                     f"SELECT ?, name, ?, record FROM {kind} WHERE name = ?", (kind, now, name))
+        conn.execute(f"DELETE FROM {kind} WHERE name = ?", (name,))
+        for table, column in _CHILD_TABLES[kind]:
+            conn.execute(f"DELETE FROM {table} WHERE {column} = ?", (name,))
+
+    def _upsert_records(self, conn: sqlite3.Connection, kind: str,
+                        records: Iterable[Tuple[str, Dict[str, Any], Dict[str, Any]]],
+                        replace_all: bool) -> int:
+        """Upsert (name, record, columns) rows of one kind; return how many changed.
+
+        Unchanged records are left alone, so rewriting the same data costs
+        one comparison per record. With replace_all, records not given are
+        removed.
+        """
+        now = time.time()
+        existing = {name: (position, record) for name, position, record
+                    in conn.execute(f"SELECT name, position, record FROM {kind}")}
+        seen = set()
+        changed = 0
+        for name, data, columns in records:
+            if name in seen:
+                print(f"Warning: duplicate {kind} record '{name}' ignored in the SQLite catalog")
+                continue
+            seen.add(name)
+            record = _encode(data)
+            columns = dict(columns, record=record)
+            current = existing.get(name)
+            if current is not None and current[1] == record:
+                if current[0] != columns['position']:
+                    conn.execute(f"UPDATE {kind} SET position = ? WHERE name = ?", (columns['position'], name))
+                continue
+            if current is not None:
+                self._delete_record(conn, kind, name, now)
+            names = ', '.join(['name'] + list(columns))
+            placeholders = ', '.join('?' * (len(columns) + 1))
+            conn.execute(f"INSERT INTO {kind} ({names}) VALUES ({placeholders})", [name] + list(columns.values()))
+            _INDEXERS[kind](conn, name, data)
+            changed += 1
+        if replace_all:
+            for name in existing.keys() - seen:
+                self._delete_record(conn, kind, name, now)
+                changed += 1
+        return changed
+
+    def upsert_languages(self, languages: List[Dict[str, Any]], replace_all: bool = True) -> int:
+        """Store languages.json records in one transaction; return how many changed."""
+        records = _language_rows(languages)
+        return self._transaction(lambda conn: self._upsert_records(conn, 'languages', records, replace_all))
+
+    def upsert_scms(self, scms: List[Dict[str, Any]], replace_all: bool = True) -> int:
+        """Store scms.json records in one transaction; return how many changed."""
+        records = _scm_rows(scms)
+        return self._transaction(lambda conn: self._upsert_records(conn, 'scms', records, replace_all))
+
+    def upsert_competitor(self, data: Dict[str, Any], content_hash: str = '') -> int:
+        """Store one competitor record in its own transaction; return 1 if it changed."""
+        name = data['competitor_name']
+
+        def write(conn):
+            # A known competitor keeps its place in the listing; a new one goes last
+            row = conn.execute("SELECT position FROM competitors WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                row = conn.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM competitors").fetchone()
+            columns = {'position': row[0], 'content_hash': content_hash, 'last_updated': data.get('last_updated')}
+            return self._upsert_records(conn, 'competitors', [(name, data, columns)], False)
+
+        return self._transaction(write)
+
+    def sync(self, force: bool = False) -> bool:
+        """Bring the database up to date with the JSON files; return whether anything changed."""
+        catalog = load_catalog()
+        if self._store is None:
+            self._store = CompetitorStore()
+        store = self._store
+        versions = (catalog.version, store.version())
+        if versions == self._synced and not force:
+            return False
+        with self._sync_lock:
+            conn = self._connection()
+            if not force and (self._meta(conn, 'catalog_version'), self._meta(conn, 'competitors_version')) == versions:
+                self._synced = versions  # Another process already synced this data
+                return False
+            competitors = []
+            for name in sorted(store):
+                try:
+                    data = store[name]
+                    competitors.append((name, data, {'position': len(competitors),
+                                                     'content_hash': store.content_hash(name),
+                                                     'last_updated': data.get('last_updated')}))
+                except KeyError:
+                    pass  # Rejected by the schema; already reported by the store
+
+            def write(conn):
+                changed = 0
+                if force or self._meta(conn, 'catalog_version') != catalog.version:
+                    changed += self._upsert_records(conn, 'languages', _language_rows(catalog.languages), True)
+                    changed += self._upsert_records(conn, 'scms', _scm_rows(catalog.scms), True)
+                    self._set_meta(conn, 'catalog_version', catalog.version)
+                if force or self._meta(conn, 'competitors_version') != versions[1]:
+                    changed += self._upsert_records(conn, 'competitors', competitors, True)
+                    self._set_meta(conn, 'competitors_version', versions[1])
+                return changed
+
+            changed = self._transaction(write)
+            self._synced = versions
+            return bool(changed)
+
+    # Querying
+
+    def holds(self, catalog_version: str, competitors_version: str) -> bool:
+        """Whether the last sync was to these data versions; a read-only check, unlike sync()."""
+        conn = self._connection()
+        return (self._meta(conn, 'catalog_version'), self._meta(conn, 'competitors_version')) == (
+            catalog_version, competitors_version)
+
+    def _record(self, sql: str, params: Tuple) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(sql, params).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _names(self, sql: str, params: Tuple = ()) -> List[str]:
+        return [row[0] for row in self._connection().execute(sql, params)]
+
+    def language(self, name: str) -> Optional[Dict[str, Any]]:
+        """A language record by case-insensitive name."""
+        return self._record("SELECT record FROM languages WHERE name = ? COLLATE NOCASE ORDER BY position LIMIT 1",
+                            (name,))
+
+    def languages(self, maturity: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Language records in languages.json order, optionally only one maturity."""
+        if maturity is None:
+            rows = self._connection().execute("SELECT record FROM languages ORDER BY position")
+        else:
+            rows = self._connection().execute(
+                "SELECT record FROM languages WHERE maturity = ? COLLATE NOCASE ORDER BY position", (maturity,))
+        return [json.loads(row[0]) for row in rows]
+
+    def languages_with_framework(self, framework: str, support: Optional[str] = None) -> List[str]:
+        """Languages listing a framework as main, limited or no support (support narrows it)."""
+        sql = ("SELECT DISTINCT l.name FROM language_frameworks f JOIN languages l ON l.name = f.language "
+               "WHERE f.framework = ? COLLATE NOCASE")
+        params: Tuple = (framework,)
+        if support is not None:
+            sql += " AND f.support = ?"
+            params += (support,)
+        return self._names(sql + " ORDER BY l.position", params)
+
+    def languages_with_package_manager(self, name: str) -> List[str]:
+        """Languages whose Semgrep docs list a package manager or lockfile name."""
+        return self._names(
+            "SELECT DISTINCT l.name FROM language_package_managers p JOIN languages l ON l.name = p.language "
+            "WHERE p.name = ? COLLATE NOCASE ORDER BY l.position", (name,))
+
+    def scm(self, name: str) -> Optional[Dict[str, Any]]:
+        """An SCM record by exact name."""
+        return self._record("SELECT record FROM scms WHERE name = ?", (name,))
+
+    def unsupported_features(self, scm: str, plan: str) -> List[str]:
+        """Features Semgrep does not support on one SCM plan."""
+        return self._names("SELECT feature FROM scm_unsupported_features WHERE scm = ? AND plan = ? ORDER BY rowid",
+                           (scm, plan))
+
+    def plans_without_feature(self, feature: str) -> List[Tuple[str, str]]:
+        """(scm, plan) pairs that do not support a feature."""
+        return [tuple(row) for row in self._connection().execute(
+            "SELECT DISTINCT f.scm, f.plan FROM scm_unsupported_features f "
+            "JOIN scm_plans p ON p.scm = f.scm AND p.plan = f.plan "
+            "WHERE f.feature = ? COLLATE NOCASE ORDER BY f.scm, p.position", (feature,))]
+
+    def competitor(self, name: str) -> Optional[Dict[str, Any]]:
+        """A competitor record by name."""
+        return self._record("SELECT record FROM competitors WHERE name = ?", (name,))
+
+    def competitor_names(self) -> List[str]:
+        return self._names("SELECT name FROM competitors ORDER BY position")
+
+    def competitor_languages(self, names: Iterable[str], product: str = 'sast') -> Dict[str, List[str]]:
+        """Languages each named competitor supports in a product, in the order given; unknown names are left out."""
+        names = list(dict.fromkeys(names))
+        known = set(self._names(
+            f"SELECT name FROM competitors WHERE name IN ({', '.join('?' * len(names))})", tuple(names))
+        ) if names else set()
+        result: Dict[str, List[str]] = {name: [] for name in names if name in known}
+        if result:
+            rows = self._connection().execute(
+                f"SELECT competitor, language FROM competitor_languages "
+                f"WHERE product = ? AND competitor IN ({', '.join('?' * len(result))}) ORDER BY rowid",
+                (product,) + tuple(result))
+            for competitor, language in rows:
+                result[competitor].append(language)
+        return result
+
+    def competitors_supporting(self, language: str, product: str = 'sast') -> List[str]:
+        """Competitors whose product lists a language (case-insensitive)."""
+        return self._names(
+            "SELECT DISTINCT c.name FROM competitor_languages l JOIN competitors c ON c.name = l.competitor "
+            "WHERE l.language = ? COLLATE NOCASE AND l.product = ? ORDER BY c.position", (language, product))
+
+    def competitors_with_package_manager(self, package_manager: str) -> List[str]:
+        """Competitors whose SCA lists a package manager (case-insensitive)."""
+        return self._names(
+            "SELECT DISTINCT c.name FROM competitor_package_managers p JOIN competitors c ON c.name = p.competitor "
+            "WHERE p.package_manager = ? COLLATE NOCASE ORDER BY c.position", (package_manager,))
+
+    def history(self, kind: str, name: str) -> List[Tuple[float, Dict[str, Any]]]:
+        """Earlier versions of a record, newest first, as (replaced_at, record)."""
+        return [(replaced_at, json.loads(record)) for replaced_at, record in self._connection().execute(
+            "SELECT replaced_at, record FROM history WHERE kind = ? AND name = ? ORDER BY replaced_at DESC, rowid DESC",
+            (kind, name))]
+
+
+def catalog_db_path() -> Optional[str]:
+    """Database file configured through CATALOG_DB, or None when the SQLite catalog is disabled."""
+    value = os.environ.get('CATALOG_DB', '').strip()
+    if value.lower() in ('', '0', 'none', 'off'):
+        return None
+    if value.lower() in ('1', 'on', 'true'):
+        return DEFAULT_CATALOG_DB
+    return value
+
+
+def open_catalog_db() -> Optional[CatalogDB]:
+    """The configured SQLite catalog without syncing it, for writers; None when disabled."""
+    path = catalog_db_path()
+    return CatalogDB(path) if path is not None else None
+
+
+_db: Optional[CatalogDB] = None
+_db_lock = threading.Lock()
+
+
+def get_catalog_db(sync: bool = True) -> Optional[CatalogDB]:
+    """Return the shared SQLite catalog, or None when CATALOG_DB is not set.
+
+    The database is synced first unless sync is False; request handlers read
+    the copy synced at boot that way, so they never take the write lock.
+    """
+    global _db
+    path = catalog_db_path()
+    if path is None:
+        return None
+    db = _db
+    if db is None or db.path != path:
+        with _db_lock:
+            if _db is None or _db.path != path:
+                _db = CatalogDB(path)
+            db = _db
+    if sync:
+        db.sync()
+    return db
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the SQLite catalog")
+    parser.add_argument("--db", help="Database file (default: CATALOG_DB, or an in-memory copy)")
+    parser.add_argument("--build", action="store_true", help="Rebuild every table from the JSON files")
+    parser.add_argument("--package-manager", help="Languages and competitors listing a package manager or lockfile")
+    parser.add_argument("--framework", help="Languages listing a framework")
+    parser.add_argument("--competitors-for", metavar="LANGUAGE", help="Competitors whose SAST supports a language")
+    parser.add_argument("--missing-feature", help="SCM plans that do not support a feature")
+    args = parser.parse_args()
+
+    db = CatalogDB(args.db or catalog_db_path() or ':memory:')
+    started = time.perf_counter()
+    db.sync(force=args.build)
+    if args.build:
+        print(f"Synced {db.path} in {time.perf_counter() - started:.2f}s")
+    if args.package_manager:
+        print(f"Languages: {', '.join(db.languages_with_package_manager(args.package_manager)) or 'none'}")
+        print(f"Competitors: {', '.join(db.competitors_with_package_manager(args.package_manager)) or 'none'}")
+    if args.framework:
+        print(', '.join(db.languages_with_framework(args.framework)) or 'none')
+    if args.competitors_for:
+        if db.language(args.competitors_for) is None:
+            print(f"Warning: {args.competitors_for} is not in languages.json", file=sys.stderr)
+        print(', '.join(db.competitors_supporting(args.competitors_for)) or 'none')
+    if args.missing_feature:
+        for scm, plan in db.plans_without_feature(args.missing_feature):
+            print(f"{scm}: {plan}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,20 +7,53 @@ Feature Matrix Generator, enabling side-by-side comparisons between Semgrep
 and competitors with detailed capability analysis.
 """
 
+import hashlib
 import json
+import numbers
 import os
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+import sqlite3
+import sys
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+from dataclasses import dataclass, fields
+from datetime import date
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from cache_backends import CacheBackend, make_cache_key
+from catalog import load_catalog
+from catalog_db import get_catalog_db
+from competitor_store import CompetitorStore
+from dependency_tracking import fingerprint
+from language_coverage import compute_language_coverage
+
+# Bump when the result types change shape, so pickled analyses in a
+# persistent cache from an older release are never loaded
+RESULT_FORMAT_VERSION = 3
+
+# Slotted dataclasses need Python 3.10+; older interpreters still get frozen ones
+_RECORD_OPTIONS = {'frozen': True, 'slots': True} if sys.version_info >= (3, 10) else {'frozen': True}
+
 class ComparisonResult(Enum):
     SEMGREP_ADVANTAGE = "semgrep_advantage"
     COMPETITOR_ADVANTAGE = "competitor_advantage" 
     EQUIVALENT = "equivalent"
     SEMGREP_DISADVANTAGE = "semgrep_disadvantage"
 
-@dataclass
-class CapabilityComparison:
+class _Record:
+    """Base for the immutable result types."""
+    __slots__ = ()
+
+    def __reduce__(self):
+        # Frozen slotted instances cannot be restored attribute by attribute,
+        # so pickle (used by the cache backends) rebuilds them via __init__
+        return (self.__class__, tuple(getattr(self, f.name) for f in fields(self)))
+
+@dataclass(**_RECORD_OPTIONS)
+class CapabilityComparison(_Record):
     capability: str
     semgrep_status: bool
     competitor_status: bool
@@ -28,44 +61,198 @@ class CapabilityComparison:
     notes: str
     importance: str  # "critical", "important", "nice_to_have"
 
-@dataclass
-class LanguageComparison:
+@dataclass(**_RECORD_OPTIONS)
+class LanguageComparison(_Record):
     language: str
     semgrep_support: str  # "Yes", "No", "Beta"
     competitor_support: str
-    semgrep_features: List[str]
-    competitor_features: List[str]
+    semgrep_features: Tuple[str, ...]
+    competitor_features: Tuple[str, ...]
     result: ComparisonResult
 
-@dataclass
-class CompetitorAnalysis:
+@dataclass(**_RECORD_OPTIONS)
+class ScmComparison(_Record):
+    scm: str  # "github", "gitlab", "bitbucket", "azure_devops"
+    semgrep_supported: bool
+    competitor_supported: bool
+    semgrep_plans: Tuple[str, ...]
+    competitor_plans: Tuple[str, ...]
+    semgrep_features: Tuple[str, ...]
+    competitor_features: Tuple[str, ...]
+
+@dataclass(**_RECORD_OPTIONS)
+class CompetitorAnalysis(_Record):
     competitor_name: str
     overall_assessment: ComparisonResult
-    capability_comparisons: List[CapabilityComparison]
-    language_comparisons: List[LanguageComparison]
-    scm_comparison: Dict[str, Any]
-    strengths_vs_semgrep: List[str]
-    weaknesses_vs_semgrep: List[str]
-    key_differentiators: List[str]
-    sales_talking_points: List[str]
+    capability_comparisons: Tuple[CapabilityComparison, ...]
+    language_comparisons: Tuple[LanguageComparison, ...]
+    scm_comparison: Tuple[ScmComparison, ...]
+    strengths_vs_semgrep: Tuple[str, ...]
+    weaknesses_vs_semgrep: Tuple[str, ...]
+    key_differentiators: Tuple[str, ...]
+    sales_talking_points: Tuple[str, ...]
+
+@dataclass(**_RECORD_OPTIONS)
+class CompetitorProfile(_Record):
+    """Parts of an analysis that do not depend on the selected languages."""
+    capability_comparisons: Tuple[CapabilityComparison, ...]
+    overall_assessment: ComparisonResult
+    key_differentiators: Tuple[str, ...]
+    sales_talking_points: Tuple[str, ...]
+    scm_comparison: Tuple[ScmComparison, ...]
+
+def analysis_to_dict(analysis: CompetitorAnalysis, data_sources: Optional[List[Any]] = None) -> Dict[str, Any]:
+    """Convert an analysis to the JSON shape shared by both web apps."""
+    result = {
+        'competitor_name': analysis.competitor_name,
+        'overall_assessment': analysis.overall_assessment.value,
+        'capability_comparisons': [
+            {
+                'capability': cap.capability,
+                'semgrep_status': cap.semgrep_status,
+                'competitor_status': cap.competitor_status,
+                'result': cap.result.value,
+                'notes': cap.notes,
+                'importance': cap.importance
+            }
+            for cap in analysis.capability_comparisons
+        ],
+        'language_comparisons': [
+            {
+                'language': lang.language,
+                'semgrep_support': lang.semgrep_support,
+                'competitor_support': lang.competitor_support,
+                'semgrep_features': list(lang.semgrep_features),
+                'competitor_features': list(lang.competitor_features),
+                'result': lang.result.value
+            }
+            for lang in analysis.language_comparisons
+        ],
+        'scm_comparison': {
+            scm.scm: {
+                'semgrep_supported': scm.semgrep_supported,
+                'competitor_supported': scm.competitor_supported,
+                'semgrep_plans': list(scm.semgrep_plans),
+                'competitor_plans': list(scm.competitor_plans),
+                'semgrep_features': list(scm.semgrep_features),
+                'competitor_features': list(scm.competitor_features)
+            }
+            for scm in analysis.scm_comparison
+        },
+        'strengths_vs_semgrep': list(analysis.strengths_vs_semgrep),
+        'weaknesses_vs_semgrep': list(analysis.weaknesses_vs_semgrep),
+        'key_differentiators': list(analysis.key_differentiators),
+        'sales_talking_points': list(analysis.sales_talking_points)
+    }
+    if data_sources is not None:
+        result['data_sources'] = data_sources
+    return result
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, _Record):
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    if isinstance(obj, date):
+        return obj.isoformat()
+    # NumPy scalars, as the coverage and ranking calculations produce
+    if isinstance(obj, numbers.Integral):
+        return int(obj)
+    if isinstance(obj, numbers.Real):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def encode_json(obj: Any) -> bytes:
+    """Serialize results (dicts, result records, enums, NumPy scalars) to UTF-8 JSON bytes.
+    
+    Uses orjson when installed, which encodes dataclasses and enums natively;
+    otherwise falls back to the standard library encoder.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default)
+    return json.dumps(obj, default=_json_default, ensure_ascii=False).encode('utf-8')
 
 class CompetitiveAnalysisEngine:
-    def __init__(self):
-        self.semgrep_capabilities = self._load_semgrep_capabilities()
+    def __init__(self, cache: Optional[CacheBackend] = None):
+        self.cache = cache
         self.competitors = self._load_all_competitors()
+        # Per-competitor profiles: competitor_name -> (analysis_version, profile)
+        self._profiles: Dict[str, Tuple[str, CompetitorProfile]] = {}
+        self.catalog_version = None
+        self.refresh_catalog()
+        
+    def refresh_catalog(self) -> bool:
+        """Reload the catalog-derived state if languages.json or scms.json changed; return whether it did."""
+        catalog = load_catalog()
+        if catalog.version == self.catalog_version:
+            return False
+        semgrep_capabilities = self._load_semgrep_capabilities()
+        languages = semgrep_capabilities.get('languages', [])
+        self.semgrep_capabilities = semgrep_capabilities
+        self._capabilities_version = self._compute_capabilities_version()
+        self._semgrep_language_names = {lang.get('language', '').lower() for lang in languages}
+        # Analyses read the built-in capabilities and only the names of the
+        # catalog languages, so other catalog edits do not invalidate them
+        self._engine_version = fingerprint([
+            RESULT_FORMAT_VERSION,
+            {k: v for k, v in semgrep_capabilities.items() if k != 'languages'}
+        ])
+        self._language_names_version = fingerprint(sorted(lang.get('language', '') for lang in languages))
+        self.catalog_version = catalog.version
+        return True
+        
+    def _compute_capabilities_version(self) -> str:
+        digest = hashlib.sha256()
+        digest.update(str(RESULT_FORMAT_VERSION).encode('utf-8'))
+        digest.update(json.dumps(self.semgrep_capabilities, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+    
+    @property
+    def data_version(self) -> str:
+        """Hash of every input any analysis depends on, for cheap change detection.
+        
+        Competitor files are versioned by their mtime and size, so an edited
+        file is picked up without restarting and without re-parsing the rest.
+        """
+        digest = hashlib.sha256(self._capabilities_version.encode('utf-8'))
+        digest.update(str(self.catalog_version).encode('utf-8'))
+        digest.update(self.competitors.version().encode('utf-8'))
+        return digest.hexdigest()[:16]
+        
+    def content_version(self) -> str:
+        """Like data_version, but hashed from file contents so it is stable across checkouts and hosts."""
+        digest = hashlib.sha256(self._capabilities_version.encode('utf-8'))
+        for name in sorted(self.competitors):
+            digest.update(f"{name}\0{self.competitors.content_hash(name)}\n".encode('utf-8'))
+        return digest.hexdigest()[:16]
+        
+    def analysis_dependencies(self, competitor_name: str) -> Dict[str, str]:
+        """Fingerprints of the sources an analysis of this competitor reads (empty if unknown)."""
+        if competitor_name not in self.competitors:
+            return {}
+        path = self.competitors.path_for(competitor_name)
+        return {
+            'engine': self._engine_version,
+            'languages.json#names': self._language_names_version,
+            f"competitors/{os.path.basename(path)}": self.competitors.content_hash(competitor_name)
+        }
+        
+    def analysis_version(self, competitor_name: str) -> str:
+        """Version of one competitor's analyses; scopes their cache entries to that competitor's data."""
+        return fingerprint(self.analysis_dependencies(competitor_name))
         
     def _load_semgrep_capabilities(self) -> Dict[str, Any]:
         """Load current Semgrep capabilities from languages.json and known features."""
         semgrep_data = {}
         
-        # Load languages data
+        # Load languages data from the shared catalog snapshot
         try:
-            with open('languages.json', 'r') as f:
-                languages_data = json.load(f)
-                semgrep_data['languages'] = languages_data
+            semgrep_data['languages'] = load_catalog().languages
         except Exception as e:
             print(f"Warning: Could not load languages.json: {e}")
-            semgrep_data['languages'] = {}
+            semgrep_data['languages'] = []
         
         # Define Semgrep's current capabilities
         semgrep_data['capabilities'] = {
@@ -131,34 +318,56 @@ class CompetitiveAnalysisEngine:
         
         return semgrep_data
     
-    def _load_all_competitors(self) -> Dict[str, Dict[str, Any]]:
-        """Load all competitor data files."""
-        competitors = {}
-        competitor_files = [
-            "competitors/checkmarx.json",
-            "competitors/veracode.json",
-            "competitors/snyk.json", 
-            "competitors/github-advanced-security.json",
-            "competitors/sonarqube.json",
-            "competitors/endor-labs.json"
-        ]
+    def _load_all_competitors(self) -> CompetitorStore:
+        """Index the competitor files; records are parsed on first use."""
+        return CompetitorStore()
+    
+    def get_competitor_profile(self, competitor_name: str) -> CompetitorProfile:
+        """Return the language-independent comparison, computed once per version of the competitor's data."""
+        version = self.analysis_version(competitor_name)
+        cached = self._profiles.get(competitor_name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        capability_comparisons = self._compare_capabilities(competitor_name)
+        
+        # Determine overall assessment
+        advantages = sum(1 for c in capability_comparisons if c.result == ComparisonResult.SEMGREP_ADVANTAGE)
+        disadvantages = sum(1 for c in capability_comparisons if c.result == ComparisonResult.COMPETITOR_ADVANTAGE)
+        
+        if advantages > disadvantages:
+            overall = ComparisonResult.SEMGREP_ADVANTAGE
+        elif disadvantages > advantages:
+            overall = ComparisonResult.SEMGREP_DISADVANTAGE
+        else:
+            overall = ComparisonResult.EQUIVALENT
         
-        for filename in competitor_files:
-            if os.path.exists(filename):
-                try:
-                    with open(filename, 'r') as f:
-                        data = json.load(f)
-                        competitors[data['competitor_name']] = data
-                except Exception as e:
-                    print(f"Error loading {filename}: {e}")
+        # Key differentiators
+        differentiators = []
+        for cap in capability_comparisons:
+            if cap.result == ComparisonResult.SEMGREP_ADVANTAGE and cap.importance == "critical":
+                differentiators.append(f"Semgrep: {cap.capability}")
+            elif cap.result == ComparisonResult.COMPETITOR_ADVANTAGE and cap.importance == "critical":
+                differentiators.append(f"{competitor_name}: {cap.capability}")
         
-        return competitors
+        profile = CompetitorProfile(
+            capability_comparisons=tuple(capability_comparisons),
+            overall_assessment=overall,
+            key_differentiators=tuple(differentiators),
+            sales_talking_points=tuple(self._build_sales_talking_points(competitor_name, capability_comparisons)),
+            scm_comparison=self._compare_scm_support(competitor_name)
+        )
+        # Replaces the profile built from an older version of this competitor only
+        self._profiles[competitor_name] = (version, profile)
+        return profile
     
     def compare_capabilities(self, competitor_name: str) -> List[CapabilityComparison]:
         """Compare core security capabilities between Semgrep and competitor."""
         if competitor_name not in self.competitors:
             return []
-            
+        return list(self.get_competitor_profile(competitor_name).capability_comparisons)
+    
+    def _compare_capabilities(self, competitor_name: str) -> List[CapabilityComparison]:
         competitor = self.competitors[competitor_name]
         comparisons = []
         
@@ -259,7 +468,7 @@ class CompetitiveAnalysisEngine:
             all_languages.update(selected_languages)
         
         # Add languages from Semgrep's database
-        for lang_data in self.semgrep_capabilities.get('languages', {}).values():
+        for lang_data in self.semgrep_capabilities.get('languages', []):
             all_languages.add(lang_data.get('language', ''))
             
         # Add languages from competitor
@@ -274,15 +483,13 @@ class CompetitiveAnalysisEngine:
             semgrep_features = []
             
             # Look for language in Semgrep data
-            for lang_data in self.semgrep_capabilities.get('languages', {}).values():
-                if lang_data.get('language', '').lower() == language.lower():
-                    semgrep_support = "Yes"
-                    semgrep_features = [
-                        "Pattern-based analysis",
-                        "Custom rules",
-                        "High precision"
-                    ]
-                    break
+            if language.lower() in self._semgrep_language_names:
+                semgrep_support = "Yes"
+                semgrep_features = [
+                    "Pattern-based analysis",
+                    "Custom rules",
+                    "High precision"
+                ]
             
             # Check competitor support
             competitor_support = "Yes" if language in competitor_sast_langs else "No"
@@ -304,8 +511,8 @@ class CompetitiveAnalysisEngine:
                 language=language,
                 semgrep_support=semgrep_support,
                 competitor_support=competitor_support,
-                semgrep_features=semgrep_features,
-                competitor_features=competitor_features,
+                semgrep_features=tuple(semgrep_features),
+                competitor_features=tuple(competitor_features),
                 result=result
             ))
         
@@ -315,13 +522,13 @@ class CompetitiveAnalysisEngine:
         """Generate sales talking points based on competitive analysis."""
         if competitor_name not in self.competitors:
             return []
-            
+        return list(self.get_competitor_profile(competitor_name).sales_talking_points)
+    
+    def _build_sales_talking_points(self, competitor_name: str,
+                                    capabilities: List[CapabilityComparison]) -> List[str]:
         talking_points = []
         competitor = self.competitors[competitor_name]
         
-        # Analyze capabilities
-        capabilities = self.compare_capabilities(competitor_name)
-        
         for cap in capabilities:
             if cap.result == ComparisonResult.SEMGREP_ADVANTAGE:
                 talking_points.append(f"✅ **{cap.capability}**: {cap.notes}")
@@ -351,61 +558,45 @@ class CompetitiveAnalysisEngine:
         """Perform comprehensive competitive analysis."""
         if competitor_name not in self.competitors:
             raise ValueError(f"Competitor {competitor_name} not found")
+        
+        cache_key = None
+        if self.cache is not None:
+            cache_key = make_cache_key('analysis', self.analysis_version(competitor_name), competitor_name,
+                                       sorted(set(selected_languages or [])))
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
             
         competitor = self.competitors[competitor_name]
         
-        # Get capability and language comparisons
-        capability_comparisons = self.compare_capabilities(competitor_name)
+        # Everything except the language comparison is shared across requests
+        profile = self.get_competitor_profile(competitor_name)
         language_comparisons = self.compare_language_support(competitor_name, selected_languages)
         
-        # Determine overall assessment
-        advantages = sum(1 for c in capability_comparisons if c.result == ComparisonResult.SEMGREP_ADVANTAGE)
-        disadvantages = sum(1 for c in capability_comparisons if c.result == ComparisonResult.COMPETITOR_ADVANTAGE)
-        
-        if advantages > disadvantages:
-            overall = ComparisonResult.SEMGREP_ADVANTAGE
-        elif disadvantages > advantages:
-            overall = ComparisonResult.SEMGREP_DISADVANTAGE
-        else:
-            overall = ComparisonResult.EQUIVALENT
-        
-        # Extract competitive insights
-        strengths_vs_semgrep = competitor.get('strengths', [])
-        weaknesses_vs_semgrep = competitor.get('weaknesses', [])
-        
-        # Key differentiators
-        differentiators = []
-        for cap in capability_comparisons:
-            if cap.result == ComparisonResult.SEMGREP_ADVANTAGE and cap.importance == "critical":
-                differentiators.append(f"Semgrep: {cap.capability}")
-            elif cap.result == ComparisonResult.COMPETITOR_ADVANTAGE and cap.importance == "critical":
-                differentiators.append(f"{competitor_name}: {cap.capability}")
-        
-        # Generate sales talking points
-        sales_points = self.generate_sales_talking_points(competitor_name)
-        
-        # SCM comparison
-        scm_comparison = self._compare_scm_support(competitor_name)
-        
-        return CompetitorAnalysis(
+        analysis = CompetitorAnalysis(
             competitor_name=competitor_name,
-            overall_assessment=overall,
-            capability_comparisons=capability_comparisons,
-            language_comparisons=language_comparisons,
-            scm_comparison=scm_comparison,
-            strengths_vs_semgrep=strengths_vs_semgrep,
-            weaknesses_vs_semgrep=weaknesses_vs_semgrep,
-            key_differentiators=differentiators,
-            sales_talking_points=sales_points
+            overall_assessment=profile.overall_assessment,
+            capability_comparisons=profile.capability_comparisons,
+            language_comparisons=tuple(language_comparisons),
+            scm_comparison=profile.scm_comparison,
+            strengths_vs_semgrep=tuple(competitor.get('strengths', [])),
+            weaknesses_vs_semgrep=tuple(competitor.get('weaknesses', [])),
+            key_differentiators=profile.key_differentiators,
+            sales_talking_points=profile.sales_talking_points
         )
+        
+        if cache_key is not None:
+            self.cache.set(cache_key, analysis)
+        
+        return analysis
     
-    def _compare_scm_support(self, competitor_name: str) -> Dict[str, Any]:
+    def _compare_scm_support(self, competitor_name: str) -> Tuple[ScmComparison, ...]:
         """Compare SCM support between Semgrep and competitor."""
         if competitor_name not in self.competitors:
-            return {}
+            return ()
             
         competitor = self.competitors[competitor_name]
-        comparison = {}
+        comparison = []
         
         scm_platforms = ['github', 'gitlab', 'bitbucket', 'azure_devops']
         
@@ -413,16 +604,48 @@ class CompetitiveAnalysisEngine:
             semgrep_scm = self.semgrep_capabilities['scm_support'].get(scm, {})
             competitor_scm = competitor.get('scm_support', {}).get(scm, {})
             
-            comparison[scm] = {
-                'semgrep_supported': semgrep_scm.get('supported', False),
-                'competitor_supported': competitor_scm.get('supported', False),
-                'semgrep_plans': semgrep_scm.get('plans', []),
-                'competitor_plans': competitor_scm.get('plans', []),
-                'semgrep_features': semgrep_scm.get('features', []),
-                'competitor_features': competitor_scm.get('features', [])
-            }
+            comparison.append(ScmComparison(
+                scm=scm,
+                semgrep_supported=semgrep_scm.get('supported', False),
+                competitor_supported=competitor_scm.get('supported', False),
+                semgrep_plans=tuple(semgrep_scm.get('plans', [])),
+                competitor_plans=tuple(competitor_scm.get('plans', [])),
+                semgrep_features=tuple(semgrep_scm.get('features', [])),
+                competitor_features=tuple(competitor_scm.get('features', []))
+            ))
         
-        return comparison
+        return tuple(comparison)
+    
+    def language_coverage(self, language_weights: Dict[str, float],
+                          competitor_names: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Share of a weighted language mix covered by Semgrep and each competitor, by maturity tier."""
+        names = self.get_available_competitors() if competitor_names is None else competitor_names
+        return compute_language_coverage(language_weights, self.semgrep_capabilities.get('languages', []),
+                                          self.competitor_languages(names))
+    
+    def competitor_languages(self, names: Iterable[str], product: str = 'sast') -> Dict[str, List[str]]:
+        """Languages each named competitor supports in a product; unknown or rejected names are left out.
+        
+        With CATALOG_DB set, these come from the SQLite catalog's indexed
+        table as long as it holds the current data. It is synced at boot and
+        only read here; otherwise the competitor files are used.
+        """
+        names = list(names)
+        catalog_db = get_catalog_db(sync=False)
+        if catalog_db is not None:
+            try:
+                if catalog_db.holds(load_catalog().version, self.competitors.version()):
+                    return catalog_db.competitor_languages(names, product)
+            except sqlite3.Error as e:
+                print(f"Warning: Could not read the SQLite catalog: {e}")
+        languages = {}
+        for name in names:
+            try:
+                languages[name] = self.competitors[name].get('products', {}).get(product, {}).get(
+                    'languages_supported', [])
+            except KeyError:
+                continue
+        return languages
     
     def get_available_competitors(self) -> List[str]:
         """Get list of available competitors."""
@@ -13,10 +13,23 @@ from datetime import datetime
 from flask import Flask, render_template_string, request, jsonify
 
 # Import the competitive analysis engine
-from competitive_analysis import CompetitiveAnalysisEngine, ComparisonResult
+from cache_backends import get_cache, make_cache_key
+from competitive_analysis import CompetitiveAnalysisEngine, ComparisonResult, analysis_to_dict, encode_json
+from materialize_analyses import get_materialized
+from single_flight import SingleFlight
 
 app = Flask(__name__)
 
+_engine = None
+_analysis_flight = SingleFlight()
+
+def get_engine():
+    """Return the process-wide competitive analysis engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        _engine = CompetitiveAnalysisEngine(cache=get_cache())
+    return _engine
+
 # Enhanced HTML template with competitive intelligence features
 HTML_TEMPLATE = """
 <!DOCTYPE html>
@@ -504,7 +517,7 @@ def index():
     """Main page with competitive analysis."""
     try:
         # Initialize competitive analysis engine
-        engine = CompetitiveAnalysisEngine()
+        engine = get_engine()
         competitors = engine.get_available_competitors()
         
         return render_template_string(HTML_TEMPLATE, competitors=competitors)
@@ -513,6 +526,16 @@ def index():
                                     error=f"Error loading data: {str(e)}",
                                     competitors=[])
 
+def build_analysis_response(engine, competitor, focus_languages):
+    """Run one competitor analysis and convert it to the API's JSON shape."""
+    # Generate analysis
+    analysis = engine.analyze_competitor(competitor, focus_languages)
+    
+    competitor_summary = engine.get_competitor_summary(competitor)
+    result = analysis_to_dict(analysis, competitor_summary.get('data_sources', []))
+    
+    return result
+
 @app.route('/api/competitive-analysis', methods=['POST'])
 def api_competitive_analysis():
     """API endpoint for generating competitive analysis."""
@@ -524,50 +547,22 @@ def api_competitive_analysis():
         if not competitor:
             return jsonify({'error': 'Competitor is required'}), 400
         
-        # Initialize analysis engine
-        engine = CompetitiveAnalysisEngine()
-        
-        # Generate analysis
-        analysis = engine.analyze_competitor(competitor, focus_languages)
-        
-        # Convert dataclass to dict for JSON serialization
-        result = {
-            'competitor_name': analysis.competitor_name,
-            'overall_assessment': analysis.overall_assessment.value,
-            'capability_comparisons': [
-                {
-                    'capability': cap.capability,
-                    'semgrep_status': cap.semgrep_status,
-                    'competitor_status': cap.competitor_status,
-                    'result': cap.result.value,
-                    'notes': cap.notes,
-                    'importance': cap.importance
-                }
-                for cap in analysis.capability_comparisons
-            ],
-            'language_comparisons': [
-                {
-                    'language': lang.language,
-                    'semgrep_support': lang.semgrep_support,
-                    'competitor_support': lang.competitor_support,
-                    'semgrep_features': lang.semgrep_features,
-                    'competitor_features': lang.competitor_features,
-                    'result': lang.result.value
-                }
-                for lang in analysis.language_comparisons
-            ],
-            'scm_comparison': analysis.scm_comparison,
-            'strengths_vs_semgrep': analysis.strengths_vs_semgrep,
-            'weaknesses_vs_semgrep': analysis.weaknesses_vs_semgrep,
-            'key_differentiators': analysis.key_differentiators,
-            'sales_talking_points': analysis.sales_talking_points
-        }
+        engine = get_engine()
+        if focus_languages is None or isinstance(focus_languages, list):
+            body = get_materialized().get_json(engine, competitor, focus_languages)
+            if body is not None:
+                return app.response_class(body, mimetype='application/json')
         
-        # Add data sources
-        competitor_summary = engine.get_competitor_summary(competitor)
-        result['data_sources'] = competitor_summary.get('data_sources', [])
+        # Identical concurrent requests share one computation, and the encoded
+        # response body is cached so repeats skip serialization as well
+        key = make_cache_key('api_analysis_json', engine.analysis_version(competitor), competitor, focus_languages)
+        body = _analysis_flight.do(
+            key,
+            lambda: encode_json(build_analysis_response(engine, competitor, focus_languages)),
+            cache=get_cache()
+        )
         
-        return jsonify(result)
+        return app.response_class(body, mimetype='application/json')
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Weighted Competitor Scoring
+
+Scores every competitor against Semgrep in one vectorized pass. Each
+capability comparison counts +1 (Semgrep advantage), -1 (competitor
+advantage) or 0, weighted by its importance; each selected language
+counts the same way, weighted by the customer's priority for it. A score
+is Semgrep's weighted net advantage in [-1, 1], so ranking by ascending
+score puts the closest competitors first.
+
+The capability and language-support matrices are built once per data
+version; scoring a form change is a handful of array operations.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from competitive_analysis import CompetitiveAnalysisEngine, ComparisonResult
+
+IMPORTANCE_WEIGHTS = {'critical': 3.0, 'important': 2.0, 'nice_to_have': 1.0}
+DIMENSION_WEIGHTS = {'capabilities': 0.5, 'languages': 0.5}
+
+_RESULT_VALUES = {
+    ComparisonResult.SEMGREP_ADVANTAGE: 1.0,
+    ComparisonResult.EQUIVALENT: 0.0,
+    ComparisonResult.COMPETITOR_ADVANTAGE: -1.0,
+    ComparisonResult.SEMGREP_DISADVANTAGE: -1.0,
+}
+
+
+@dataclass
+class CompetitorScore:
+    competitor_name: str
+    rank: int
+    score: float
+    contributions: Dict[str, float]  # dimension -> weighted contribution; sums to score
+    capability_contributions: Dict[str, float] = field(default_factory=dict)
+    language_contributions: Dict[str, float] = field(default_factory=dict)
+
+
+class ScoringModel:
+    """Competitor x capability and competitor x language matrices for one data version."""
+
+    def __init__(self, engine: CompetitiveAnalysisEngine):
+        self.version = engine.data_version
+        self.competitors: List[str] = []
+        profiles = []
+        for name in engine.get_available_competitors():
+            try:
+                profiles.append(engine.get_competitor_profile(name))
+            except KeyError:
+                continue  # Rejected file; already reported by the store
+            self.competitors.append(name)
+
+        first = profiles[0].capability_comparisons if profiles else ()
+        self.capabilities = [cap.capability for cap in first]
+        self.importance = [cap.importance for cap in first]
+        self.capability_results = np.array(
+            [[_RESULT_VALUES[cap.result] for cap in profile.capability_comparisons] for profile in profiles],
+            dtype=np.float64
+        ).reshape(len(profiles), len(self.capabilities))
+
+        # One column per language known to Semgrep or any competitor,
+        # matched case-insensitively
+        self.language_names: Dict[str, str] = {}
+        for lang in engine.semgrep_capabilities.get('languages', []):
+            name = lang.get('language', '')
+            if name:
+                self.language_names.setdefault(name.lower(), name)
+        competitor_languages = []
+        supported_by = engine.competitor_languages(self.competitors)
+        for name in self.competitors:
+            supported = supported_by.get(name, [])
+            competitor_languages.append({lang.lower() for lang in supported})
+            for lang in supported:
+                self.language_names.setdefault(lang.lower(), lang)
+        self.language_index = {name: i for i, name in enumerate(self.language_names)}
+        # The extra last column stays zero and stands in for unknown languages
+        self._unknown_column = len(self.language_index)
+
+        semgrep_names = {lang.get('language', '').lower() for lang in engine.semgrep_capabilities.get('languages', [])}
+        self.semgrep_support = np.array([name in semgrep_names for name in self.language_index] + [False],
+                                        dtype=np.float64)
+        self.competitor_support = np.zeros((len(self.competitors), len(self.language_index) + 1), dtype=np.float64)
+        for row, supported in enumerate(competitor_languages):
+            for lang in supported:
+                self.competitor_support[row, self.language_index[lang]] = 1.0
+
+    def rank(self, language_weights: Dict[str, float],
+             importance_weights: Optional[Dict[str, float]] = None,
+             dimension_weights: Optional[Dict[str, float]] = None,
+             competitors: Optional[List[str]] = None,
+             top_k: Optional[int] = None) -> List[CompetitorScore]:
+        """Score competitors and return them closest-first, limited to top_k if given."""
+        importance_weights = importance_weights or IMPORTANCE_WEIGHTS
+        dimension_weights = dict(dimension_weights or DIMENSION_WEIGHTS)
+
+        rows = np.arange(len(self.competitors))
+        if competitors is not None:
+            wanted = set(competitors)
+            rows = np.array([i for i, name in enumerate(self.competitors) if name in wanted], dtype=np.intp)
+
+        # Capabilities: each result weighted by importance, normalized to [-1, 1]
+        capability_weights = np.array([importance_weights.get(imp, 1.0) for imp in self.importance], dtype=np.float64)
+        capability_total = capability_weights.sum()
+        capability_items = self.capability_results[rows] * (capability_weights / capability_total
+                                                            if capability_total else 0.0)
+
+        # Languages: Semgrep support minus competitor support, weighted by priority
+        languages = [name for name, weight in language_weights.items() if weight > 0]
+        priorities = np.array([language_weights[name] for name in languages], dtype=np.float64)
+        columns = np.array([self.language_index.get(name, self._unknown_column) for name in languages],
+                           dtype=np.intp)
+        support = self.semgrep_support[columns] - self.competitor_support[np.ix_(rows, columns)]
+        priority_total = priorities.sum()
+        language_items = support * (priorities / priority_total if priority_total else 0.0)
+
+        # With no languages selected the capability dimension carries the whole score
+        if not languages:
+            dimension_weights['languages'] = 0.0
+        weight_total = sum(dimension_weights.get(d, 0.0) for d in ('capabilities', 'languages')) or 1.0
+        capability_share = dimension_weights.get('capabilities', 0.0) / weight_total
+        language_share = dimension_weights.get('languages', 0.0) / weight_total
+        capability_items = capability_items * capability_share
+        language_items = language_items * language_share
+        capability_scores = capability_items.sum(axis=1)
+        language_scores = language_items.sum(axis=1)
+        scores = capability_scores + language_scores
+
+        order = np.argsort(scores, kind='stable')
+        if top_k is not None:
+            order = order[:top_k]
+        display_names = [self.language_names.get(name, name) for name in languages]
+        return [
+            CompetitorScore(
+                competitor_name=self.competitors[rows[i]],
+                rank=rank,
+                score=round(float(scores[i]), 4),
+                contributions={
+                    'capabilities': round(float(capability_scores[i]), 4),
+                    'languages': round(float(language_scores[i]), 4)
+                },
+                capability_contributions={
+                    name: round(float(value), 4) for name, value in zip(self.capabilities, capability_items[i])
+                },
+                language_contributions={
+                    name: round(float(value), 4) for name, value in zip(display_names, language_items[i])
+                } if languages else {}
+            )
+            for rank, i in enumerate(order, 1)
+        ]
+
+
+_model: Optional[ScoringModel] = None
+_model_lock = threading.Lock()
+
+
+def get_scoring_model(engine: CompetitiveAnalysisEngine) -> ScoringModel:
+    """Return the scoring model for the engine's current data, rebuilding it after a data change."""
+    global _model
+    model = _model
+    if model is not None and model.version == engine.data_version:
+        return model
+    with _model_lock:
+        if _model is None or _model.version != engine.data_version:
+            _model = ScoringModel(engine)
+        return _model
+
+
+def rank_competitors(engine: CompetitiveAnalysisEngine, language_weights: Dict[str, float],
+                     top_k: Optional[int] = None, **options) -> List[CompetitorScore]:
+    """Score all competitors for a customer's weighted languages and return the top_k closest."""
+    return get_scoring_model(engine).rank(language_weights, top_k=top_k, **options)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Competitor Store
+
+Discovers competitor files in competitors/ (every *.json except
+schema.json) instead of relying on a hardcoded list. Opening the store only
+reads the first few kilobytes of each file to index competitor names;
+full records are parsed and validated against competitors/schema.json on
+first access, then cached until the file's mtime or size changes, so engine
+start-up stays cheap as competitors are added. A file that fails
+validation is reported once and left out of the store.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from schema_validator import CompetitorValidationError, get_validator
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+COMPETITORS_DIR = os.path.join(BASE_DIR, 'competitors')
+SCHEMA_FILENAME = 'schema.json'
+HEADER_BYTES = 4096
+
+_NAME_PATTERN = re.compile(r'"competitor_name"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+
+def discover_competitor_files(directory: str = COMPETITORS_DIR) -> List[str]:
+    """Return competitor data files in the directory, sorted by filename."""
+    return sorted(
+        path for path in glob.glob(os.path.join(directory, '*.json'))
+        if os.path.basename(path) != SCHEMA_FILENAME
+    )
+
+
+def _file_signature(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _signature_or_none(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        return _file_signature(path)
+    except OSError:
+        return None
+
+
+def read_competitor_name(path: str) -> str:
+    """Read competitor_name from the start of a file, parsing the whole file only if needed."""
+    with open(path, 'r', encoding='utf-8') as f:
+        header = f.read(HEADER_BYTES)
+    match = _NAME_PATTERN.search(header)
+    if match:
+        return json.loads(match.group(1))
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['competitor_name']
+
+
+class CompetitorStore(Mapping):
+    """Read-only mapping of competitor name to record, loaded lazily per file."""
+
+    def __init__(self, directory: str = COMPETITORS_DIR):
+        self.directory = directory
+        self._lock = threading.RLock()
+        self._paths: Dict[str, str] = {}  # name -> path
+        self._headers: Dict[str, Tuple[Tuple[int, int], str]] = {}  # path -> (signature, name)
+        self._records: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}  # path -> (signature, data)
+        self._invalid: Dict[str, Tuple[int, int]] = {}  # path -> signature that failed validation
+        self._hashes: Dict[str, Tuple[Tuple[int, int], str]] = {}  # path -> (signature, sha256)
+        self._listing_signature = None
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Rescan the directory, re-reading headers only of new or changed files."""
+        with self._lock:
+            paths = {}
+            headers = {}
+            for path in discover_competitor_files(self.directory):
+                try:
+                    signature = _file_signature(path)
+                    cached = self._headers.get(path)
+                    name = cached[1] if cached and cached[0] == signature else read_competitor_name(path)
+                except Exception as e:
+                    print(f"Error loading {path}: {e}")
+                    continue
+                headers[path] = (signature, name)
+                if self._invalid.get(path) == signature:
+                    continue
+                if name in paths:
+                    print(f"Warning: {path} duplicates competitor '{name}' from {paths[name]}; ignoring it")
+                    continue
+                paths[name] = path
+            self._paths = paths
+            self._headers = headers
+            self._records = {p: r for p, r in self._records.items() if p in headers}
+            self._invalid = {p: sig for p, sig in self._invalid.items() if p in headers}
+            self._listing_signature = self._directory_signature()
+
+    def _directory_signature(self) -> Optional[int]:
+        try:
+            return os.stat(self.directory).st_mtime_ns
+        except OSError:
+            return None
+
+    def _check_listing(self) -> None:
+        # Adding or removing a file changes the directory mtime
+        if self._directory_signature() != self._listing_signature:
+            self.refresh()
+        elif self._invalid and any(_signature_or_none(p) != sig for p, sig in self._invalid.items()):
+            # A rejected file was edited in place; give it another chance
+            self.refresh()
+
+    def path_for(self, name: str) -> str:
+        self._check_listing()
+        return self._paths[name]
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        path = self.path_for(name)
+        try:
+            signature = _file_signature(path)
+        except OSError as e:
+            # Deleted or renamed since it was indexed
+            self.refresh()
+            raise KeyError(name) from e
+        cached = self._records.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        with self._lock:
+            cached = self._records.get(path)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+            try:
+                with open(path, 'rb') as f:
+                    raw = f.read()
+            except OSError as e:
+                print(f"Error loading {path}: {e}")
+                self.refresh()
+                raise KeyError(name) from e
+            try:
+                data = json.loads(raw)
+                get_validator().check(data, os.path.relpath(path, BASE_DIR), raw)
+            except (ValueError, CompetitorValidationError) as e:
+                # Drop the file from the index until it changes again
+                print(f"Error loading {path}: {e}")
+                self._invalid[path] = signature
+                self.refresh()
+                raise KeyError(name) from e
+            if data.get('competitor_name') != name:
+                # The file was renamed in place; reindex and look it up again
+                self.refresh()
+                raise KeyError(name)
+            self._records[path] = (signature, data)
+            return data
+
+    def __contains__(self, name: object) -> bool:
+        self._check_listing()
+        return name in self._paths
+
+    def __iter__(self) -> Iterator[str]:
+        self._check_listing()
+        return iter(list(self._paths))
+
+    def __len__(self) -> int:
+        self._check_listing()
+        return len(self._paths)
+
+    def load_all(self) -> int:
+        """Parse every record now (e.g. before forking workers); return how many loaded."""
+        loaded = 0
+        for name in self:
+            try:
+                self[name]
+                loaded += 1
+            except KeyError:
+                pass  # Already reported when the file was rejected
+            except Exception as e:
+                print(f"Error loading competitor {name}: {e}")
+        return loaded
+
+    def content_hash(self, name: str) -> str:
+        """SHA-256 of a competitor file's bytes, recomputed only when the file changes."""
+        path = self.path_for(name)
+        try:
+            signature = _file_signature(path)
+            cached = self._hashes.get(path)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+            with open(path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        except OSError as e:
+            # Deleted or renamed since it was indexed
+            self.refresh()
+            raise KeyError(name) from e
+        self._hashes[path] = (signature, digest)
+        return digest
+
+    def version(self) -> str:
+        """Cheap version of the competitor data: changes whenever any file changes."""
+        self._check_listing()
+        digest = hashlib.sha256()
+        for name, path in sorted(self._paths.items()):
+            try:
+                mtime_ns, size = _file_signature(path)
+            except OSError:
+                continue
+            digest.update(f"{name}\0{os.path.basename(path)}\0{mtime_ns}\0{size}\n".encode('utf-8'))
+        return digest.hexdigest()[:16]
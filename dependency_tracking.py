@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Artifact Dependency Tracking
+
+Every derived artifact (materialized analyses, report files, cache entries)
+records the sources it was built from as a mapping of source key to
+fingerprint, for example:
+
+    {"competitors/snyk.json": "3f2a...", "languages.json#python": "91bc...",
+     "scms.json#github": "07de...", "engine": "c41d..."}
+
+Comparing the recorded mapping with the current one tells exactly which
+sources changed, so an update to one competitor file only invalidates the
+artifacts that read it. Reports written to output/ keep their mapping in a
+`<artifact>.deps` manifest next to the HTML and CSV files; incremental_rebuild.py
+uses the manifests to regenerate only stale reports.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+MANIFEST_SUFFIX = '.deps'
+
+_record_fingerprints: Dict[Tuple[str, str, str], str] = {}
+
+
+def fingerprint(value: Any) -> str:
+    """Stable hash of any JSON-serializable value."""
+    canonical = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def catalog_dependencies(catalog, languages: Iterable[str], scms: Iterable[str]) -> Dict[str, str]:
+    """Fingerprints of the catalog records a report reads for its languages and SCMs.
+
+    A name missing from the catalog is recorded too, so adding it later
+    invalidates the artifact.
+    """
+    dependencies = {}
+    for kind, names, lookup in (('languages.json', languages, catalog.get_language_info),
+                                ('scms.json', scms, catalog.get_scm_info)):
+        for name in names:
+            key = (catalog.version, kind, name.lower())
+            value = _record_fingerprints.get(key)
+            if value is None:
+                record = lookup(name)
+                value = fingerprint(record) if record is not None else 'missing'
+                if len(_record_fingerprints) > 4096:
+                    _record_fingerprints.clear()
+                _record_fingerprints[key] = value
+            dependencies[f"{kind}#{name.lower()}"] = value
+    return dependencies
+
+
+def changed_sources(recorded: Dict[str, str], current: Dict[str, str]) -> List[str]:
+    """Source keys whose fingerprint differs, including sources added or removed."""
+    return sorted(key for key in set(recorded) | set(current) if recorded.get(key) != current.get(key))
+
+
+def manifest_path(artifact_file: str) -> str:
+    """Manifest kept next to an artifact's files; shares its artifact ID (e.g. Acme_matrix.deps)."""
+    return os.path.splitext(artifact_file)[0] + MANIFEST_SUFFIX
+
+
+def write_manifest(artifact_file: str, inputs: Dict[str, Any], dependencies: Dict[str, str]) -> str:
+    """Record what an artifact was built from: its inputs and source fingerprints."""
+    path = manifest_path(artifact_file)
+    # A unique temporary file, so concurrent writers of the same report never collide
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'inputs': inputs, 'dependencies': dependencies}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def read_manifest(path: str) -> Optional[Dict[str, Any]]:
+    """Load a manifest, or None if it is missing or unreadable."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not read {path}: {e}")
+        return None
+    if not isinstance(manifest, dict) or 'inputs' not in manifest or 'dependencies' not in manifest:
+        print(f"Warning: Ignoring malformed manifest {path}")
+        return None
+    return manifest
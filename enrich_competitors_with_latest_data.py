@@ -10,12 +10,18 @@ found to help track competitive intelligence updates.
 import json
 import os
 import re
+import sqlite3
 import requests
 from datetime import datetime
 from typing import Dict, List, Any, Tuple
 import time
 from bs4 import BeautifulSoup
 import difflib
+import hashlib
+
+from catalog_db import open_catalog_db
+from competitor_store import discover_competitor_files
+from schema_validator import get_validator
 
 # Rate limiting to be respectful to competitor websites
 REQUEST_DELAY = 2  # seconds between requests
@@ -29,13 +35,37 @@ def load_competitor_data(filename: str) -> Dict[str, Any]:
         print(f"Error loading {filename}: {e}")
         return {}
 
-def save_competitor_data(filename: str, data: Dict[str, Any]) -> None:
-    """Save competitor data to JSON file."""
+def save_competitor_data(filename: str, data: Dict[str, Any]) -> bool:
+    """Validate competitor data against the schema and save it to its JSON file.
+    
+    The file is replaced atomically, and only if the updated record still
+    validates, so a bad enrichment never reaches the web interfaces. With
+    CATALOG_DB set, the record is then upserted into the SQLite catalog.
+    """
+    content = (json.dumps(data, indent=2, ensure_ascii=False) + "\n").encode('utf-8')
+    errors = get_validator().errors(data, content)
+    if errors:
+        print(f"❌ Not saving {filename}: schema validation failed")
+        for error in errors:
+            print(f"   - {error}")
+        return False
+    tmp_filename = f"{filename}.tmp"
     try:
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(tmp_filename, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_filename, filename)
     except Exception as e:
         print(f"Error saving {filename}: {e}")
+        return False
+    # Mirror into the SQLite catalog when enabled, as one transaction per competitor
+    # A locked or broken database only warns: the JSON is saved and the next sync() heals the mirror
+    try:
+        db = open_catalog_db()
+        if db is not None:
+            db.upsert_competitor(data, hashlib.sha256(content).hexdigest())
+    except sqlite3.Error as e:
+        print(f"Warning: Could not update the SQLite catalog for {filename}: {e}")
+    return True
 
 def check_website_changes(competitor_name: str, website_url: str) -> Dict[str, Any]:
     """Check competitor website for significant changes."""
@@ -183,15 +213,8 @@ def main():
     print(f"Timestamp: {datetime.now().isoformat()}")
     print("=" * 60)
     
-    # Load competitor files
-    competitor_files = [
-        "competitors/checkmarx.json",
-        "competitors/veracode.json", 
-        "competitors/snyk.json",
-        "competitors/github-advanced-security.json",
-        "competitors/sonarqube.json",
-        "competitors/endor-labs.json"
-    ]
+    # Discover competitor files (every competitors/*.json except the schema)
+    competitor_files = discover_competitor_files()
     
     all_changes = {}
     
@@ -220,9 +243,10 @@ def main():
         competitor_data["last_updated"] = datetime.now().strftime("%Y-%m-%d")
         
         # Save updated data
-        if data_updated:
-            save_competitor_data(filename, competitor_data)
+        if data_updated and save_competitor_data(filename, competitor_data):
             print(f"  ✅ Updated {competitor_name} data")
+        elif data_updated:
+            print(f"  ⚠️ Kept previous {competitor_name} data")
         else:
             print(f"  📋 No data changes for {competitor_name}")
     
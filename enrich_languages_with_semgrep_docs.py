@@ -3,8 +3,11 @@ import requests
 from bs4 import BeautifulSoup
 import os
 import re
+import sqlite3
 import copy
 
+from catalog_db import open_catalog_db
+
 LANGUAGES_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'languages.json')
 SEMGREP_DOCS_URL = 'https://semgrep.dev/docs/supported-languages'
 
@@ -16,6 +19,14 @@ def load_languages():
 def save_languages(languages):
     with open(LANGUAGES_JSON, 'w') as f:
         json.dump(languages, f, indent=2)
+    # Mirror into the SQLite catalog when enabled: changed records only, in one transaction
+    # A locked or broken database only warns: the JSON is saved and the next sync() heals the mirror
+    try:
+        db = open_catalog_db()
+        if db is not None:
+            print(f"SQLite catalog: {db.upsert_languages(languages)} languages updated in {db.path}")
+    except sqlite3.Error as e:
+        print(f"Warning: Could not update the SQLite catalog: {e}")
 
 def compare_languages(old, new):
     def lang_key(lang):
@@ -4,6 +4,9 @@ from bs4 import BeautifulSoup
 import os
 import copy
 import re
+import sqlite3
+
+from catalog_db import open_catalog_db
 
 SCMS_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scms.json')
 SEMGREP_SCMS_URL = 'https://semgrep.dev/docs/getting-started/scm-support'
@@ -15,6 +18,14 @@ def load_scms():
 def save_scms(scms):
     with open(SCMS_JSON, 'w') as f:
         json.dump(scms, f, indent=2)
+    # Mirror into the SQLite catalog when enabled: changed records only, in one transaction
+    # A locked or broken database only warns: the JSON is saved and the next sync() heals the mirror
+    try:
+        db = open_catalog_db()
+        if db is not None:
+            print(f"SQLite catalog: {db.upsert_scms(scms)} SCMs updated in {db.path}")
+    except sqlite3.Error as e:
+        print(f"Warning: Could not update the SQLite catalog: {e}")
 
 def compare_scms(old, new):
     def scm_key(scm):
@@ -439,6 +439,25 @@ def fetch_scm_data() -> Dict[str, Any]:
     
     return scms_data
 
+def matrix_language_keys(name: str, languages: Dict[str, Any]) -> List[str]:
+    """
+    Map a requested language to keys of the language table.
+
+    The table is keyed by short lowercase names ("csharp", "c", "cpp"), while
+    languages.json and the lockfile, scan and SBOM lookups use catalog
+    spellings ("C#", "C/C++"). Unknown names are returned lowercased.
+    """
+    key = name.strip().lower()
+    if key in languages:
+        return [key]
+    by_name = {lang["name"].lower(): table_key for table_key, lang in languages.items()}
+    if key in by_name:
+        return [by_name[key]]
+    parts = [part.strip() for part in key.split("/")]
+    if len(parts) > 1 and all(part in by_name for part in parts):
+        return [by_name[part] for part in parts]
+    return [key]
+
 def generate_matrix(customer_requirements: Dict[str, Any]) -> Dict[str, Any]:
     """
     Generate a compatibility matrix based on customer requirements.
@@ -454,8 +473,8 @@ def generate_matrix(customer_requirements: Dict[str, Any]) -> Dict[str, Any]:
     }
     
     # Process language requirements
-    for lang_name in customer_requirements.get("languages", []):
-        lang_name = lang_name.lower()
+    requested = customer_requirements.get("languages", [])
+    for lang_name in [key for name in requested for key in matrix_language_keys(name, languages)]:
         if lang_name in languages:
             lang = languages[lang_name]
             matrix["languages"][lang_name] = {
@@ -490,6 +509,15 @@ def generate_matrix(customer_requirements: Dict[str, Any]) -> Dict[str, Any]:
                 "notes": "Not currently supported by Semgrep"
             }
     
+    # Dependency counts from the customer's own lockfiles, when any were given
+    if customer_requirements.get("lockfile_paths"):
+        from lockfile_parsers import supply_chain_scope
+        matrix["supply_chain"] = supply_chain_scope(customer_requirements["lockfile_paths"])
+    
+    # Component counts from the customer's SBOMs, ingested before the matrix is built
+    if customer_requirements.get("sca_coverage"):
+        matrix["sca_coverage"] = customer_requirements["sca_coverage"]
+    
     return matrix
 
 def save_matrix_as_csv(matrix: Dict[str, Any], output_file: str) -> None:
@@ -547,6 +575,43 @@ def save_matrix_as_csv(matrix: Dict[str, Any], output_file: str) -> None:
                     "N/A",
                     scm_data["notes"]
                 ])
+        
+        # Write supply-chain scope
+        if matrix.get("supply_chain", {}).get("ecosystems"):
+            writer.writerow([])
+            writer.writerow(["SUPPLY-CHAIN SCOPE"])
+            writer.writerow(["Ecosystem", "Package Managers", "Lockfiles", "Direct", "Transitive", "Undetermined", "Total"])
+            
+            for ecosystem in matrix["supply_chain"]["ecosystems"]:
+                writer.writerow([
+                    ecosystem["ecosystem"],
+                    ", ".join(ecosystem["package_managers"]),
+                    ecosystem["lockfiles"],
+                    ecosystem["direct"],
+                    ecosystem["transitive"],
+                    ecosystem["undetermined"],
+                    ecosystem["total"]
+                ])
+        
+        # Write SCA coverage
+        if matrix.get("sca_coverage", {}).get("ecosystems"):
+            coverage = matrix["sca_coverage"]
+            writer.writerow([])
+            writer.writerow(["SCA COVERAGE"])
+            writer.writerow(["Components in supported ecosystems", coverage["covered"], "of", coverage["components"]])
+            writer.writerow(["Ecosystem", "Components", "Supported", "Languages", "Package Managers", "Reachability", "Licenses", "Malicious Dependencies"])
+            
+            for ecosystem in coverage["ecosystems"]:
+                writer.writerow([
+                    ecosystem["ecosystem"],
+                    ecosystem["components"],
+                    "Yes" if ecosystem["supported"] else "No",
+                    ", ".join(ecosystem["languages"]) or "N/A",
+                    ", ".join(ecosystem["package_managers"]) or "N/A",
+                    "Yes" if ecosystem["reachability"] else "No",
+                    "Yes" if ecosystem["open_source_licenses"] else "No",
+                    "Yes" if ecosystem["malicious_dependencies"] else "No"
+                ])
     
     print(f"Matrix saved to {output_file}")
 
@@ -658,7 +723,79 @@ def save_matrix_as_html(matrix: Dict[str, Any], output_file: str) -> None:
     
     html += """
         </table>
+    """
+    
+    if matrix.get("supply_chain", {}).get("ecosystems"):
+        html += """
+        <h2>Supply-Chain Scope</h2>
+        <p>Dependencies found in the customer's lockfiles. Undetermined packages come from lockfiles that do not record which dependencies are direct.</p>
+        <table>
+            <tr class="header-row">
+                <th>Ecosystem</th>
+                <th>Package Managers</th>
+                <th>Lockfiles</th>
+                <th>Direct</th>
+                <th>Transitive</th>
+                <th>Undetermined</th>
+                <th>Total</th>
+            </tr>
+        """
+        
+        for ecosystem in matrix["supply_chain"]["ecosystems"]:
+            html += f"""
+            <tr>
+                <td>{ecosystem["ecosystem"]}</td>
+                <td>{", ".join(ecosystem["package_managers"])}</td>
+                <td>{ecosystem["lockfiles"]}</td>
+                <td>{ecosystem["direct"]:,}</td>
+                <td>{ecosystem["transitive"]:,}</td>
+                <td>{ecosystem["undetermined"]:,}</td>
+                <td>{ecosystem["total"]:,}</td>
+            </tr>
+            """
         
+        html += """
+        </table>
+        """
+    
+    if matrix.get("sca_coverage", {}).get("ecosystems"):
+        coverage = matrix["sca_coverage"]
+        share = f" ({coverage['covered'] / coverage['components']:.0%})" if coverage["components"] else ""
+        html += f"""
+        <h2>SCA Coverage</h2>
+        <p>{coverage["covered"]:,} of {coverage["components"]:,} SBOM components{share} are in ecosystems Semgrep Supply Chain supports; {coverage["unidentified"]:,} have no package URL.</p>
+        <table>
+            <tr class="header-row">
+                <th>Ecosystem</th>
+                <th>Components</th>
+                <th>Supported</th>
+                <th>Languages</th>
+                <th>Package Managers</th>
+                <th>Reachability</th>
+                <th>Licenses</th>
+                <th>Malicious Dependencies</th>
+            </tr>
+        """
+        
+        for ecosystem in coverage["ecosystems"]:
+            html += f"""
+            <tr>
+                <td>{ecosystem["ecosystem"]}</td>
+                <td>{ecosystem["components"]:,}</td>
+                <td class="{"supported" if ecosystem["supported"] else "not-supported"}">{"Yes" if ecosystem["supported"] else "No"}</td>
+                <td>{", ".join(ecosystem["languages"]) or "N/A"}</td>
+                <td>{", ".join(ecosystem["package_managers"]) or "N/A"}</td>
+                <td>{"Yes" if ecosystem["reachability"] else "No"}</td>
+                <td>{"Yes" if ecosystem["open_source_licenses"] else "No"}</td>
+                <td>{"Yes" if ecosystem["malicious_dependencies"] else "No"}</td>
+            </tr>
+            """
+        
+        html += """
+        </table>
+        """
+    
+    html += """
         <div style="margin-top: 30px; font-size: 0.8em;">
             <h3>Maturity Level Definitions</h3>
             <p><strong>GA (Generally Available)</strong>: Highest quality support by the Semgrep team. Reported issues are resolved promptly.</p>
@@ -705,9 +842,45 @@ def main():
     parser.add_argument("-o", "--output", default="semgrep_matrix", help="Output file name (without extension)")
     parser.add_argument("--csv", action="store_true", help="Generate CSV output")
     parser.add_argument("--html", action="store_true", help="Generate HTML output")
+    parser.add_argument("--lockfiles", help="Comma-separated lockfile or package manager names (e.g. poetry.lock,pnpm-lock.yaml); adds the languages that use them, and lockfile paths that exist are parsed for dependency counts")
+    parser.add_argument("--scan-path", help="Local checkout or archive to derive languages from (by file extension, lockfiles and LOC)")
+    parser.add_argument("--sbom", help="Comma-separated CycloneDX or SPDX JSON SBOMs (.json or .json.gz); adds the languages of their ecosystems and an SCA coverage section")
+    parser.add_argument("--scan-workers", type=int, help="Directory scanning threads for --scan-path (default: 4 per CPU, up to 32)")
+    parser.add_argument("-q", "--query", help='List languages matching a capability query, e.g. "ga and reachability and not lockfileless"')
+    parser.add_argument("--competitors-for", metavar="LANGUAGE", help="List competitors whose SAST and SCA support a language (uses the SQLite catalog when CATALOG_DB is set)")
     
     args = parser.parse_args()
     
+    if args.query is not None:
+        from capability_index import get_capability_index
+        index = get_capability_index()
+        try:
+            matches = index.query(args.query)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        for name in matches:
+            print(name)
+        print(f"{len(matches)} of {len(index.languages)} languages")
+        return
+    
+    if args.competitors_for is not None:
+        from catalog_db import CatalogDB, get_catalog_db
+        db = get_catalog_db()
+        if db is None:
+            # Without CATALOG_DB, an in-memory copy is built for this one lookup
+            db = CatalogDB(':memory:')
+            db.sync()
+        language = db.language(args.competitors_for)
+        if language is None:
+            print(f"Warning: {args.competitors_for} is not in languages.json")
+        else:
+            print(f"{language['language']}: Semgrep maturity {language.get('maturity', 'N/A')}")
+        for product in ('sast', 'sca'):
+            names = db.competitors_supporting(args.competitors_for, product)
+            print(f"{product.upper()}: {', '.join(names) or 'none'}")
+        return
+    
     # Default to both output formats if none specified
     if not (args.csv or args.html):
         args.csv = True
@@ -717,19 +890,73 @@ def main():
     if args.interactive:
         customer_requirements = interactive_input()
     else:
-        if not args.customer or not args.languages or not args.scms:
-            print("Error: When not in interactive mode, --customer, --languages, and --scms are required")
+        if not args.customer or not (args.languages or args.lockfiles or args.scan_path or args.sbom) or not args.scms:
+            print("Error: When not in interactive mode, --customer, --languages (or --lockfiles, --scan-path or --sbom), and --scms are required")
             parser.print_help()
             sys.exit(1)
         
         customer_requirements = {
             "customer_name": args.customer,
-            "languages": [lang.strip() for lang in args.languages.split(",") if lang.strip()],
+            "languages": [lang.strip() for lang in (args.languages or "").split(",") if lang.strip()],
             "scms": [scm.strip() for scm in args.scms.split(",") if scm.strip()]
         }
     
+    lockfile_paths = []
+    if args.scan_path:
+        from repo_scanner import format_scan_summary, scan_repository
+        try:
+            scan = scan_repository(args.scan_path, workers=args.scan_workers)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not scan {args.scan_path}: {e}")
+            sys.exit(1)
+        print(format_scan_summary(scan))
+        known = {lang.lower() for lang in customer_requirements["languages"]}
+        customer_requirements["languages"].extend(
+            lang for lang in scan.requirement_languages() if lang.lower() not in known)
+        if os.path.isdir(args.scan_path):
+            lockfile_paths.extend(scan.lockfile_paths)
+        elif scan.lockfile_paths:
+            print("Note: Lockfiles inside archives are listed but not parsed for dependency counts")
+    
+    if args.lockfiles:
+        from lockfile_index import get_lockfile_index
+        # Names that are existing files are also parsed for dependency counts
+        lockfile_paths.extend(name.strip() for name in args.lockfiles.split(",") if os.path.isfile(name.strip()))
+        result = get_lockfile_index().match_all(args.lockfiles.split(","))
+        for match in result['matches']:
+            print(f"{match.name.strip()}: {', '.join(match.languages)}")
+        if result['unmatched']:
+            print(f"Warning: No language uses {', '.join(name.strip() for name in result['unmatched'])}")
+        known = {lang.lower() for lang in customer_requirements["languages"]}
+        customer_requirements["languages"].extend(lang for lang in result['languages'] if lang.lower() not in known)
+    
+    if lockfile_paths:
+        customer_requirements["lockfile_paths"] = lockfile_paths
+    
+    if args.sbom:
+        from sbom_ingest import coverage_languages, format_coverage, format_sbom_summary, ingest_sbom, sca_coverage
+        summaries = []
+        for path in (path.strip() for path in args.sbom.split(",")):
+            if not path:
+                continue
+            try:
+                summary = ingest_sbom(path)
+            except (OSError, ValueError) as e:
+                print(f"Error: Could not read SBOM {path}: {e}")
+                sys.exit(1)
+            print(format_sbom_summary(summary))
+            summaries.append(summary)
+        coverage = sca_coverage(summaries)
+        print(format_coverage(coverage))
+        known = {lang.lower() for lang in customer_requirements["languages"]}
+        customer_requirements["languages"].extend(lang for lang in coverage_languages(coverage) if lang.lower() not in known)
+        customer_requirements["sca_coverage"] = coverage
+    
     # Generate the matrix
     matrix = generate_matrix(customer_requirements)
+    if "supply_chain" in matrix:
+        from lockfile_parsers import format_scope
+        print(format_scope(matrix["supply_chain"]))
     
     # Save the matrix in the requested formats
     if args.csv:
@@ -0,0 +1,24 @@
+"""
+Gunicorn configuration for the Requirements Matrix Generator.
+
+preload_app imports wsgi.py (and so runs create_app) once in the master
+process; workers are then forked with the catalog and competitor data
+already in memory and share those pages copy-on-write.
+"""
+
+import multiprocessing
+import os
+
+chdir = os.path.dirname(os.path.abspath(__file__))
+bind = os.environ.get('BIND', '127.0.0.1:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+preload_app = True
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '60'))
+accesslog = '-'
+
+
+def post_fork(server, worker):
+    # Threads do not survive fork, so background work starts in each worker
+    from web_interface import start_background_tasks
+    start_background_tasks()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Incremental Rebuild
+
+Brings derived artifacts up to date after a data update, redoing only the
+ones whose sources changed:
+
+- materialized analyses: only competitors whose file (or the engine's
+  language list) changed are re-analyzed
+- reports in output/: a report is regenerated from the inputs in its
+  `.deps` manifest only if a competitor file or catalog record it read
+  changed
+
+Cache entries need no rebuild: their keys include the same fingerprints,
+so stale entries are simply never looked up again and age out.
+
+    python incremental_rebuild.py            # rebuild what is stale
+    python incremental_rebuild.py --dry-run  # only list it, analyses included
+"""
+
+import argparse
+import glob
+import os
+from typing import Any, Dict, List
+
+from artifact_retention import OUTPUT_DIR
+from dependency_tracking import MANIFEST_SUFFIX, changed_sources, read_manifest
+from materialize_analyses import MATERIALIZED_DIR, materialize
+
+
+def stale_reports(output_dir: str = OUTPUT_DIR) -> List[Dict[str, Any]]:
+    """Reports whose recorded dependencies no longer match the current data."""
+    from web_interface import report_dependencies
+
+    stale = []
+    for path in sorted(glob.glob(os.path.join(output_dir, f"*{MANIFEST_SUFFIX}"))):
+        manifest = read_manifest(path)
+        if manifest is None:
+            continue
+        try:
+            current = report_dependencies(manifest['inputs'])
+        except (KeyError, TypeError) as e:
+            print(f"Warning: Skipping {path}: incomplete report inputs ({e})")
+            continue
+        changed = changed_sources(manifest['dependencies'], current)
+        if changed:
+            stale.append({'manifest': path, 'inputs': manifest['inputs'], 'changed': changed})
+    return stale
+
+
+def rebuild_reports(stale: List[Dict[str, Any]]) -> int:
+    """Regenerate stale reports in place, next to their manifests; return how many were rebuilt."""
+    from web_interface import generate_report, write_report_files
+
+    rebuilt = 0
+    for report in stale:
+        try:
+            write_report_files(generate_report(report['inputs']), os.path.dirname(report['manifest']))
+            rebuilt += 1
+        except Exception as e:
+            print(f"Error rebuilding {report['manifest']}: {e}")
+    return rebuilt
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild only the artifacts invalidated by a data update")
+    parser.add_argument("--dry-run", action="store_true", help="List stale analyses and reports without rebuilding anything")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help="Report directory (default: output/)")
+    parser.add_argument("--materialized-dir", default=MATERIALIZED_DIR, help="Materialized analyses directory")
+    parser.add_argument("--skip-analyses", action="store_true", help="Do not update the materialized analyses")
+    args = parser.parse_args()
+
+    if not args.skip_analyses:
+        summary = materialize(directory=args.materialized_dir, dry_run=args.dry_run)
+        if args.dry_run and summary['rebuilt']:
+            print(f"Analyses: would re-analyze {', '.join(summary['rebuilt'])}, "
+                  f"reuse {len(summary['reused'])}")
+        elif summary['written']:
+            print(f"Analyses: re-analyzed {', '.join(summary['rebuilt']) or 'none'}, "
+                  f"reused {len(summary['reused'])}")
+        else:
+            print("Analyses: up to date")
+
+    stale = stale_reports(args.output_dir)
+    for report in stale:
+        name = os.path.basename(report['manifest'])[:-len(MANIFEST_SUFFIX)]
+        print(f"Report {name}: changed {', '.join(report['changed'])}")
+    if args.dry_run:
+        print(f"{len(stale)} stale reports")
+        return
+    rebuilt = rebuild_reports(stale)
+    print(f"Reports: rebuilt {rebuilt} of {len(stale)} stale")
+
+
+if __name__ == "__main__":
+    main()
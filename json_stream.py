@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON Events
+
+Reads JSON documents of any size in constant memory, as a sequence of
+parse events, for lockfiles and SBOMs that are too large to load whole.
+Uses ijson's C tokenizer when ijson is installed; otherwise a regex
+tokenizer over 64 KiB chunks, which checks nesting but is lenient about
+misplaced commas and colons (it reads, it does not validate).
+
+iter_events() yields (path, event, value) tuples. The path is a tuple of
+map keys, with 'item' for array elements, so keys containing dots (such as
+"lodash.merge" or "net6.0") are unambiguous. Events follow ijson:
+start_map, map_key, end_map, start_array, end_array, string, number,
+boolean and null. A map_key event carries its map's path.
+
+Values at the paths passed as `values` arrive whole, as one 'value' event,
+like ijson.items(): an SBOM's ('components', 'item') yields one dict per
+component. Memory is then bounded by the largest such value rather than
+the document, and without ijson each one is decoded by the C json decoder
+instead of token by token, which is several times faster.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, BinaryIO, Collection, Iterator, List, Optional, Tuple
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+READ_CHUNK = 1 << 16
+
+# Commas are skipped and a string followed by a colon is a map key, so one
+# match yields one event; trailing whitespace is consumed with each token
+_TOKEN = re.compile(
+    r'[ \t\r\n,]*(?:'
+    r'([{}\[\]])'
+    r'|"([^"\\]*(?:\\.[^"\\]*)*)"[ \t\r\n]*(:)?'
+    r'|(-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)'
+    r'|(true|false|null)'
+    r')[ \t\r\n]*'
+)
+_SEPARATORS = re.compile(r'[ \t\r\n,]*')
+_NUMBER_CONTINUATIONS = frozenset('0123456789.eE+-')
+_LITERALS = {'true': ('boolean', True), 'false': ('boolean', False), 'null': ('null', None)}
+_DECODER = json.JSONDecoder()
+
+Path = Tuple[str, ...]
+
+
+def _scan(stream: BinaryIO, values: Collection[Path] = ()) -> Iterator[Tuple[Path, str, Any]]:
+    """Path-tracked events from a regex tokenizer over decoded chunks."""
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    buffer = ''
+    position = 0
+    eof = False
+    # Per open container: its own path and, for arrays, the path of its items
+    stack: List[Tuple[Path, Optional[Path]]] = []
+    path: Optional[Path] = ()  # Path of the next value
+    whole = bool(values) and path in values  # Whether the next value is decoded in one piece
+    match_token = _TOKEN.match
+
+    while True:
+        match = None
+        if whole:
+            start = _SEPARATORS.match(buffer, position).end()
+            if start < len(buffer) and buffer[start] not in ']}':
+                try:
+                    value, end = _DECODER.raw_decode(buffer, start)
+                except ValueError:
+                    end = None  # Cut off by the end of the buffer, or malformed
+                # As with tokens, a value touching the end of the buffer or a
+                # number followed by number characters may continue in the next chunk
+                if end is not None and (eof or (end < len(buffer) and buffer[end] not in _NUMBER_CONTINUATIONS)):
+                    position = end
+                    yield path, 'value', value
+                    # Further items of the same array are wanted too
+                    whole = bool(stack) and stack[-1][1] is not None
+                    continue
+                if eof:
+                    raise ValueError(f"Invalid JSON near {buffer[start:start + 40]!r}")
+            elif start < len(buffer) or eof:
+                whole = False  # The end of the array, or of the document
+        if not whole:
+            match = match_token(buffer, position)
+
+        # A token touching the end of the buffer, or a number followed by
+        # more number characters ("2" of "2.5"), may continue in the next chunk
+        if not eof and (match is None or match.end() == len(buffer)
+                        or (match.lastindex == 4 and buffer[match.end()] in _NUMBER_CONTINUATIONS)):
+            chunk = stream.read(READ_CHUNK)
+            eof = not chunk
+            buffer = buffer[position:] + decoder.decode(chunk, final=eof)
+            position = 0
+            continue
+        if match is None:
+            if buffer[position:].strip(' \t\r\n,'):
+                raise ValueError(f"Invalid JSON near {buffer[position:position + 40]!r}")
+            if stack:
+                raise ValueError("JSON document ends inside an open object or array")
+            return
+
+        position = match.end()
+        group = match.lastindex
+        if group == 1:
+            char = match.group(1)
+            if char == '{' or char == '[':
+                yield path, 'start_map' if char == '{' else 'start_array', None
+                items = path + ('item',) if char == '[' else None
+                stack.append((path, items))
+                path = items
+                whole = items is not None and bool(values) and items in values
+            else:
+                if not stack:
+                    raise ValueError(f"Unexpected {char!r} in JSON")
+                yield stack.pop()[0], 'end_map' if char == '}' else 'end_array', None
+                path = stack[-1][1] if stack else ()
+        elif group <= 3:
+            string = match.group(2)
+            if '\\' in string:
+                string = json.loads(f'"{string}"')
+            if group == 3:
+                if not stack or stack[-1][1] is not None:
+                    raise ValueError(f"Unexpected key {string!r} in JSON")
+                container = stack[-1][0]
+                yield container, 'map_key', string
+                path = container + (string,)
+                whole = bool(values) and path in values
+            else:
+                yield path, 'string', string
+        elif group == 4:
+            number = match.group(4)
+            yield path, 'number', float(number) if any(c in number for c in '.eE') else int(number)
+        else:
+            event, value = _LITERALS[match.group(5)]
+            yield path, event, value
+
+
+def _build(first_event: str, events: Iterator[Tuple[str, Any]]) -> Any:
+    """Assemble the container opened by `first_event` from the events that follow it."""
+    root: Any = {} if first_event == 'start_map' else []
+    containers = [root]
+    keys: List[Any] = [None]
+    for event, value in events:
+        if event == 'map_key':
+            keys[-1] = value
+            continue
+        if event == 'end_map' or event == 'end_array':
+            containers.pop()
+            keys.pop()
+            if not containers:
+                return root
+            continue
+        opens = event == 'start_map' or event == 'start_array'
+        if opens:
+            value = {} if event == 'start_map' else []
+        parent = containers[-1]
+        if isinstance(parent, dict):
+            parent[keys[-1]] = value
+        else:
+            parent.append(value)
+        if opens:
+            containers.append(value)
+            keys.append(None)
+    raise ValueError("JSON document ends inside an open object or array")
+
+
+def _track(events: Iterator[Tuple[str, Any]], values: Collection[Path]) -> Iterator[Tuple[Path, str, Any]]:
+    """Add paths to basic (event, value) pairs, assembling values at the given paths."""
+    stack: List[Tuple[Path, Optional[Path]]] = []
+    path: Optional[Path] = ()
+    for event, value in events:
+        if event == 'map_key':
+            container = stack[-1][0]
+            yield container, event, value
+            path = container + (value,)
+        elif event == 'end_map' or event == 'end_array':
+            yield stack.pop()[0], event, None
+            path = stack[-1][1] if stack else ()
+        elif values and path in values:
+            yield path, 'value', _build(event, events) if event in ('start_map', 'start_array') else value
+        elif event == 'start_map' or event == 'start_array':
+            yield path, event, None
+            items = path + ('item',) if event == 'start_array' else None
+            stack.append((path, items))
+            path = items
+        else:
+            yield path, event, value
+
+
+def basic_events(stream: BinaryIO) -> Iterator[Tuple[str, Any]]:
+    """(event, value) pairs, as ijson.basic_parse produces them."""
+    if ijson is not None:
+        return ijson.basic_parse(stream)
+    return ((event, value) for _, event, value in _scan(stream))
+
+
+def iter_events(stream: BinaryIO, values: Collection[Path] = ()) -> Iterator[Tuple[Path, str, Any]]:
+    """(path, event, value) for every parse event in a binary JSON stream.
+
+    Values at a path in `values` are yielded whole as (path, 'value', value)
+    instead of as the events inside them.
+    """
+    values = frozenset(values)
+    if ijson is not None:
+        return _track(iter(ijson.basic_parse(stream)), values)
+    return _scan(stream, values)
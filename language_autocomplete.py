@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Language Autocomplete
+
+Prefix trie over everything a rep might type into the languages field:
+language names from languages.json and the competitors' language lists,
+common aliases, and the package managers and lockfiles of the lockfile
+index. A package manager or lockfile completes to the language it belongs
+to ("poe" offers Poetry → Python). Main frameworks are indexed too, but
+only where languages.json lists them.
+
+Every name is indexed under its full spelling and under each word start
+("helm" finds Kubernetes/Helm). Each trie node stores its best completions,
+ranked at build time, so a lookup walks the prefix and slices a list. The
+trie is rebuilt only when the catalog or competitor data changes; its
+version is a content fingerprint, so every worker derives the same ETag.
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from catalog import split_names
+from dependency_tracking import fingerprint
+from language_resolver import LANGUAGE_ALIASES
+from lockfile_index import get_lockfile_index
+
+MAX_COMPLETIONS = 20
+DEFAULT_LIMIT = 8
+
+# Rank of each kind of completion; lower ranks are offered first
+KIND_RANKS = {
+    'language': 0,
+    'competitor_language': 1,
+    'alias': 2,
+    'framework': 3,
+    'package_manager': 4,
+    'lockfile': 5,
+}
+
+_WORD_START = re.compile(r'(?<=[\s/\-_.(+#])(?=\w)')
+
+
+@dataclass
+class Completion:
+    text: str  # What matched, e.g. "Django" or "package-lock.json"
+    kind: str  # One of KIND_RANKS
+    language: str  # Language name inserted into the form when chosen
+
+
+def _keys(text: str) -> List[str]:
+    """Lowercase index keys: the whole name and each word start within it."""
+    lowered = text.lower()
+    return [lowered] + [lowered[match.start():] for match in _WORD_START.finditer(lowered)]
+
+
+class AutocompleteIndex:
+    """Prefix trie with precomputed, ranked completions at every node."""
+
+    def __init__(self, completions: Iterable[Completion], version: str):
+        self.version = version
+        self.completions: List[Completion] = []
+        self._root: Dict[str, Any] = {}
+        seen = set()
+        for completion in completions:
+            identity = (completion.text.lower(), completion.language.lower())
+            if identity in seen:
+                continue
+            seen.add(identity)
+            self._insert(completion)
+        self._finalize(self._root)
+
+    def _insert(self, completion: Completion) -> None:
+        position = len(self.completions)
+        self.completions.append(completion)
+        for depth, key in enumerate(_keys(completion.text)):
+            # A match at the start of the name beats one on a later word
+            rank = (depth > 0, KIND_RANKS.get(completion.kind, len(KIND_RANKS)),
+                    len(completion.text), completion.text.lower())
+            node = self._root
+            for char in key:
+                node = node.setdefault(char, {})
+                node.setdefault('', []).append((rank, position))
+
+    def _finalize(self, node: Dict[str, Any]) -> None:
+        # The empty-string slot holds the node's completions; other keys are children
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            ranked = current.get('')
+            if ranked is not None:
+                best = {}
+                for rank, position in sorted(ranked):
+                    best.setdefault(position, rank)
+                    if len(best) >= MAX_COMPLETIONS:
+                        break
+                current[''] = list(best)
+            stack.extend(child for key, child in current.items() if key)
+
+    def complete(self, prefix: str, limit: int = DEFAULT_LIMIT) -> List[Completion]:
+        """Best completions for a prefix, at most min(limit, MAX_COMPLETIONS)."""
+        node = self._root
+        for char in ' '.join(prefix.lower().split()):
+            node = node.get(char)
+            if node is None:
+                return []
+        if node is self._root:
+            return []
+        return [self.completions[position] for position in node.get('', [])[:limit]]
+
+
+def build_autocomplete_index(catalog, competitor_languages: Optional[Dict[str, List[str]]] = None,
+                             aliases: Optional[Dict[str, str]] = None) -> AutocompleteIndex:
+    """Index catalog and competitor languages, aliases, frameworks, and the lockfile index's names."""
+    completions: List[Completion] = []
+    catalog_names = {}
+    for lang in catalog.languages:
+        name = lang.get('language', '')
+        if not name:
+            continue
+        catalog_names.setdefault(name.lower(), name)
+        completions.append(Completion(name, 'language', name))
+        for framework in split_names(lang.get('main_frameworks')):
+            completions.append(Completion(framework, 'framework', name))
+    # The lockfile index falls back to KNOWN_LOCKFILES where the docs list nothing
+    completions.extend(Completion(entry.pattern, entry.kind, entry.language)
+                       for entry in get_lockfile_index(catalog).named_entries())
+
+    other_names = {}
+    for languages in (competitor_languages or {}).values():
+        for name in languages:
+            if name and name.lower() not in catalog_names:
+                other_names.setdefault(name.lower(), name)
+    completions.extend(Completion(name, 'competitor_language', name) for name in other_names.values())
+
+    known = dict(other_names, **catalog_names)
+    for alias, target in (aliases if aliases is not None else LANGUAGE_ALIASES).items():
+        if target.lower() in known and alias not in known:
+            completions.append(Completion(alias, 'alias', known[target.lower()]))
+
+    version = fingerprint([catalog.version, sorted(other_names)])
+    return AutocompleteIndex(completions, version)
+
+
+_index: Optional[AutocompleteIndex] = None
+_index_source: Optional[Tuple] = None
+_index_lock = threading.Lock()
+
+
+def get_autocomplete_index(catalog, engine=None) -> AutocompleteIndex:
+    """Return the trie for the current catalog and competitor data, rebuilding it after a change."""
+    global _index, _index_source
+    source = (catalog.version, engine.data_version if engine is not None else None)
+    index = _index
+    if index is not None and _index_source == source:
+        return index
+    with _index_lock:
+        if _index is None or _index_source != source:
+            competitor_languages = {}
+            if engine is not None:
+                for name in engine.get_available_competitors():
+                    try:
+                        competitor_languages[name] = engine.competitors[name].get(
+                            'products', {}).get('sast', {}).get('languages_supported', [])
+                    except KeyError:
+                        continue
+            _index = build_autocomplete_index(catalog, competitor_languages)
+            _index_source = source
+        return _index
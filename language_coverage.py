@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Weighted Language Coverage
+
+Customers care about how much of their code a scanner covers, not how many
+language names it lists. Given a language mix weighted by lines of code or
+repository counts ("python:120000, java:40000"), this computes the share of
+the mix covered by Semgrep and by each competitor, split by Semgrep's
+maturity tier for each language (semgrep_docs.maturity in languages.json).
+For a competitor the split shows how much of the code it covers falls in
+languages Semgrep supports as GA, Beta or Experimental, or not at all.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+TIERS = ('GA', 'Beta', 'Experimental', 'Not supported')
+_TIER_BY_MATURITY = {'ga': 0, 'beta': 1, 'experimental': 2}
+_UNSUPPORTED = len(TIERS) - 1
+
+
+def parse_language_weights(text: str) -> Dict[str, float]:
+    """Parse "python:3, java" into {"python": 3.0, "java": 1.0}; a language without a weight gets 1."""
+    weights: Dict[str, float] = {}
+    for token in text.split(','):
+        name, _, weight = token.partition(':')
+        name = name.strip().lower()
+        if not name:
+            continue
+        try:
+            value = float(weight) if weight.strip() else 1.0
+        except ValueError:
+            raise ValueError(f"Invalid weight for {name}: {weight.strip()!r}")
+        if value < 0 or value != value or value == float('inf'):
+            raise ValueError(f"Weight for {name} must be a non-negative number")
+        weights[name] = weights.get(name, 0.0) + value
+    return weights
+
+
+def semgrep_tier(language_record: Optional[Dict[str, Any]]) -> int:
+    """Index into TIERS for a languages.json record (None if the language is not in the catalog)."""
+    if language_record is None:
+        return _UNSUPPORTED
+    maturity = (language_record.get('semgrep_docs') or {}).get('maturity') or language_record.get('maturity', '')
+    # A catalog language with an unrecognized maturity is still supported; count it conservatively
+    return _TIER_BY_MATURITY.get(str(maturity).strip().lower(), _TIER_BY_MATURITY['experimental'])
+
+
+def compute_language_coverage(language_weights: Dict[str, float], semgrep_languages: List[Dict[str, Any]],
+                              competitor_languages: Optional[Dict[str, List[str]]] = None,
+                              weighted: bool = True) -> Optional[Dict[str, Any]]:
+    """Weighted coverage for Semgrep and each competitor; None if the mix has no weight.
+
+    competitor_languages maps a competitor name to its SAST language list.
+    Percentages are of the whole mix; `weighted` only labels whether the
+    weights were given explicitly or every language counted once.
+    """
+    names = [name for name, weight in language_weights.items() if weight > 0]
+    if not names:
+        return None
+    weights = np.array([language_weights[name] for name in names], dtype=np.float64)
+    total = weights.sum()
+
+    catalog = {}
+    for record in semgrep_languages:
+        catalog.setdefault(record.get('language', '').lower(), record)
+    tiers = np.array([semgrep_tier(catalog.get(name)) for name in names], dtype=np.intp)
+    tier_matrix = np.eye(len(TIERS))[tiers]  # languages x tiers, one-hot
+
+    vendors = ['Semgrep']
+    support_rows = [tiers != _UNSUPPORTED]
+    for competitor, languages in (competitor_languages or {}).items():
+        supported = {lang.lower() for lang in languages}
+        vendors.append(competitor)
+        support_rows.append(np.array([name in supported for name in names]))
+    support = np.array(support_rows, dtype=np.float64)  # vendors x languages
+
+    by_tier = (support * weights) @ tier_matrix * (100.0 / total)  # vendors x tiers
+    coverage = by_tier.sum(axis=1)
+    mix_by_tier = weights @ tier_matrix * (100.0 / total)
+
+    return {
+        'weighted': weighted,
+        'total_weight': float(total),
+        'tiers': list(TIERS),
+        'mix_by_tier': {tier: round(float(share), 1) for tier, share in zip(TIERS, mix_by_tier)},
+        'vendors': [
+            {
+                'name': vendor,
+                'coverage': round(float(coverage[row]), 1),
+                'by_tier': {tier: round(float(share), 1) for tier, share in zip(TIERS, by_tier[row])}
+            }
+            for row, vendor in enumerate(vendors)
+        ]
+    }
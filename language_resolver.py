@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Language Name Resolution
+
+Resolves free-text language tokens from the form ("Javascipt", "golang",
+"c++", "kotlin/android") to canonical language names before any lookup, so
+a typo or a common alias no longer ends up as "Not currently supported by
+Semgrep". Canonical names come from languages.json and from the
+competitors' language lists; catalog spellings win when both list a name.
+
+Each token is tried as an exact name, then as a known alias, then piece by
+piece for compound tokens, and finally against a BK-tree over all names
+and aliases using optimal string alignment distance (so transpositions
+such as "pyhton" count as one edit). Results are memoized per index.
+"""
+
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Common alternative names, mapped to canonical names as spelled in languages.json
+LANGUAGE_ALIASES = {
+    'golang': 'Go',
+    'js': 'JavaScript',
+    'node': 'JavaScript',
+    'nodejs': 'JavaScript',
+    'node.js': 'JavaScript',
+    'ecmascript': 'JavaScript',
+    'ts': 'Typescript',
+    'tsx': 'Typescript',
+    'react': 'JSX',
+    'c': 'C/C++',
+    'c++': 'C/C++',
+    'cpp': 'C/C++',
+    'cxx': 'C/C++',
+    'csharp': 'C#',
+    'dotnet': 'C#',
+    'c sharp': 'C#',
+    'cs': 'C#',
+    'py': 'Python',
+    'python3': 'Python',
+    'rb': 'Ruby',
+    'kt': 'Kotlin',
+    'rs': 'Rust',
+    'hcl': 'Terraform',
+    'tf': 'Terraform',
+    'salesforce': 'APEX',
+    'flutter': 'Dart',
+    'ex': 'Elixir',
+}
+
+MAX_MEMOIZED = 4096
+_PART_SEPARATORS = re.compile(r'\s*(?:/|\(|\)|&|\band\b)\s*')
+
+
+@dataclass
+class LanguageResolution:
+    token: str
+    language: Optional[str]  # Canonical name, or None if nothing matched closely enough
+    method: str  # exact, alias, part, fuzzy or unresolved
+    distance: int = 0
+    in_catalog: bool = False
+    suggestions: List[str] = field(default_factory=list)
+
+
+def edit_distance(a: str, b: str, limit: Optional[int] = None) -> int:
+    """Optimal string alignment distance; stops early and returns limit + 1 once it is exceeded."""
+    if a == b:
+        return 0
+    if limit is not None and abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            cost = 0 if ca == cb else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if limit is not None and row_min > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class _BKTree:
+    """Metric tree over lowercase names for bounded edit-distance queries."""
+
+    def __init__(self, words: Iterable[str]):
+        self._root: Optional[Tuple[str, Dict[int, tuple]]] = None
+        for word in words:
+            self._add(word)
+
+    def _add(self, word: str) -> None:
+        if self._root is None:
+            self._root = (word, {})
+            return
+        node = self._root
+        while True:
+            distance = edit_distance(word, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                return
+            node = child
+
+    def search(self, word: str, max_distance: int) -> List[Tuple[int, str]]:
+        """All (distance, name) pairs within max_distance, closest first."""
+        if self._root is None:
+            return []
+        found = []
+        stack = [self._root]
+        while stack:
+            name, children = stack.pop()
+            distance = edit_distance(word, name, max_distance + max(children, default=0))
+            if distance <= max_distance:
+                found.append((distance, name))
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(child for d, child in children.items() if low <= d <= high)
+        return sorted(found)
+
+
+def max_typo_distance(token: str) -> int:
+    """Edits tolerated for a token: none for very short tokens, more for longer ones."""
+    length = len(token)
+    if length <= 3:
+        return 0
+    if length <= 5:
+        return 1
+    if length <= 9:
+        return 2
+    return 3
+
+
+class LanguageResolver:
+    """Resolve language tokens against catalog names, competitor names and aliases."""
+
+    def __init__(self, catalog_names: Iterable[str], other_names: Iterable[str] = (),
+                 aliases: Optional[Dict[str, str]] = None):
+        self._canonical: Dict[str, str] = {}  # lowercase -> canonical spelling
+        self._catalog = set()
+        for name in catalog_names:
+            if name:
+                self._canonical.setdefault(name.lower(), name)
+                self._catalog.add(name.lower())
+        for name in other_names:
+            if name:
+                self._canonical.setdefault(name.lower(), name)
+        self._aliases = {
+            alias: self._canonical[target.lower()]
+            for alias, target in (aliases if aliases is not None else LANGUAGE_ALIASES).items()
+            if target.lower() in self._canonical and alias not in self._canonical
+        }
+        self._tree = _BKTree(list(self._canonical) + list(self._aliases))
+        self._memo: Dict[str, LanguageResolution] = {}
+        self._lock = threading.Lock()
+
+    def _target(self, key: str) -> Optional[str]:
+        return self._canonical.get(key) or self._aliases.get(key)
+
+    def _result(self, token: str, language: str, method: str, distance: int = 0,
+                suggestions: Optional[List[str]] = None) -> LanguageResolution:
+        return LanguageResolution(token=token, language=language, method=method, distance=distance,
+                                  in_catalog=language.lower() in self._catalog,
+                                  suggestions=suggestions or [])
+
+    def _fuzzy(self, key: str) -> List[Tuple[int, str]]:
+        matches = []
+        seen = set()
+        for distance, name in self._tree.search(key, max_typo_distance(key)):
+            target = self._target(name)
+            if target not in seen:
+                seen.add(target)
+                # Catalog languages first among equally close matches
+                matches.append((distance, target.lower() not in self._catalog, target))
+        return [(distance, target) for distance, _, target in sorted(matches)]
+
+    def resolve(self, token: str) -> LanguageResolution:
+        """Resolve one token; unresolved results still carry close suggestions when any exist."""
+        key = ' '.join(token.strip().lower().split())
+        cached = self._memo.get(key)
+        if cached is not None:
+            return LanguageResolution(token=token, language=cached.language, method=cached.method,
+                                      distance=cached.distance, in_catalog=cached.in_catalog,
+                                      suggestions=list(cached.suggestions))
+        resolution = self._resolve(token, key)
+        with self._lock:
+            if len(self._memo) >= MAX_MEMOIZED:
+                self._memo.clear()
+            self._memo[key] = resolution
+        return resolution
+
+    def _resolve(self, token: str, key: str) -> LanguageResolution:
+        if key in self._canonical:
+            return self._result(token, self._canonical[key], 'exact')
+        if key in self._aliases:
+            return self._result(token, self._aliases[key], 'alias')
+
+        # "kotlin/android", "typescript (react)": the first piece that names a language
+        parts = [part for part in _PART_SEPARATORS.split(key) if part]
+        if len(parts) > 1:
+            for part in parts:
+                target = self._target(part)
+                if target:
+                    return self._result(token, target, 'part')
+
+        matches = self._fuzzy(key)
+        if not matches and len(parts) > 1:
+            for part in parts:
+                matches = self._fuzzy(part)
+                if matches:
+                    break
+        suggestions = [target for _, target in matches[:3]]
+        if matches and (len(matches) == 1 or matches[0][0] < matches[1][0]
+                        or matches[0][1].lower() in self._catalog):
+            return self._result(token, matches[0][1], 'fuzzy', matches[0][0], suggestions[1:])
+        return LanguageResolution(token=token, language=None, method='unresolved', suggestions=suggestions)
+
+    def resolve_all(self, tokens: Iterable[str]) -> List[LanguageResolution]:
+        return [self.resolve(token) for token in tokens]
+
+
+_resolver: Optional[LanguageResolver] = None
+_resolver_version = None
+_resolver_lock = threading.Lock()
+
+
+def get_language_resolver(catalog, engine=None) -> LanguageResolver:
+    """Return the resolver for the current catalog and competitor data, rebuilding it after a change."""
+    global _resolver, _resolver_version
+    version = (catalog.version, engine.data_version if engine is not None else None)
+    resolver = _resolver
+    if resolver is not None and _resolver_version == version:
+        return resolver
+    with _resolver_lock:
+        if _resolver is None or _resolver_version != version:
+            other_names = []
+            if engine is not None:
+                for name in engine.get_available_competitors():
+                    try:
+                        other_names.extend(engine.competitors[name].get('products', {})
+                                           .get('sast', {}).get('languages_supported', []))
+                    except KeyError:
+                        continue
+            _resolver = LanguageResolver((lang['language'] for lang in catalog.languages), other_names)
+            _resolver_version = version
+        return _resolver
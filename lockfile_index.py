@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Lockfile and Package Manager Index
+
+Reverse index from lockfile names, lockfile glob patterns (such as
+`*requirement*.txt`) and package manager names to the catalog languages
+that use them, with each language's SCA features. Customers often describe
+their stack as "poetry.lock, pnpm-lock.yaml and gradle.lockfile"; matching
+those names in bulk yields the languages for the matrix.
+
+Entries come from `semgrep_docs.package_managers` and `semgrep_docs.lockfiles`
+in languages.json. A language whose record lists none falls back to
+KNOWN_LOCKFILES, so the index is useful before the docs enricher has filled
+those fields in.
+"""
+
+import fnmatch
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from catalog import load_catalog, split_names
+
+SCA_FEATURES = ('reachability', 'open_source_licenses', 'malicious_dependencies', 'scan_without_lockfiles')
+
+# Package manager -> lockfiles per catalog language, from Semgrep's supported
+# ecosystems documentation; used only where languages.json lists nothing
+KNOWN_LOCKFILES = {
+    'C#': {'NuGet': ['packages.lock.json']},
+    'Dart': {'Pub': ['pubspec.lock']},
+    'Elixir': {'Hex': ['mix.lock']},
+    'Go': {'Go modules': ['go.mod']},
+    'Java': {'Maven': ['maven_dep_tree.txt'], 'Gradle': ['gradle.lockfile']},
+    'JavaScript': {'npm': ['package-lock.json'], 'Yarn': ['yarn.lock'], 'pnpm': ['pnpm-lock.yaml']},
+    'Kotlin': {'Maven': ['maven_dep_tree.txt'], 'Gradle': ['gradle.lockfile']},
+    'PHP': {'Composer': ['composer.lock']},
+    'Python': {'pip': ['*requirement*.txt', '*requirement*.pip'], 'Pipenv': ['Pipfile.lock'],
+               'Poetry': ['poetry.lock'], 'uv': ['uv.lock']},
+    'Ruby': {'RubyGems': ['Gemfile.lock']},
+    'Rust': {'Cargo': ['Cargo.lock']},
+    'Scala': {'Maven': ['maven_dep_tree.txt']},
+    'Swift': {'SwiftPM': ['Package.resolved'], 'CocoaPods': ['Podfile.lock']},
+    'Typescript': {'npm': ['package-lock.json'], 'Yarn': ['yarn.lock'], 'pnpm': ['pnpm-lock.yaml']},
+}
+
+MAX_MEMOIZED = 65536
+_GLOB_CHARACTERS = re.compile(r'[*?\[]')
+
+
+@dataclass
+class LockfileEntry:
+    pattern: str  # Lockfile name, glob pattern or package manager name as listed
+    kind: str  # lockfile or package_manager
+    language: str
+    package_managers: List[str]
+    sca_features: Dict[str, bool]
+
+
+@dataclass
+class LockfileMatch:
+    name: str  # The filename or package manager as given
+    entries: List[LockfileEntry] = field(default_factory=list)
+
+    @property
+    def languages(self) -> List[str]:
+        return list(dict.fromkeys(entry.language for entry in self.entries))
+
+
+class LockfileIndex:
+    """Exact-name and glob lookup from lockfiles and package managers to languages."""
+
+    def __init__(self, languages: List[Dict[str, Any]], version: str = '',
+                 known_lockfiles: Optional[Dict[str, Dict[str, List[str]]]] = None):
+        self.version = version
+        known = known_lockfiles if known_lockfiles is not None else KNOWN_LOCKFILES
+        self._exact: Dict[str, List[LockfileEntry]] = {}
+        self._managers: Dict[str, List[LockfileEntry]] = {}
+        self._globs: List[Tuple[str, List[LockfileEntry]]] = []
+        globs: Dict[str, List[LockfileEntry]] = {}
+
+        for lang in languages:
+            name = lang.get('language', '')
+            docs = lang.get('semgrep_docs') or {}
+            features = {feature: bool(docs.get(feature)) for feature in SCA_FEATURES}
+            managers = split_names(docs.get('package_managers'))
+            lockfiles = split_names(docs.get('lockfiles'))
+            if managers or lockfiles:
+                by_manager = {manager: [] for manager in managers}
+                by_manager[''] = lockfiles  # The docs list managers and lockfiles separately
+            else:
+                by_manager = known.get(name, {})
+            all_managers = [manager for manager in by_manager if manager]
+            for manager, manager_lockfiles in by_manager.items():
+                if manager:
+                    self._managers.setdefault(manager.lower(), []).append(
+                        LockfileEntry(manager, 'package_manager', name, [manager], features))
+                for lockfile in manager_lockfiles:
+                    entry = LockfileEntry(lockfile, 'lockfile', name, [manager] if manager else all_managers,
+                                          features)
+                    if _GLOB_CHARACTERS.search(lockfile):
+                        globs.setdefault(lockfile.lower(), []).append(entry)
+                    else:
+                        self._exact.setdefault(lockfile.lower(), []).append(entry)
+
+        # All glob patterns in one alternation, so each filename is scanned once
+        self._globs = list(globs.items())
+        self._glob_regex = re.compile('|'.join(
+            f"(?P<g{position}>{fnmatch.translate(pattern)})" for position, (pattern, _) in enumerate(self._globs)
+        )) if self._globs else None
+        self._memo: Dict[str, List[LockfileEntry]] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, filename: str) -> List[LockfileEntry]:
+        """Entries for one lockfile path (matched on its base name, case-insensitively)."""
+        key = os.path.basename(filename.strip().replace('\\', '/')).lower()
+        entries = self._memo.get(key)
+        if entries is not None:
+            return entries
+        entries = self._exact.get(key)
+        if entries is None and self._glob_regex is not None:
+            match = self._glob_regex.match(key)
+            entries = self._globs[int(match.lastgroup[1:])][1] if match else None
+        entries = entries or []
+        with self._lock:
+            if len(self._memo) >= MAX_MEMOIZED:
+                self._memo.clear()
+            self._memo[key] = entries
+        return entries
+
+    def named_entries(self) -> List[LockfileEntry]:
+        """Every package manager and exact lockfile entry; glob patterns are left out."""
+        return [entry for entries in (*self._managers.values(), *self._exact.values()) for entry in entries]
+
+    def is_lockfile(self, filename: str) -> bool:
+        return bool(self.lookup(filename))
+
+    def match(self, name: str) -> LockfileMatch:
+        """Match a lockfile path or, failing that, a package manager name ("poetry")."""
+        entries = self.lookup(name) or self._managers.get(name.strip().lower(), [])
+        return LockfileMatch(name=name, entries=list(entries))
+
+    def match_all(self, names: Iterable[str]) -> Dict[str, Any]:
+        """Resolve many filenames at once.
+
+        Returns the matches, the names that matched nothing, and the matched
+        languages in first-seen order, ready to use as a report's languages.
+        """
+        matches = []
+        unmatched = []
+        languages: Dict[str, None] = {}
+        for name in names:
+            if not name or not name.strip():
+                continue
+            result = self.match(name)
+            if result.entries:
+                matches.append(result)
+                for language in result.languages:
+                    languages.setdefault(language, None)
+            else:
+                unmatched.append(name)
+        return {'matches': matches, 'unmatched': unmatched, 'languages': list(languages)}
+
+
+_index: Optional[LockfileIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_lockfile_index(catalog=None) -> LockfileIndex:
+    """Return the index for the current catalog, rebuilding it when the catalog changes."""
+    global _index
+    catalog = catalog or load_catalog()
+    index = _index
+    if index is not None and index.version == catalog.version:
+        return index
+    with _index_lock:
+        if _index is None or _index.version != catalog.version:
+            _index = LockfileIndex(catalog.languages, catalog.version)
+        return _index
@@ -0,0 +1,654 @@
+#!/usr/bin/env python3
+"""
+Lockfile Dependency Counts
+
+Counts the direct and transitive dependencies in each lockfile format that
+languages.json lists (npm, Yarn, pnpm, Poetry, Pipenv, uv, pip, Maven,
+Gradle, Cargo, Go modules, NuGet, Composer, RubyGems, Pub, Hex, SwiftPM,
+CocoaPods), so a matrix can say how many packages Supply Chain would
+actually cover instead of only which lockfiles exist.
+
+Every format is read incrementally: JSON lockfiles through json_stream's
+event parser, TOML and YAML lockfiles line by line with a small per-format
+state machine (their lockfile dialects are regular enough that a full
+parser is not needed). Only counters and, where a format requires it, the
+set of direct dependency names are held in memory.
+
+Where a lockfile does not mark its direct dependencies, they are read from
+the manifest beside it (package.json, pyproject.toml, Pipfile,
+composer.json); when that is missing too, the direct count is None and the
+packages are reported as undetermined rather than guessed.
+
+    python lockfile_parsers.py package-lock.json services/*/poetry.lock
+"""
+
+import argparse
+import fnmatch
+import io
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from json_stream import iter_events
+
+# purl package type -> display name
+ECOSYSTEMS = {
+    'npm': 'npm',
+    'pypi': 'PyPI',
+    'maven': 'Maven',
+    'cargo': 'crates.io',
+    'golang': 'Go',
+    'nuget': 'NuGet',
+    'composer': 'Packagist',
+    'gem': 'RubyGems',
+    'pub': 'pub.dev',
+    'hex': 'Hex',
+    'swift': 'Swift',
+    'cocoapods': 'CocoaPods',
+}
+
+NPM_DEPENDENCY_SECTIONS = ('dependencies', 'devDependencies', 'optionalDependencies')
+
+_TOML_HEADER = re.compile(r'^\[\[?\s*([^\[\]]+?)\s*\]\]?\s*(?:#.*)?$')
+_TOML_KEY = re.compile(r'^(["\']?)([A-Za-z0-9_.\-]+)\1\s*=')
+_TOML_STRING = re.compile(r'"((?:[^"\\]|\\.)*)"|\'([^\']*)\'')
+_INLINE_NAME = re.compile(r'\bname\s*=\s*"([^"]+)"')
+_REQUIREMENT_NAME = re.compile(r'^\s*([A-Za-z0-9][A-Za-z0-9._\-]*)')
+_PYTHON_NAME_SEPARATORS = re.compile(r'[-_.]+')
+_MAVEN_TREE_BRANCH = re.compile(r'^([| ]*)[+\\]- ')
+_GO_REQUIRE = re.compile(r'^require\b')
+_MIX_ENTRY = re.compile(r'^\s+"[^"]+"\s*:\s*\{')
+
+# Tables whose keys are Python dependency names (Pipfile and Poetry's pyproject.toml)
+_TOML_KEY_TABLES = ('packages', 'dev-packages', 'tool.poetry.dependencies', 'tool.poetry.dev-dependencies')
+_POETRY_GROUP_TABLE = re.compile(r'^tool\.poetry\.group\.[^.]+\.dependencies$')
+# Tables in which every array holds PEP 508 requirement strings
+_TOML_ARRAY_TABLES = ('project.optional-dependencies', 'dependency-groups')
+
+
+@dataclass
+class LockfileDependencies:
+    path: str
+    ecosystem: str  # Key of ECOSYSTEMS
+    package_manager: str
+    total: int
+    direct: Optional[int]  # None when neither the lockfile nor a manifest says which are direct
+
+    @property
+    def transitive(self) -> Optional[int]:
+        return None if self.direct is None else max(self.total - self.direct, 0)
+
+
+@dataclass
+class EcosystemScope:
+    ecosystem: str
+    package_managers: List[str] = field(default_factory=list)
+    lockfiles: int = 0
+    direct: int = 0
+    transitive: int = 0
+    undetermined: int = 0  # Packages in lockfiles that do not distinguish direct from transitive
+    total: int = 0
+
+    def add(self, counts: LockfileDependencies) -> None:
+        if counts.package_manager not in self.package_managers:
+            self.package_managers.append(counts.package_manager)
+        self.lockfiles += 1
+        self.total += counts.total
+        if counts.direct is None:
+            self.undetermined += counts.total
+        else:
+            self.direct += counts.direct
+            self.transitive += counts.transitive
+
+
+def _lines(stream: BinaryIO) -> Iterator[str]:
+    return io.TextIOWrapper(stream, encoding='utf-8', errors='replace')
+
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip(' '))
+
+
+def _yaml_key(stripped: str) -> Optional[str]:
+    """The key of a `key:` or `key: value` YAML line, unquoted."""
+    if stripped[0] in '\'"':
+        end = stripped.find(stripped[0], 1)
+        return stripped[1:end] if end > 0 else None
+    key, separator, _ = stripped.partition(':')
+    return key.strip() if separator else None
+
+
+def _python_name(name: str) -> str:
+    return _PYTHON_NAME_SEPARATORS.sub('-', name).lower()
+
+
+def _requirement_name(requirement: str) -> Optional[str]:
+    match = _REQUIREMENT_NAME.match(requirement)
+    return match.group(1) if match else None
+
+
+def _toml_strings(text: str) -> List[str]:
+    return [double if double else single for double, single in _TOML_STRING.findall(text)]
+
+
+def _bracket_depth(text: str) -> int:
+    """Net '[' minus ']' outside of strings, to follow multi-line arrays."""
+    bare = _TOML_STRING.sub('', text)
+    return bare.count('[') - bare.count(']')
+
+
+def _array_names(text: str) -> List[str]:
+    """Package names in (part of) a TOML array of inline tables or requirement strings."""
+    names = _INLINE_NAME.findall(text)
+    if names:
+        return names
+    return [name for name in map(_requirement_name, _toml_strings(text)) if name]
+
+
+def _sibling(path: str, name: str) -> Optional[str]:
+    candidate = os.path.join(os.path.dirname(path), name)
+    return candidate if os.path.isfile(candidate) else None
+
+
+def _json_manifest_keys(path: Optional[str], sections: Iterable[Tuple[str, ...]]) -> Optional[Set[str]]:
+    """Keys of the given objects in a JSON manifest, or None if it is missing or unreadable."""
+    if path is None:
+        return None
+    sections = set(sections)
+    names = set()
+    try:
+        with open(path, 'rb') as f:
+            for prefix, event, value in iter_events(f):
+                if event == 'map_key' and prefix in sections:
+                    names.add(value)
+    except (OSError, ValueError):
+        return None
+    return names
+
+
+def _toml_manifest_names(path: Optional[str]) -> Optional[Set[str]]:
+    """Normalized Python dependency names declared in a pyproject.toml or Pipfile."""
+    if path is None:
+        return None
+    names = set()
+    table = ''
+    depth = 0
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                stripped = line.strip()
+                if depth > 0:
+                    names.update(_python_name(name) for name in _array_names(stripped))
+                    depth += _bracket_depth(stripped)
+                    continue
+                header = _TOML_HEADER.match(stripped)
+                if header:
+                    table = header.group(1)
+                    continue
+                key = _TOML_KEY.match(stripped)
+                if not key:
+                    continue
+                name, value = key.group(2), stripped[key.end():].strip()
+                if table in _TOML_KEY_TABLES or _POETRY_GROUP_TABLE.match(table):
+                    if name.lower() != 'python':
+                        names.add(_python_name(name))
+                elif value.startswith('[') and (
+                        table in _TOML_ARRAY_TABLES or (table, name) in (('project', 'dependencies'),
+                                                                          ('tool.uv', 'dev-dependencies'))):
+                    names.update(_python_name(name) for name in _array_names(value))
+                    depth = _bracket_depth(value)
+    except OSError:
+        return None
+    return names
+
+
+def _package_blocks(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Name, source and dependency names of each [[package]] in a Cargo.lock or uv.lock."""
+    block: Optional[Dict[str, Any]] = None
+    table = ''
+    depth = 0
+    for line in lines:
+        stripped = line.strip()
+        if depth > 0:
+            block['dependencies'].update(_array_names(stripped))
+            depth += _bracket_depth(stripped)
+            continue
+        header = _TOML_HEADER.match(stripped)
+        if header:
+            table = header.group(1)
+            if table == 'package' and stripped.startswith('[['):
+                if block is not None:
+                    yield block
+                block = {'name': None, 'source': None, 'dependencies': set()}
+            continue
+        key = _TOML_KEY.match(stripped)
+        if block is None or not key:
+            continue
+        name, value = key.group(2), stripped[key.end():].strip()
+        if table == 'package' and name in ('name', 'source'):
+            strings = _toml_strings(value)
+            block[name] = strings[0] if name == 'name' and strings else value
+        # uv lists optional and dev dependencies in sub-tables of arrays
+        elif value.startswith('[') and (
+                (table == 'package' and name == 'dependencies')
+                or table in ('package.optional-dependencies', 'package.dev-dependencies')):
+            block['dependencies'].update(_array_names(value))
+            depth = _bracket_depth(value)
+    if block is not None:
+        yield block
+
+
+def _count_workspace(blocks: Iterable[Dict[str, Any]], is_root: Callable[[Dict[str, Any]], bool]) -> Tuple[int, int]:
+    """Total non-root packages, and the distinct packages the root packages depend on."""
+    total = 0
+    roots = set()
+    direct = set()
+    for block in blocks:
+        if is_root(block):
+            roots.add(block['name'])
+            direct.update(block['dependencies'])
+        else:
+            total += 1
+    return total, len(direct - roots)
+
+
+def parse_package_lock(stream: BinaryIO, path: str) -> Tuple[int, Optional[int]]:
+    """package-lock.json / npm-shrinkwrap.json, lockfile versions 1 to 3."""
+    installed = 0
+    links = 0
+    root_dependencies = set()
+    has_packages = False
+    nested = 0  # Version 1 `dependencies` entries at any depth
+    for prefix, event, value in iter_events(stream):
+        if not prefix:
+            continue
+        if event == 'map_key':
+            if prefix == ('packages',):
+                has_packages = True
+                installed += 'node_modules/' in value
+            elif prefix[0] == 'packages':
+                if len(prefix) == 3 and prefix[1] == '' and prefix[2] in NPM_DEPENDENCY_SECTIONS:
+                    root_dependencies.add(value)
+            elif len(prefix) % 2 and all(part == 'dependencies' for part in prefix[::2]):
+                nested += 1
+        elif event == 'boolean' and value and len(prefix) == 3 and prefix[0] == 'packages' \
+                and prefix[2] == 'link' and 'node_modules/' in prefix[1]:
+            links += 1  # Workspace symlinks, not installed packages
+    if has_packages:
+        return installed - links, len(root_dependencies)
+    direct = _json_manifest_keys(_sibling(path, 'package.json'), [(section,) for section in NPM_DEPENDENCY_SECTIONS])
+    return nested, None if direct is None else len(direct)
+
+
+def parse_yarn_lock(stream: BinaryIO, path: str) -> Tuple[int, Optional[int]]:
+    """yarn.lock, classic (v1) and Berry."""
+    total = 0
+    for line in _lines(stream):
+        if not line or line[0] in ' \t#\r\n' or not line.rstrip().endswith(':'):
+            continue
+        if line.startswith('__metadata') or '@workspace:' in line:
+            continue
+        total += 1
+    direct = _json_manifest_keys(_sibling(path, 'package.json'), [(section,) for section in NPM_DEPENDENCY_SECTIONS])
+    return total, None if direct is None else len(direct)
+
+
+def parse_pnpm_lock(stream: BinaryIO, path: str) -> Tuple[int, Optional[int]]:
+    """pnpm-lock.yaml, single-project (v5/v6) and importers (v6 workspaces, v9) layouts."""
+    total = 0
+    direct = set()
+    section = ''
+    importer_section = ''
+    for line in _lines(stream):
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        indent = _indent(line)
+        key = _yaml_key(stripped)
+        if indent == 0:
+            section = key or ''
+        elif section == 'packages' and indent == 2:
+            total += 1
+        elif section in NPM_DEPENDENCY_SECTIONS and indent == 2 and key:
+            direct.add(key)
+        elif section == 'importers':
+            if indent == 4:
+                importer_section = key or ''
+            elif indent == 6 and key and importer_section in NPM_DEPENDENCY_SECTIONS:
+                direct.add(key)
+    return total, len(direct)
+
+
+def parse_poetry_lock(stream: BinaryIO, path: str) -> Tuple[int, Optional[int]]:
+    """poetry.lock; direct dependencies come from pyproject.toml."""
+    total = 0
+    names = set()
+    for block in _package_blocks(_lines(stream)):
+        total += 1
+        if block['name']:
+            names.add(_python_name(block['name']))
+    direct = _toml_manifest_names(_sibling(path, 'pyproject.toml'))
+    # Declared dependencies that are not locked (e.g. environment markers) are not installed
+    return total, None if direct is None else len(direct & names)
+
+
+def parse_pipfile_lock(stream: BinaryIO, path: str) -> Tuple[int, Optional[int]]:
+    """Pipfile.lock; direct dependencies come from the Pipfile."""
+    names = set()
+    for prefix, event, value in iter_events(stream):
+        if event == 'map_key' and prefix in (('default',), ('develop',)):
+            names.add(_python_name(value))
+    direct = _toml_manifest_names(_sibling(path, 'Pipfile'))
+    return len(names), None if direct is None else len(direct & names)
+
+
+def parse_uv_lock(stream: BinaryIO, path: str) -> Tuple[int, Optional[int]]:
+    """uv.lock; the project's own packages have an editable or virtual source."""
+    return _count_workspace(_package_blocks(_lines(stream)),
+                            lambda block: any(kind in (block['source'] or '') for kind in ('editable', 'virtual')))
+
+
+def parse_requirements(stream: BinaryIO, path: str) -> Tuple[int, Optional[int]]:
+    """requirements.txt; pip-compile's `# via -r ...` annotations mark the direct ones."""
+    total = 0
+    direct = 0
+    annotated = False
+    current_direct = True  # No requirement yet, so nothing to mark
+    in_via = False
+    continued = False
+    for line in _lines(stream):
+        stripped = line.strip()
+        was_continued, continued = continued, stripped.endswith('\\')
+        if not stripped or was_continued:
+            continue
+        if stripped.startswith('#'):
+            comment = stripped[1:].strip()
+            if comment.startswith('via'):
+                annotated = in_via = True
+                comment = comment[3:].strip()
+            if in_via and comment.startswith(('-r ', '-c ')) and not current_direct:
+                current_direct = True
+                direct += 1
+            continue
+        in_via = False
+        if line[0].isspace() or (stripped.startswith('-') and not stripped.startswith(('-e ', '--editable'))):
+            continue
+        total += 1
+        current_direct = False
+        comment = stripped.partition(' #')[2]
+        if 'via' in comment:  # pip-compile --annotation-style=line
+            annotated = True
+            if '-r ' in comment or '-c ' in comment:
+                current_direct = True
+                direct += 1
+    return total, direct if annotated else None
+
+
+def parse_maven_dependency_tree(stream: BinaryIO, path: str) -> Tuple[int, Optional[int]]:
+    """maven_dep_tree.txt from `mvn dependency:tree -DoutputFile=...`; depth comes from the branch indent."""
+    total = 0
+    direct = 0
+    for line in _lines(stream):
+        if line.startswith('[INFO] '):
+            line = line[7:]
+        branch = _MAVEN_TREE_BRANCH.match(line)
+        if branch:
+            total += 1
+            direct += len(branch.group(1)) < 3
+    return total, direct
+
+
+def parse_gradle_lockfile(stream: BinaryIO, path: str) -> Tuple[int, Optional[int]]:
+    """gradle.lockfile; it records resolved coordinates only, so direct is unknown."""
+    total = 0
+    for line in _lines(stream):
+        coordinates, separator, _ = line.strip().partition('=')
+        if separator and ':' in coordinates and not coordinates.startswith('#'):
+            total += 1
+    return total, None
+
+
+def parse_cargo_lock(stream: BinaryIO, path: str) -> Tuple[int, Optional[int]]:
+    """Cargo.lock; workspace and path crates have no source."""
+    return _count_workspace(_package_blocks(_lines(stream)), lambda block: block['source'] is None)
+
+
+def parse_go_mod(stream: BinaryIO, path: str) -> Tuple[int, Optional[int]]:
+    """go.mod; requirements marked `// indirect` are transitive."""
+    total = 0
+    direct = 0
+    in_block = False
+    for line in _lines(stream):
+        stripped = line.strip()
+        if in_block:
+            if stripped.startswith(')'):
+                in_block = False
+                continue
+            entry = stripped
+        elif _GO_REQUIRE.match(stripped):
+            entry = stripped[len('require'):].strip()
+            if entry.startswith('('):
+                in_block = True
+                continue
+        else:
+            continue
+        if entry and not entry.startswith('//'):
+            total += 1
+            direct += '// indirect' not in entry
+    return total, direct
+
+
+def parse_nuget_lock(stream: BinaryIO, path: str) -> Tuple[int, Optional[int]]:
+    """packages.lock.json; each package is typed Direct, Transitive or CentralTransitive per framework."""
+    names = set()
+    direct = set()
+    for prefix, event, value in iter_events(stream):
+        if event == 'string' and len(prefix) == 4 and prefix[0] == 'dependencies' and prefix[3] == 'type':
+            if value == 'Project':
+                continue
+            name = prefix[2].lower()
+            names.add(name)
+            if value == 'Direct':
+                direct.add(name)
+    return len(names), len(direct)
+
+
+def parse_composer_lock(stream: BinaryIO, path: str) -> Tuple[int, Optional[int]]:
+    """composer.lock; direct dependencies come from composer.json, without platform packages (php, ext-*)."""
+    total = 0
+    for prefix, event, value in iter_events(stream):
+        if event == 'string' and prefix in (('packages', 'item', 'name'), ('packages-dev', 'item', 'name')):
+            total += 1
+    direct = _json_manifest_keys(_sibling(path, 'composer.json'), [('require',), ('require-dev',)])
+    return total, None if direct is None else sum('/' in name for name in direct)
+
+
+def parse_gemfile_lock(stream: BinaryIO, path: str) -> Tuple[int, Optional[int]]:
+    """Gemfile.lock; specs sit at indent 4 under GEM, GIT and PATH, direct gems under DEPENDENCIES."""
+    total = 0
+    direct = 0
+    section = ''
+    for line in _lines(stream):
+        if not line.strip():
+            continue
+        indent = _indent(line)
+        if indent == 0:
+            section = line.strip()
+        elif section in ('GEM', 'GIT', 'PATH') and indent == 4:
+            total += 1
+        elif section == 'DEPENDENCIES' and indent == 2:
+            direct += 1
+    return total, direct
+
+
+def parse_podfile_lock(stream: BinaryIO, path: str) -> Tuple[int, Optional[int]]:
+    """Podfile.lock; pods are listed under PODS, direct ones under DEPENDENCIES."""
+    total = 0
+    direct = 0
+    section = ''
+    for line in _lines(stream):
+        if not line.strip():
+            continue
+        indent = _indent(line)
+        if indent == 0:
+            section = _yaml_key(line.strip()) or ''
+        elif indent == 2 and line.lstrip().startswith('- '):
+            total += section == 'PODS'
+            direct += section == 'DEPENDENCIES'
+    return total, direct
+
+
+def parse_pubspec_lock(stream: BinaryIO, path: str) -> Tuple[int, Optional[int]]:
+    """pubspec.lock; each package records `dependency: direct main|direct dev|transitive`."""
+    total = 0
+    direct = 0
+    section = ''
+    for line in _lines(stream):
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        indent = _indent(line)
+        if indent == 0:
+            section = _yaml_key(stripped) or ''
+        elif section == 'packages':
+            if indent == 2:
+                total += 1
+            elif indent == 4 and stripped.startswith('dependency:'):
+                direct += 'direct' in stripped
+    return total, direct
+
+
+def parse_mix_lock(stream: BinaryIO, path: str) -> Tuple[int, Optional[int]]:
+    """mix.lock; direct dependencies live in mix.exs, which is code, so direct is unknown."""
+    return sum(1 for line in _lines(stream) if _MIX_ENTRY.match(line)), None
+
+
+def parse_package_resolved(stream: BinaryIO, path: str) -> Tuple[int, Optional[int]]:
+    """Package.resolved (SwiftPM), versions 1 to 3."""
+    total = 0
+    for prefix, event, _ in iter_events(stream):
+        if event == 'start_map' and prefix in (('pins', 'item'), ('object', 'pins', 'item')):
+            total += 1
+    return total, None
+
+
+# Lowercase lockfile name -> (ecosystem, package manager, parser)
+LOCKFILE_FORMATS: Dict[str, Tuple[str, str, Callable[[BinaryIO, str], Tuple[int, Optional[int]]]]] = {
+    'package-lock.json': ('npm', 'npm', parse_package_lock),
+    'npm-shrinkwrap.json': ('npm', 'npm', parse_package_lock),
+    'yarn.lock': ('npm', 'Yarn', parse_yarn_lock),
+    'pnpm-lock.yaml': ('npm', 'pnpm', parse_pnpm_lock),
+    'poetry.lock': ('pypi', 'Poetry', parse_poetry_lock),
+    'pipfile.lock': ('pypi', 'Pipenv', parse_pipfile_lock),
+    'uv.lock': ('pypi', 'uv', parse_uv_lock),
+    'maven_dep_tree.txt': ('maven', 'Maven', parse_maven_dependency_tree),
+    'gradle.lockfile': ('maven', 'Gradle', parse_gradle_lockfile),
+    'cargo.lock': ('cargo', 'Cargo', parse_cargo_lock),
+    'go.mod': ('golang', 'Go modules', parse_go_mod),
+    'packages.lock.json': ('nuget', 'NuGet', parse_nuget_lock),
+    'composer.lock': ('composer', 'Composer', parse_composer_lock),
+    'gemfile.lock': ('gem', 'RubyGems', parse_gemfile_lock),
+    'gems.locked': ('gem', 'RubyGems', parse_gemfile_lock),
+    'podfile.lock': ('cocoapods', 'CocoaPods', parse_podfile_lock),
+    'pubspec.lock': ('pub', 'Pub', parse_pubspec_lock),
+    'mix.lock': ('hex', 'Hex', parse_mix_lock),
+    'package.resolved': ('swift', 'SwiftPM', parse_package_resolved),
+}
+LOCKFILE_GLOBS = [
+    ('*requirement*.txt', ('pypi', 'pip', parse_requirements)),
+    ('*requirement*.pip', ('pypi', 'pip', parse_requirements)),
+]
+
+
+def lockfile_format(path: str) -> Optional[Tuple[str, str, Callable]]:
+    """(ecosystem, package manager, parser) for a lockfile path, or None if the format is not parsed."""
+    name = os.path.basename(path.replace('\\', '/')).lower()
+    parsed = LOCKFILE_FORMATS.get(name)
+    if parsed is None:
+        parsed = next((entry for pattern, entry in LOCKFILE_GLOBS if fnmatch.fnmatchcase(name, pattern)), None)
+    return parsed
+
+
+def parse_lockfile(path: str, stream: Optional[BinaryIO] = None) -> LockfileDependencies:
+    """Count one lockfile's dependencies, reading `stream` if given (e.g. an archive member) or the file.
+
+    Raises ValueError for an unsupported or malformed lockfile and OSError if it cannot be read.
+    """
+    parsed = lockfile_format(path)
+    if parsed is None:
+        raise ValueError(f"No dependency parser for {os.path.basename(path)}")
+    ecosystem, package_manager, parser = parsed
+    if stream is None:
+        with open(path, 'rb') as f:
+            total, direct = parser(f, path)
+    else:
+        total, direct = parser(stream, path)
+    return LockfileDependencies(path, ecosystem, package_manager, total, direct)
+
+
+def supply_chain_scope(paths: Iterable[str]) -> Dict[str, Any]:
+    """Dependency counts per ecosystem over many lockfiles, for the matrix's supply-chain section.
+
+    Counts are summed across lockfiles, so a package shared by two projects
+    in a monorepo is counted once per lockfile; a path given twice is parsed
+    once. Files that cannot be parsed are listed under `errors` instead of
+    failing the whole report.
+    """
+    ecosystems: Dict[str, EcosystemScope] = {}
+    lockfiles = []
+    errors = []
+    seen = set()
+    for path in paths:
+        real_path = os.path.realpath(path)
+        if real_path in seen or lockfile_format(path) is None:
+            continue
+        seen.add(real_path)
+        try:
+            counts = parse_lockfile(path)
+        except (OSError, ValueError) as e:
+            errors.append({'path': path, 'error': str(e)})
+            continue
+        ecosystems.setdefault(counts.ecosystem, EcosystemScope(ECOSYSTEMS[counts.ecosystem])).add(counts)
+        lockfiles.append({
+            'path': path,
+            'ecosystem': ECOSYSTEMS[counts.ecosystem],
+            'package_manager': counts.package_manager,
+            'direct': counts.direct,
+            'transitive': counts.transitive,
+            'total': counts.total
+        })
+    ranked = sorted(ecosystems.values(), key=lambda scope: (-scope.total, scope.ecosystem))
+    return {
+        'ecosystems': [asdict(scope) for scope in ranked],
+        'lockfiles': lockfiles,
+        'errors': errors
+    }
+
+
+def format_scope(scope: Dict[str, Any]) -> str:
+    """Human-readable summary for the CLI."""
+    lines = []
+    for ecosystem in scope['ecosystems']:
+        undetermined = f", {ecosystem['undetermined']:,} undetermined" if ecosystem['undetermined'] else ''
+        lines.append(f"{ecosystem['ecosystem']} ({', '.join(ecosystem['package_managers'])}): "
+                     f"{ecosystem['total']:,} packages in {ecosystem['lockfiles']} lockfile(s); "
+                     f"{ecosystem['direct']:,} direct, {ecosystem['transitive']:,} transitive{undetermined}")
+    for error in scope['errors']:
+        lines.append(f"Warning: Could not parse {error['path']}: {error['error']}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count direct and transitive dependencies in lockfiles")
+    parser.add_argument("paths", nargs='+', help="Lockfiles, e.g. package-lock.json poetry.lock go.mod")
+    args = parser.parse_args()
+
+    unsupported = [path for path in args.paths if lockfile_format(path) is None]
+    for path in unsupported:
+        print(f"Warning: No dependency parser for {path}")
+    print(format_scope(supply_chain_scope(args.paths)))
+
+
+if __name__ == "__main__":
+    main()
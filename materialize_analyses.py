@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Materialized Competitive Analyses
+
+Competitor and catalog data change at most daily, so the analyses both web
+interfaces serve can be computed ahead of time. This script analyzes every
+competitor against the full catalog and a set of common language
+selections and writes the results to a versioned artifact:
+
+    data/materialized/analyses-<content version>.json
+
+The content version hashes the Semgrep capabilities and every competitor
+file, so an artifact is only ever served for exactly the data it was built
+from. At request time MaterializedAnalyses looks analyses up in the
+artifact; anything not materialized falls back to the engine.
+
+Each competitor's entry records the source fingerprints it was built from
+(see dependency_tracking.py), so a rebuild reuses the previous artifact's
+entries for every competitor whose data did not change and only analyzes
+the rest. Run after any competitor or catalog update:
+
+    python materialize_analyses.py
+"""
+
+import argparse
+import glob
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from catalog import load_catalog
+from competitive_analysis import CompetitiveAnalysisEngine, analysis_to_dict, encode_json
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MATERIALIZED_DIR = os.path.join(BASE_DIR, 'data', 'materialized')
+ARTIFACT_PREFIX = 'analyses-'
+KEEP_ARTIFACTS = 3
+
+# Selections requested often enough to precompute, besides "no languages"
+# (the full catalog) and each catalog language on its own
+COMMON_LANGUAGE_SETS = [
+    ['python', 'java', 'javascript'],
+    ['javascript', 'typescript'],
+    ['java', 'kotlin'],
+    ['python', 'go'],
+    ['c#', 'javascript', 'typescript'],
+]
+
+
+def materialized_key(competitor_name: str, languages: Optional[Iterable[str]]) -> str:
+    """Artifact key for an analysis; language order and duplicates do not change the result."""
+    return f"{competitor_name}|{','.join(sorted(set(languages or [])))}"
+
+
+def artifact_path(version: str, directory: str = MATERIALIZED_DIR) -> str:
+    return os.path.join(directory, f"{ARTIFACT_PREFIX}{version}.json")
+
+
+def default_language_sets() -> List[List[str]]:
+    """The full catalog, each catalog language alone, and the common multi-language selections.
+
+    Each selection is included both as typed in lowercase (API callers) and
+    with catalog spellings, which is what the form sends once names are
+    resolved.
+    """
+    catalog = load_catalog()
+    spelling = {lang['language'].lower(): lang['language'] for lang in catalog.languages}
+    lowercase_sets = [[name] for name in spelling] + COMMON_LANGUAGE_SETS
+    sets = [[]]
+    for languages in lowercase_sets:
+        sets.append(languages)
+        canonical = [spelling.get(name, name) for name in languages]
+        if canonical != languages:
+            sets.append(canonical)
+    return sets
+
+
+def latest_artifact(directory: str = MATERIALIZED_DIR) -> Optional[Dict[str, Any]]:
+    """Load the most recently written artifact, or None if there is none."""
+    artifacts = sorted(glob.glob(os.path.join(directory, f"{ARTIFACT_PREFIX}*.json")),
+                       key=os.path.getmtime, reverse=True)
+    for path in artifacts:
+        try:
+            with open(path, 'rb') as f:
+                return json.loads(f.read())
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load {path}: {e}")
+    return None
+
+
+def reusable_competitors(engine: CompetitiveAnalysisEngine, previous: Optional[Dict[str, Any]],
+                         language_sets: List[List[str]]) -> Set[str]:
+    """Competitors whose entries in a previous artifact are current and cover every language set."""
+    if not previous:
+        return set()
+    recorded = previous.get('dependencies', {})
+    selections = previous.get('selections', {})
+    reusable = set()
+    for competitor in engine.get_available_competitors():
+        if (competitor in recorded
+                and recorded[competitor] == engine.analysis_dependencies(competitor)
+                and all(materialized_key(competitor, languages) in selections for languages in language_sets)):
+            reusable.add(competitor)
+    return reusable
+
+
+def build_artifact(engine: CompetitiveAnalysisEngine, language_sets: List[List[str]],
+                   previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Analyze every competitor for every language set, reusing current entries from `previous`.
+
+    A language's comparison does not depend on what else was selected, so
+    each competitor's analysis and per-language comparisons are stored once
+    and each selection only as the list of languages it compares.
+    """
+    reusable = reusable_competitors(engine, previous, language_sets)
+    competitors = {}
+    selections = {}
+    dependencies = {}
+    rebuilt = []
+    for competitor in engine.get_available_competitors():
+        if competitor in reusable:
+            competitors[competitor] = previous['competitors'][competitor]
+            dependencies[competitor] = previous['dependencies'][competitor]
+            for languages in language_sets:
+                key = materialized_key(competitor, languages)
+                selections[key] = previous['selections'][key]
+            continue
+
+        rebuilt.append(competitor)
+        dependencies[competitor] = engine.analysis_dependencies(competitor)
+        data_sources = engine.get_competitor_summary(competitor).get('data_sources', [])
+        for languages in language_sets:
+            key = materialized_key(competitor, languages)
+            if key in selections:
+                continue
+            entry = analysis_to_dict(engine.analyze_competitor(competitor, languages), data_sources)
+            stored = competitors.setdefault(competitor, {
+                'analysis': dict(entry, language_comparisons=None),
+                'languages': {}
+            })
+            for comparison in entry['language_comparisons']:
+                stored['languages'][comparison['language']] = comparison
+            selections[key] = [comparison['language'] for comparison in entry['language_comparisons']]
+    return {
+        'version': engine.content_version(),
+        'catalog_version': load_catalog().version,
+        'generated_at': datetime.now().isoformat(),
+        'rebuilt': rebuilt,
+        'dependencies': dependencies,
+        'competitors': competitors,
+        'selections': selections
+    }
+
+
+def write_artifact(artifact: Dict[str, Any], directory: str = MATERIALIZED_DIR) -> str:
+    """Write the artifact atomically and prune all but the newest few."""
+    os.makedirs(directory, exist_ok=True)
+    path = artifact_path(artifact['version'], directory)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(encode_json(artifact))
+    os.replace(tmp_path, path)
+
+    artifacts = sorted(glob.glob(os.path.join(directory, f"{ARTIFACT_PREFIX}*.json")),
+                       key=os.path.getmtime, reverse=True)
+    for old in artifacts[KEEP_ARTIFACTS:]:
+        try:
+            os.remove(old)
+        except OSError as e:
+            print(f"Warning: Could not remove {old}: {e}")
+    return path
+
+
+class MaterializedAnalyses:
+    """Serve precomputed analyses for the engine's current data, if an artifact exists."""
+
+    def __init__(self, directory: str = MATERIALIZED_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._data_version = None
+        self._version = None
+        self._artifact: Dict[str, Any] = {}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._encoded: Dict[str, bytes] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _refresh(self, engine: CompetitiveAnalysisEngine) -> Dict[str, Any]:
+        # data_version is a cheap stat-based check; the content hash and the
+        # artifact are only read again when it changes
+        data_version = engine.data_version
+        if data_version == self._data_version:
+            return self._artifact
+        with self._lock:
+            if data_version != self._data_version:
+                version = engine.content_version()
+                artifact = {}
+                try:
+                    with open(artifact_path(version, self.directory), 'rb') as f:
+                        artifact = json.loads(f.read())
+                    if artifact.get('version') != version:
+                        artifact = {}
+                except FileNotFoundError:
+                    pass
+                except (OSError, ValueError) as e:
+                    print(f"Warning: Could not load materialized analyses: {e}")
+                self._artifact = artifact
+                self._entries = {}
+                self._encoded = {}
+                self._version = artifact.get('version')
+                self._data_version = data_version
+            return self._artifact
+
+    def get(self, engine: CompetitiveAnalysisEngine, competitor_name: str,
+            languages: Optional[Iterable[str]]) -> Optional[Dict[str, Any]]:
+        """Return the analysis dict (as produced by analysis_to_dict) or None if not materialized."""
+        artifact = self._refresh(engine)
+        key = materialized_key(competitor_name, languages)
+        entry = self._entries.get(key)
+        if entry is None:
+            stored = artifact.get('competitors', {}).get(competitor_name)
+            selection = artifact.get('selections', {}).get(key)
+            if stored is not None and selection is not None:
+                comparisons = [stored['languages'][language] for language in selection]
+                # Rebuilt field by field so the JSON field order matches analysis_to_dict
+                entry = {field: comparisons if field == 'language_comparisons' else value
+                         for field, value in stored['analysis'].items()}
+                self._entries[key] = entry
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def get_json(self, engine: CompetitiveAnalysisEngine, competitor_name: str,
+                 languages: Optional[Iterable[str]]) -> Optional[bytes]:
+        """Like get(), but return the entry encoded as JSON, encoding each entry once."""
+        entry = self.get(engine, competitor_name, languages)
+        if entry is None:
+            return None
+        key = materialized_key(competitor_name, languages)
+        encoded = self._encoded.get(key)
+        if encoded is None:
+            encoded = encode_json(entry)
+            self._encoded[key] = encoded
+        return encoded
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'version': self._version,
+            'entries': len(self._artifact.get('selections', {})),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+_materialized: Optional[MaterializedAnalyses] = None
+
+
+def get_materialized() -> MaterializedAnalyses:
+    """Return the process-wide materialized analyses reader."""
+    global _materialized
+    if _materialized is None:
+        _materialized = MaterializedAnalyses()
+    return _materialized
+
+
+def materialize(language_sets: Optional[List[List[str]]] = None, directory: str = MATERIALIZED_DIR,
+                force: bool = False, dry_run: bool = False) -> Dict[str, Any]:
+    """Bring the materialized analyses up to date; only invalidated competitors are re-analyzed.
+
+    Returns a summary with the artifact path, the rebuilt and reused
+    competitors, and whether anything was written. With dry_run, nothing is
+    analyzed or written and 'rebuilt' lists the competitors that would be.
+    """
+    language_sets = language_sets if language_sets is not None else default_language_sets()
+    engine = CompetitiveAnalysisEngine()
+    previous = None if force else latest_artifact(directory)
+    version = engine.content_version()
+    path = artifact_path(version, directory)
+    competitors = engine.get_available_competitors()
+
+    # Unchanged data means an identical artifact; skipping keeps update jobs
+    # from committing a new file that differs only in generated_at
+    if (previous and previous.get('version') == version and os.path.exists(path)
+            and reusable_competitors(engine, previous, language_sets) == set(competitors)):
+        return {'path': path, 'rebuilt': [], 'reused': competitors, 'written': False}
+
+    if dry_run:
+        reusable = reusable_competitors(engine, previous, language_sets)
+        return {
+            'path': path,
+            'rebuilt': [name for name in competitors if name not in reusable],
+            'reused': [name for name in competitors if name in reusable],
+            'written': False
+        }
+
+    artifact = build_artifact(engine, language_sets, previous)
+    write_artifact(artifact, directory)
+    return {
+        'path': path,
+        'rebuilt': artifact['rebuilt'],
+        'reused': [name for name in competitors if name not in artifact['rebuilt']],
+        'written': True
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute competitive analyses for the web interfaces")
+    parser.add_argument("--language-set", action="append", default=[],
+                        help="Extra comma-separated language selection to materialize (repeatable)")
+    parser.add_argument("--output-dir", default=MATERIALIZED_DIR, help="Directory for the artifact")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-analyze every competitor instead of reusing unchanged entries")
+    args = parser.parse_args()
+
+    language_sets = default_language_sets()
+    for extra in args.language_set:
+        language_sets.append([lang.strip() for lang in extra.split(",") if lang.strip()])
+
+    summary = materialize(language_sets, args.output_dir, args.force)
+    path = os.path.relpath(summary['path'], BASE_DIR)
+    if not summary['written']:
+        print(f"Analyses already materialized for the current data: {path}")
+        return
+    rebuilt = ', '.join(summary['rebuilt']) or 'none'
+    print(f"Materialized analyses to {path} (re-analyzed: {rebuilt}; "
+          f"reused {len(summary['reused'])} unchanged competitors)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Server-Sent Events Progress Streams
+
+Runs a long task (report generation) on a worker thread and turns the
+stages it reports into a text/event-stream, so the browser can show each
+stage, and partial results, as soon as they finish instead of waiting on
+one blocking form POST.
+
+The task receives a `progress(stage, **data)` callback. The stream ends
+with a `done` event carrying the task's return value, or a `failed` event
+(with a `retry_after` hint when the error has one). Only a ProgressError's
+message reaches the browser; any other exception is logged on the server
+and reported with a generic message, so paths and internals never leak.
+"""
+
+import queue
+import threading
+import traceback
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from competitive_analysis import encode_json
+
+HEARTBEAT_SECONDS = 15.0
+GENERIC_FAILURE = "Report generation failed. Please try again."
+
+
+class ProgressError(Exception):
+    """A task failure whose message is meant for the user, such as invalid form input."""
+
+
+def format_sse_event(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    """Encode one Server-Sent Event frame; data is serialized like every other analysis payload."""
+    frame = ""
+    if event_id is not None:
+        frame += f"id: {event_id}\n"
+    frame += f"event: {event}\n"
+    for line in encode_json(data).decode('utf-8').splitlines():
+        frame += f"data: {line}\n"
+    return frame + "\n"
+
+
+class ProgressStream:
+    """Run a task on a thread and yield its progress events as SSE frames."""
+
+    def __init__(self, task: Callable[[Callable[..., None]], Any], heartbeat: float = HEARTBEAT_SECONDS):
+        self.task = task
+        self.heartbeat = heartbeat
+        self._events = queue.Queue()
+
+    def publish(self, stage: str, **data) -> None:
+        self._events.put((stage, data))
+
+    def _run(self) -> None:
+        try:
+            result = self.task(self.publish)
+        except Exception as e:
+            if isinstance(e, ProgressError):
+                message = str(e)
+            else:
+                message = GENERIC_FAILURE
+                if getattr(e, 'retry_after', None) is None:
+                    print(f"Error: progress stream task failed: {e!r}")
+                    traceback.print_exc()
+            payload: Dict[str, Any] = {'message': message}
+            retry_after = getattr(e, 'retry_after', None)
+            if retry_after is not None:
+                payload['retry_after'] = retry_after
+            self._events.put(('failed', payload))
+        else:
+            self._events.put(('done', result))
+
+    def events(self) -> Iterator[str]:
+        """Start the task and yield frames until it finishes.
+
+        A client that disconnects only stops the stream; the task runs to
+        completion so its result still reaches the cache.
+        """
+        threading.Thread(target=self._run, name='progress-stream', daemon=True).start()
+        # Tell EventSource not to reconnect quickly and re-run a finished task
+        yield "retry: 60000\n\n"
+        event_id = 0
+        while True:
+            try:
+                stage, data = self._events.get(timeout=self.heartbeat)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            event_id += 1
+            yield format_sse_event(stage, data, event_id)
+            if stage in ('done', 'failed'):
+                return
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Repository Scanner
+
+Derives customer requirements from a local checkout or an archive (.zip,
+.tar, .tar.gz, .tgz, .tar.bz2, .tar.xz) instead of hand-typed languages.
+Files are classified by extension and by lockfile name (see
+lockfile_index.py) and lines of code are counted per language; the
+matrix lists the detected languages largest first.
+
+Directories are listed by a pool of threads, each running os.scandir on
+one directory at a time; only per-language counters and the queue of
+directories still to visit are held in memory, so monorepos with millions
+of files scan in bounded memory. Vendored, generated and VCS directories
+are skipped, as are names matched by simple patterns in the root
+.gitignore. Archives are read as a stream, one member at a time.
+
+    python generate.py --customer "Acme" --scms github --scan-path ./acme-repo
+"""
+
+import fnmatch
+import os
+import tarfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from catalog import load_catalog
+from lockfile_index import get_lockfile_index
+
+# Extension -> language; names are matched case-insensitively against the
+# catalog, so catalog spellings appear in the output
+EXTENSION_LANGUAGES = {
+    '.py': 'Python', '.pyw': 'Python', '.pyi': 'Python',
+    '.java': 'Java',
+    '.js': 'JavaScript', '.mjs': 'JavaScript', '.cjs': 'JavaScript',
+    '.jsx': 'JSX',
+    '.ts': 'TypeScript', '.tsx': 'TypeScript', '.mts': 'TypeScript', '.cts': 'TypeScript',
+    '.go': 'Go',
+    '.rb': 'Ruby',
+    '.rs': 'Rust',
+    '.php': 'PHP',
+    '.cs': 'C#',
+    '.c': 'C/C++', '.h': 'C/C++', '.cc': 'C/C++', '.cpp': 'C/C++', '.cxx': 'C/C++', '.hpp': 'C/C++', '.hh': 'C/C++',
+    '.kt': 'Kotlin', '.kts': 'Kotlin',
+    '.scala': 'Scala', '.sc': 'Scala',
+    '.swift': 'Swift',
+    '.tf': 'Terraform', '.hcl': 'Terraform',
+    '.ex': 'Elixir', '.exs': 'Elixir',
+    '.cls': 'APEX', '.trigger': 'APEX',
+    '.dart': 'Dart',
+    '.m': 'Objective-C', '.mm': 'Objective-C',
+    '.vb': 'VB.NET',
+    '.groovy': 'Groovy',
+    '.cbl': 'COBOL', '.cob': 'COBOL',
+}
+
+# Directory names never descended into: dependencies, build output, VCS metadata
+SKIPPED_DIRECTORIES = {
+    '.git', '.hg', '.svn', 'node_modules', 'bower_components', 'jspm_packages', 'vendor', 'third_party',
+    'third-party', 'Pods', 'Carthage', '.venv', 'venv', 'env', '.tox', '.nox', '__pycache__', '.mypy_cache',
+    '.pytest_cache', 'site-packages', 'dist', 'build', 'target', 'out', '.gradle', '.idea', '.vscode',
+    '.next', '.nuxt', 'coverage', '.terraform', '.dart_tool', '_build', 'deps',
+}
+
+ARCHIVE_SUFFIXES = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+MAX_LOCKFILE_PATHS = 1000  # Lockfile paths kept for dependency parsing; the rest are only counted
+READ_CHUNK = 1 << 16
+
+
+@dataclass
+class LanguageStats:
+    files: int = 0
+    loc: int = 0
+
+
+@dataclass
+class ScanResult:
+    root: str
+    files_scanned: int = 0
+    directories_skipped: int = 0
+    languages: Dict[str, LanguageStats] = field(default_factory=dict)
+    lockfiles: Dict[str, int] = field(default_factory=dict)  # Lockfile base name -> occurrences
+    lockfile_paths: List[str] = field(default_factory=list)
+    lockfile_languages: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def language_weights(self) -> Dict[str, float]:
+        """LOC per language, largest first, lowercased like parsed form weights."""
+        ranked = sorted(self.languages.items(), key=lambda item: (-item[1].loc, item[0]))
+        return {name.lower(): float(stats.loc) for name, stats in ranked if stats.loc}
+
+    def requirement_languages(self) -> List[str]:
+        """Languages by LOC, then languages seen only through their lockfiles."""
+        ranked = sorted(self.languages.items(), key=lambda item: (-item[1].loc, item[0]))
+        names = [name for name, _ in ranked]
+        known = {name.lower() for name in names}
+        names.extend(name for name in self.lockfile_languages if name.lower() not in known)
+        return names
+
+    def to_requirements(self, customer_name: str, scms: List[str]) -> Dict[str, Any]:
+        """Customer requirements in the shape generate_matrix() and the web form use."""
+        return {
+            'customer_name': customer_name,
+            'languages': self.requirement_languages(),
+            'language_weights': self.language_weights(),
+            'scms': scms
+        }
+
+
+def _count_lines(stream) -> int:
+    lines = 0
+    last = b'\n'
+    while True:
+        chunk = stream.read(READ_CHUNK)
+        if not chunk:
+            break
+        lines += chunk.count(b'\n')
+        last = chunk[-1:]
+    # A final line without a trailing newline still counts
+    return lines + (last != b'\n')
+
+
+def _read_ignore_patterns(root: str) -> List[str]:
+    """Name and path patterns from the root .gitignore; negations and nested files are not supported."""
+    patterns = []
+    try:
+        with open(os.path.join(root, '.gitignore'), 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith(('#', '!')):
+                    patterns.append(line.strip('/'))
+    except OSError:
+        pass
+    return patterns
+
+
+class RepositoryScanner:
+    """Classify files and count LOC per language under a directory or in an archive."""
+
+    def __init__(self, workers: Optional[int] = None, catalog=None, count_lines: bool = True):
+        self.workers = workers or min(32, (os.cpu_count() or 1) * 4)
+        self.count_lines = count_lines
+        catalog = catalog or load_catalog()
+        self.lockfiles = get_lockfile_index(catalog)
+        self.extensions = {
+            extension: (catalog.get_language_info(name) or {}).get('language', name)
+            for extension, name in EXTENSION_LANGUAGES.items()
+        }
+
+    def _classify(self, name: str) -> Tuple[Optional[str], bool]:
+        """(language by extension, whether the name is a lockfile)."""
+        extension = os.path.splitext(name)[1].lower()
+        return self.extensions.get(extension), self.lockfiles.is_lockfile(name)
+
+    def scan(self, path: str) -> ScanResult:
+        """Scan a directory or a supported archive."""
+        started = time.perf_counter()
+        if os.path.isdir(path):
+            result = self._scan_directory(path)
+        elif path.lower().endswith(ARCHIVE_SUFFIXES):
+            try:
+                result = self._scan_archive(path)
+            except (tarfile.TarError, zipfile.BadZipFile, EOFError) as e:
+                raise ValueError(f"Unreadable archive {path}: {e}")
+        else:
+            raise ValueError(f"{path} is neither a directory nor a supported archive ({', '.join(ARCHIVE_SUFFIXES)})")
+        for name in result.lockfiles:
+            for language in self.lockfiles.match(name).languages:
+                if language not in result.lockfile_languages:
+                    result.lockfile_languages.append(language)
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    def _record(self, result: ScanResult, counts: Dict[str, List[int]], lockfiles: Iterable[str],
+                files: int, skipped: int) -> None:
+        result.files_scanned += files
+        result.directories_skipped += skipped
+        for language, (file_count, loc) in counts.items():
+            stats = result.languages.setdefault(language, LanguageStats())
+            stats.files += file_count
+            stats.loc += loc
+        for path in lockfiles:
+            name = os.path.basename(path)
+            result.lockfiles[name] = result.lockfiles.get(name, 0) + 1
+            if len(result.lockfile_paths) < MAX_LOCKFILE_PATHS:
+                result.lockfile_paths.append(path)
+
+    def _list_directory(self, path: str, relative: str, ignore: List[str]):
+        """Scan one directory; return (subdirectories, per-language counts, lockfile paths, files, skipped)."""
+        subdirectories = []
+        counts: Dict[str, List[int]] = {}
+        lockfiles = []
+        files = 0
+        skipped = 0
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            return subdirectories, counts, lockfiles, files, skipped
+        for entry in entries:
+            name = entry.name
+            entry_relative = f"{relative}/{name}" if relative else name
+            if ignore and any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(entry_relative, pattern)
+                              for pattern in ignore):
+                skipped += entry.is_dir(follow_symlinks=False)
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if name in SKIPPED_DIRECTORIES:
+                        skipped += 1
+                    else:
+                        subdirectories.append((entry.path, entry_relative))
+                    continue
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+            except OSError:
+                continue
+            files += 1
+            language, is_lockfile = self._classify(name)
+            if is_lockfile:
+                lockfiles.append(entry.path)
+            if language:
+                loc = 0
+                if self.count_lines:
+                    try:
+                        with open(entry.path, 'rb') as f:
+                            loc = _count_lines(f)
+                    except OSError:
+                        pass
+                language_counts = counts.setdefault(language, [0, 0])
+                language_counts[0] += 1
+                language_counts[1] += loc
+        return subdirectories, counts, lockfiles, files, skipped
+
+    def _scan_directory(self, root: str) -> ScanResult:
+        result = ScanResult(root=root)
+        ignore = _read_ignore_patterns(root)
+        pending = deque([(root, '')])
+        # At most a few directories per worker are in flight; the rest wait as paths
+        in_flight_limit = self.workers * 4
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='repo-scan') as executor:
+            in_flight = set()
+            while pending or in_flight:
+                while pending and len(in_flight) < in_flight_limit:
+                    path, relative = pending.popleft()
+                    in_flight.add(executor.submit(self._list_directory, path, relative, ignore))
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    subdirectories, counts, lockfiles, files, skipped = future.result()
+                    pending.extend(subdirectories)
+                    self._record(result, counts, lockfiles, files, skipped)
+        return result
+
+    def _skipped_member(self, name: str) -> bool:
+        return any(part in SKIPPED_DIRECTORIES for part in name.split('/')[:-1])
+
+    def _scan_archive(self, path: str) -> ScanResult:
+        result = ScanResult(root=path)
+        if path.lower().endswith('.zip'):
+            with zipfile.ZipFile(path) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir():
+                        self._scan_member(result, info.filename, lambda info=info: archive.open(info))
+        else:
+            # Stream mode reads members in order without seeking or indexing the archive
+            with tarfile.open(path, 'r|*') as archive:
+                for member in archive:
+                    if member.isfile():
+                        self._scan_member(result, member.name, lambda member=member: archive.extractfile(member))
+        return result
+
+    def _scan_member(self, result: ScanResult, name: str, open_member) -> None:
+        name = name[2:] if name.startswith('./') else name
+        if self._skipped_member(name):
+            return
+        language, is_lockfile = self._classify(os.path.basename(name))
+        loc = 0
+        if language and self.count_lines:
+            stream = open_member()
+            if stream is not None:
+                with stream:
+                    loc = _count_lines(stream)
+        self._record(result, {language: [1, loc]} if language else {}, [name] if is_lockfile else [], 1, 0)
+
+
+def scan_repository(path: str, workers: Optional[int] = None) -> ScanResult:
+    """Scan a local checkout or archive with the default settings."""
+    return RepositoryScanner(workers=workers).scan(path)
+
+
+def format_scan_summary(result: ScanResult) -> str:
+    """Human-readable summary for the CLI."""
+    lines = [f"Scanned {result.files_scanned:,} files in {result.elapsed:.1f}s "
+             f"({result.directories_skipped:,} vendored or ignored directories skipped)"]
+    ranked = sorted(result.languages.items(), key=lambda item: (-item[1].loc, item[0]))
+    for name, stats in ranked:
+        lines.append(f"  {name}: {stats.files:,} files, {stats.loc:,} LOC")
+    if result.lockfiles:
+        lines.append("  Lockfiles: " + ", ".join(f"{name} ({count})" for name, count in sorted(result.lockfiles.items())))
+    return '\n'.join(lines)
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+SBOM Ingestion
+
+Reads CycloneDX and SPDX JSON SBOMs (optionally gzipped) as a stream of
+parse events through json_stream, counting components per package URL
+type. Memory stays constant however large the SBOM is: components are
+decoded one at a time and only a counter per ecosystem is kept.
+
+Each purl type is mapped to the package managers that languages.json (or
+lockfile_index.KNOWN_LOCKFILES) lists for it, and through those to the
+catalog languages and their SCA features. The result is the SCA coverage
+section of the matrix: how many of the customer's components are in
+ecosystems Semgrep Supply Chain supports.
+
+    python generate.py --customer "Acme" --scms github --sbom acme.cdx.json
+    python sbom_ingest.py acme.cdx.json acme.spdx.json.gz
+    python sbom_ingest.py --benchmark 500000
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import tempfile
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional
+
+from json_stream import iter_events
+from lockfile_index import SCA_FEATURES, get_lockfile_index
+from lockfile_parsers import ECOSYSTEMS, LOCKFILE_FORMATS, LOCKFILE_GLOBS
+
+# Non-standard purl types seen in the wild -> the registered type
+PURL_TYPE_ALIASES = {
+    'go': 'golang',
+    'crates': 'cargo',
+    'rubygems': 'gem',
+    'packagist': 'composer',
+    'swiftpm': 'swift',
+    'pod': 'cocoapods',
+}
+
+
+def _package_managers_by_ecosystem() -> Dict[str, List[str]]:
+    managers: Dict[str, List[str]] = {}
+    for ecosystem, manager, _ in list(LOCKFILE_FORMATS.values()) + [entry for _, entry in LOCKFILE_GLOBS]:
+        if manager not in managers.setdefault(ecosystem, []):
+            managers[ecosystem].append(manager)
+    return managers
+
+
+# purl type -> package managers, in the spelling languages.json uses
+PURL_PACKAGE_MANAGERS = _package_managers_by_ecosystem()
+
+_PURL_TYPE = re.compile(r'^pkg:/*([A-Za-z][A-Za-z0-9.+\-]*)/')
+
+
+@dataclass
+class SbomSummary:
+    path: str
+    format: str = ''  # e.g. "CycloneDX 1.5" or "SPDX-2.3"
+    components: int = 0
+    ecosystems: Dict[str, int] = field(default_factory=dict)  # purl type -> components
+    bytes_read: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def unidentified(self) -> int:
+        """Components without a usable package URL."""
+        return self.components - sum(self.ecosystems.values())
+
+
+def purl_type(purl: str) -> Optional[str]:
+    """The normalized type of a package URL ("pkg:npm/lodash@4" -> "npm"), or None if malformed."""
+    match = _PURL_TYPE.match(purl)
+    if not match:
+        return None
+    kind = match.group(1).lower()
+    return PURL_TYPE_ALIASES.get(kind, kind)
+
+
+def _open_sbom(path: str) -> BinaryIO:
+    return gzip.open(path, 'rb') if path.lower().endswith('.gz') else open(path, 'rb')
+
+
+class _CountingReader:
+    """Binary stream wrapper counting the bytes read, after any decompression."""
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._stream.read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def ingest_sbom(path: str, stream: Optional[BinaryIO] = None) -> SbomSummary:
+    """Count the components of a CycloneDX or SPDX JSON SBOM by purl type.
+
+    Raises ValueError if the document is malformed, truncated or neither
+    CycloneDX nor SPDX, and OSError if it cannot be read. bytes_read counts
+    the JSON bytes, after gzip decompression.
+    """
+    summary = SbomSummary(path=path)
+    started = time.perf_counter()
+    try:
+        if stream is None:
+            with _open_sbom(path) as f:
+                reader = _CountingReader(f)
+                _count_components(reader, summary)
+        else:
+            reader = _CountingReader(stream)
+            _count_components(reader, summary)
+    except (EOFError, zlib.error) as e:  # A truncated or corrupt .gz
+        raise ValueError(f"{path} is truncated or corrupt: {e}") from e
+    summary.bytes_read = reader.bytes_read
+    summary.elapsed = time.perf_counter() - started
+    if not summary.format:
+        raise ValueError(f"{path} is not a CycloneDX or SPDX JSON document")
+    return summary
+
+
+# Values decoded whole, one component at a time
+_COMPONENT_PATHS = (('components', 'item'), ('packages', 'item'), ('@graph', 'item'))
+
+
+def _count_components(stream: BinaryIO, summary: SbomSummary) -> None:
+    ecosystems = summary.ecosystems
+    cyclonedx_version = ''
+    for prefix, event, value in iter_events(stream, values=_COMPONENT_PATHS):
+        if event == 'value':
+            if not isinstance(value, dict):
+                continue
+            if prefix == ('components', 'item'):
+                purls = _cyclonedx_purls(value)  # CycloneDX, with nested components
+            elif prefix == ('packages', 'item'):
+                # SPDX 2; a package may list several purls, the first one counts
+                purls = [next((ref.get('referenceLocator') for ref in value.get('externalRefs') or []
+                               if isinstance(ref, dict) and ref.get('referenceType') == 'purl'), None)]
+            elif 'software_packageUrl' in value or value.get('type') == 'software_Package':
+                purls = [value.get('software_packageUrl')]  # SPDX 3 JSON-LD, packages among other elements
+            else:
+                continue
+            summary.components += len(purls)
+            for purl in purls:
+                kind = purl_type(purl) if isinstance(purl, str) else None
+                if kind:
+                    ecosystems[kind] = ecosystems.get(kind, 0) + 1
+        elif event == 'string':
+            if prefix == ('bomFormat',) and value == 'CycloneDX':
+                summary.format = f"CycloneDX {cyclonedx_version}".strip()
+            elif prefix == ('specVersion',):
+                cyclonedx_version = value
+                if summary.format.startswith('CycloneDX'):
+                    summary.format = f"CycloneDX {value}"
+            elif prefix == ('spdxVersion',):
+                summary.format = value
+            elif prefix in (('@context',), ('@context', 'item')) and 'spdx.org/rdf/3' in value:
+                summary.format = 'SPDX-3'
+
+
+def _cyclonedx_purls(component: Dict[str, Any]) -> List[Optional[str]]:
+    """The purl (or None) of a component and of each component nested in it."""
+    purls = []
+    pending = [component]
+    while pending:
+        current = pending.pop()
+        purls.append(current.get('purl'))
+        pending.extend(child for child in current.get('components') or [] if isinstance(child, dict))
+    return purls
+
+
+def sca_coverage(summaries: Iterable[SbomSummary], index=None) -> Dict[str, Any]:
+    """The matrix's SCA coverage section: components per ecosystem and whether Supply Chain covers them."""
+    index = index or get_lockfile_index()
+    sboms = []
+    by_type: Dict[str, int] = {}
+    components = 0
+    unidentified = 0
+    for summary in summaries:
+        sboms.append({'path': summary.path, 'format': summary.format, 'components': summary.components})
+        components += summary.components
+        unidentified += summary.unidentified
+        for kind, count in summary.ecosystems.items():
+            by_type[kind] = by_type.get(kind, 0) + count
+
+    ecosystems = []
+    covered = 0
+    for kind, count in sorted(by_type.items(), key=lambda item: (-item[1], item[0])):
+        managers = PURL_PACKAGE_MANAGERS.get(kind, [])
+        entries = [entry for manager in managers for entry in index.match(manager).entries]
+        row = {
+            'ecosystem': ECOSYSTEMS.get(kind, kind),
+            'purl_type': kind,
+            'components': count,
+            'supported': bool(entries),
+            'package_managers': managers,
+            'languages': list(dict.fromkeys(entry.language for entry in entries)),
+        }
+        for feature in SCA_FEATURES:
+            row[feature] = any(entry.sca_features.get(feature) for entry in entries)
+        covered += count if entries else 0
+        ecosystems.append(row)
+
+    return {
+        'sboms': sboms,
+        'components': components,
+        'covered': covered,
+        'unidentified': unidentified,
+        'ecosystems': ecosystems
+    }
+
+
+def coverage_languages(coverage: Dict[str, Any]) -> List[str]:
+    """Catalog languages of the supported ecosystems, most components first."""
+    languages: Dict[str, None] = {}
+    for row in coverage['ecosystems']:
+        for language in row['languages']:
+            languages.setdefault(language, None)
+    return list(languages)
+
+
+def format_sbom_summary(summary: SbomSummary) -> str:
+    """One line per SBOM for the CLI."""
+    rate = f", {summary.bytes_read / summary.elapsed / 1e6:.1f} MB/s" if summary.bytes_read and summary.elapsed else ''
+    return (f"{summary.path}: {summary.format}, {summary.components:,} components "
+            f"({summary.unidentified:,} without a package URL) in {summary.elapsed:.1f}s{rate}")
+
+
+def format_coverage(coverage: Dict[str, Any]) -> str:
+    """Human-readable SCA coverage for the CLI."""
+    total = coverage['components']
+    share = f" ({coverage['covered'] / total:.0%})" if total else ''
+    lines = [f"SCA coverage: {coverage['covered']:,} of {total:,} components{share} in supported ecosystems"]
+    for row in coverage['ecosystems']:
+        status = f"supported via {', '.join(row['package_managers'])}" if row['supported'] else 'not supported'
+        plural = '' if row['components'] == 1 else 's'
+        lines.append(f"  {row['ecosystem']}: {row['components']:,} component{plural}, {status}")
+    return '\n'.join(lines)
+
+
+# Benchmark components cycle through these ecosystems, including an unsupported one
+_BENCHMARK_PURLS = (
+    'pkg:npm/%40acme/widget-{0}@1.{0}.0',
+    'pkg:pypi/acme-{0}@2.0.{0}',
+    'pkg:maven/com.acme/lib-{0}@3.{0}',
+    'pkg:golang/github.com/acme/mod{0}@v1.0.{0}',
+    'pkg:deb/debian/libacme{0}@1.0-{0}?arch=amd64',
+)
+
+
+def write_synthetic_sbom(path: str, components: int, sbom_format: str = 'cyclonedx') -> None:
+    """Write a CycloneDX 1.5 or SPDX 2.3 JSON SBOM with the given number of components, one at a time."""
+    with open(path, 'w', encoding='utf-8') as f:
+        if sbom_format == 'cyclonedx':
+            f.write('{"bomFormat": "CycloneDX", "specVersion": "1.5", "version": 1,\n'
+                    ' "metadata": {"component": {"type": "application", "name": "acme",'
+                    ' "purl": "pkg:generic/acme@1.0"}},\n "components": [\n')
+        else:
+            f.write('{"spdxVersion": "SPDX-2.3", "dataLicense": "CC0-1.0", "SPDXID": "SPDXRef-DOCUMENT",\n'
+                    ' "name": "acme", "packages": [\n')
+        for position in range(components):
+            purl = _BENCHMARK_PURLS[position % len(_BENCHMARK_PURLS)].format(position)
+            name = purl.split('/')[-1].split('@')[0]
+            if sbom_format == 'cyclonedx':
+                component = {'type': 'library', 'bom-ref': f"ref-{position}", 'name': name,
+                             'version': '1.0', 'purl': purl,
+                             'hashes': [{'alg': 'SHA-256', 'content': f"{position:064x}"}],
+                             'licenses': [{'license': {'id': 'MIT'}}]}
+            else:
+                component = {'SPDXID': f"SPDXRef-Package-{position}", 'name': name, 'versionInfo': '1.0',
+                             'downloadLocation': 'NOASSERTION', 'licenseConcluded': 'MIT',
+                             'externalRefs': [{'referenceCategory': 'PACKAGE-MANAGER',
+                                               'referenceType': 'purl', 'referenceLocator': purl}]}
+            f.write(('    ' if position == 0 else ',\n    ') + json.dumps(component))
+        f.write('\n  ]\n}\n')
+
+
+def run_benchmark(components: int) -> List[str]:
+    """Ingest synthetic CycloneDX and SPDX SBOMs and report throughput and peak memory."""
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        resource = None
+    lines = []
+    with tempfile.TemporaryDirectory(prefix='sbom-benchmark-') as directory:
+        for sbom_format in ('cyclonedx', 'spdx'):
+            path = os.path.join(directory, f"synthetic.{sbom_format}.json")
+            write_synthetic_sbom(path, components, sbom_format)
+            summary = ingest_sbom(path)
+            size = summary.bytes_read / 1e6
+            line = (f"{summary.format}: {components:,} components, {size:.1f} MB in {summary.elapsed:.2f}s "
+                    f"({size / summary.elapsed:.1f} MB/s, {components / summary.elapsed:,.0f} components/s)")
+            if resource is not None:
+                # ru_maxrss is in KiB on Linux
+                line += f", peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB"
+            lines.append(line)
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count SBOM components per ecosystem and report SCA coverage")
+    parser.add_argument("paths", nargs='*', help="CycloneDX or SPDX JSON files (.json or .json.gz)")
+    parser.add_argument("--benchmark", type=int, metavar="COMPONENTS",
+                        help="Measure ingestion throughput on synthetic SBOMs of this many components")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print('\n'.join(run_benchmark(args.benchmark)))
+        return
+    if not args.paths:
+        parser.error("give at least one SBOM or --benchmark")
+    summaries = []
+    for path in args.paths:
+        try:
+            summary = ingest_sbom(path)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not read {path}: {e}")
+            continue
+        print(format_sbom_summary(summary))
+        summaries.append(summary)
+    if summaries:
+        print(format_coverage(sca_coverage(summaries)))
+
+
+if __name__ == "__main__":
+    main()
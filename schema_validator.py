@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Compiled Competitor Schema Validation
+
+Compiles competitors/schema.json once into a plain Python validation
+function (generated source, in the style of fastjsonschema) and caches
+results by content hash, so validating an unchanged competitor file on a
+warm path is a dictionary lookup. When fastjsonschema is installed it is
+used to compile the schema instead of the built-in generator.
+
+The built-in generator supports the draft-07 subset the schema uses:
+type, properties, required, additionalProperties, items, enum, minLength,
+minItems, pattern, format (date, uri) and local $ref to definitions.
+
+Validate every competitor file from the command line with:
+
+    python schema_validator.py
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SCHEMA_PATH = os.path.join(BASE_DIR, 'competitors', 'schema.json')
+MAX_CACHED_RESULTS = 1024
+
+_ANNOTATIONS = {'$schema', '$id', 'title', 'description', 'default', 'examples', 'definitions'}
+_KEYWORDS = {'type', 'properties', 'required', 'additionalProperties', 'items', 'enum',
+             'minLength', 'minItems', 'pattern', 'format', '$ref'}
+_TYPE_CHECKS = {
+    'object': "isinstance({v}, dict)",
+    'array': "isinstance({v}, list)",
+    'string': "isinstance({v}, str)",
+    'boolean': "isinstance({v}, bool)",
+    'integer': "(isinstance({v}, int) and not isinstance({v}, bool))",
+    'number': "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    'null': "{v} is None",
+}
+_FORMAT_PATTERNS = {
+    'date': r'^\d{4}-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])$',
+    'uri': r'^[A-Za-z][A-Za-z0-9+.-]*:[^\s]+$',
+}
+
+
+class CompetitorValidationError(ValueError):
+    """Raised when competitor data does not match the schema."""
+
+    def __init__(self, source: str, errors: List[str]):
+        super().__init__(f"{source} failed schema validation: " + "; ".join(errors))
+        self.source = source
+        self.errors = errors
+
+
+class _SchemaCompiler:
+    """Generate the source of a validate(data) -> List[str] function for a schema."""
+
+    def __init__(self, root: Dict[str, Any]):
+        self.root = root
+        self.lines: List[str] = []
+        self.constants: Dict[str, Any] = {}
+        self._counter = 0
+
+    def _name(self, prefix: str) -> str:
+        self._counter += 1
+        return f"{prefix}{self._counter}"
+
+    def _constant(self, value: Any) -> str:
+        name = self._name('_c')
+        self.constants[name] = value
+        return name
+
+    def _emit(self, indent: int, line: str) -> None:
+        self.lines.append("    " * indent + line)
+
+    def _resolve(self, schema: Dict[str, Any], seen: Tuple[str, ...]) -> Tuple[Dict[str, Any], Tuple[str, ...]]:
+        while '$ref' in schema:
+            ref = schema['$ref']
+            if not ref.startswith('#/') or ref in seen:
+                raise ValueError(f"Unsupported or recursive $ref: {ref}")
+            seen = seen + (ref,)
+            target = self.root
+            for part in ref[2:].split('/'):
+                target = target[part]
+            schema = target
+        return schema, seen
+
+    def compile(self) -> Callable[[Any], List[str]]:
+        self._emit(0, "def validate(data):")
+        self._emit(1, "errors = []")
+        self._node(self.root, "data", repr("$"), 1, ())
+        self._emit(1, "return errors")
+        namespace = dict(self.constants)
+        exec(compile("\n".join(self.lines), "<competitor-schema>", "exec"), namespace)
+        return namespace['validate']
+
+    def _node(self, schema: Dict[str, Any], var: str, path: str, indent: int, seen: Tuple[str, ...]) -> None:
+        schema, seen = self._resolve(schema, seen)
+        unknown = set(schema) - _KEYWORDS - _ANNOTATIONS
+        if unknown:
+            raise ValueError(f"Unsupported schema keywords: {', '.join(sorted(unknown))}")
+
+        if 'enum' in schema:
+            allowed = self._constant(list(schema['enum']))
+            self._emit(indent, f"if {var} not in {allowed}:")
+            self._emit(indent + 1, f"errors.append({path} + ': must be one of ' + repr({allowed}))")
+
+        types = schema.get('type')
+        if types is None:
+            self._checks(schema, None, var, path, indent, seen)
+            return
+        if isinstance(types, str):
+            types = [types]
+        condition = " or ".join(_TYPE_CHECKS[t].format(v=var) for t in types)
+        self._emit(indent, f"if not ({condition}):")
+        self._emit(indent + 1, f"errors.append({path} + {repr(': expected ' + ' or '.join(types))})")
+        if len(types) == 1:
+            self._emit(indent, "else:")
+            if not self._checks(schema, types[0], var, path, indent + 1, seen):
+                self._emit(indent + 1, "pass")
+
+    def _checks(self, schema: Dict[str, Any], kind: Optional[str], var: str, path: str,
+                indent: int, seen: Tuple[str, ...]) -> bool:
+        start = len(self.lines)
+        if kind == 'object':
+            for key in schema.get('required', []):
+                self._emit(indent, f"if {key!r} not in {var}:")
+                self._emit(indent + 1, f"errors.append({path} + {repr(': missing required property ' + repr(key))})")
+            properties = schema.get('properties', {})
+            for key, subschema in properties.items():
+                child = self._name('v')
+                self._emit(indent, f"if {key!r} in {var}:")
+                self._emit(indent + 1, f"{child} = {var}[{key!r}]")
+                self._node(subschema, child, f"{path} + {repr('.' + key)}", indent + 1, seen)
+            additional = schema.get('additionalProperties', True)
+            if additional is not True:
+                known = self._constant(frozenset(properties))
+                key_var, child = self._name('k'), self._name('v')
+                self._emit(indent, f"for {key_var}, {child} in {var}.items():")
+                self._emit(indent + 1, f"if {key_var} in {known}:")
+                self._emit(indent + 2, "continue")
+                if additional is False:
+                    self._emit(indent + 1, f"errors.append({path} + ': unexpected property ' + repr({key_var}))")
+                else:
+                    self._node(additional, child, f"{path} + '.' + {key_var}", indent + 1, seen)
+        elif kind == 'array':
+            if 'minItems' in schema:
+                self._emit(indent, f"if len({var}) < {int(schema['minItems'])}:")
+                self._emit(indent + 1, f"errors.append({path} + {repr(': expected at least %d items' % schema['minItems'])})")
+            if 'items' in schema:
+                index, child = self._name('i'), self._name('v')
+                self._emit(indent, f"for {index}, {child} in enumerate({var}):")
+                self._node(schema['items'], child, f"{path} + '[' + str({index}) + ']'", indent + 1, seen)
+        elif kind == 'string':
+            if 'minLength' in schema:
+                self._emit(indent, f"if len({var}) < {int(schema['minLength'])}:")
+                self._emit(indent + 1, f"errors.append({path} + {repr(': shorter than %d characters' % schema['minLength'])})")
+            patterns = []
+            if 'pattern' in schema:
+                patterns.append((schema['pattern'], f"does not match {schema['pattern']}"))
+            if schema.get('format') in _FORMAT_PATTERNS:
+                patterns.append((_FORMAT_PATTERNS[schema['format']], f"not a valid {schema['format']}"))
+            for pattern, message in patterns:
+                regex = self._constant(re.compile(pattern))
+                self._emit(indent, f"if not {regex}.search({var}):")
+                self._emit(indent + 1, f"errors.append({path} + {repr(': ' + message)})")
+        return len(self.lines) > start
+
+
+def compile_schema(schema: Dict[str, Any]) -> Callable[[Any], List[str]]:
+    """Compile a schema into a function returning a list of error messages (empty if valid)."""
+    if fastjsonschema is not None:
+        compiled = fastjsonschema.compile(schema)
+
+        def validate(data: Any) -> List[str]:
+            try:
+                compiled(data)
+            except fastjsonschema.JsonSchemaException as e:
+                return [e.message]
+            return []
+        return validate
+    return _SchemaCompiler(schema).compile()
+
+
+class SchemaValidator:
+    """Competitor schema validator with results cached by content hash."""
+
+    def __init__(self, schema_path: str = SCHEMA_PATH):
+        self.schema_path = schema_path
+        self._lock = threading.Lock()
+        self._signature = None
+        self._schema_version = None
+        self._validate = None
+        self._results: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+        self.validations = 0
+        self.cache_hits = 0
+
+    def _compiled(self) -> Tuple[str, Callable[[Any], List[str]]]:
+        stat = os.stat(self.schema_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if signature != self._signature:
+                with open(self.schema_path, 'rb') as f:
+                    raw = f.read()
+                self._validate = compile_schema(json.loads(raw))
+                self._schema_version = hashlib.sha256(raw).hexdigest()
+                self._signature = signature
+            return self._schema_version, self._validate
+
+    def errors(self, data: Any, raw: Optional[bytes] = None) -> List[str]:
+        """Return schema errors for a record; `raw` is its file content, if already read."""
+        schema_version, validate = self._compiled()
+        if raw is None:
+            raw = json.dumps(data, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        key = (schema_version, hashlib.sha256(raw).hexdigest())
+        cached = self._results.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            return list(cached)
+        result = tuple(validate(data))
+        self.validations += 1
+        if len(self._results) >= MAX_CACHED_RESULTS:
+            self._results.clear()
+        self._results[key] = result
+        return list(result)
+
+    def check(self, data: Any, source: str, raw: Optional[bytes] = None) -> None:
+        """Raise CompetitorValidationError if the record does not match the schema."""
+        errors = self.errors(data, raw)
+        if errors:
+            raise CompetitorValidationError(source, errors)
+
+
+_validator: Optional[SchemaValidator] = None
+
+
+def get_validator() -> SchemaValidator:
+    """Return the process-wide validator for competitors/schema.json."""
+    global _validator
+    if _validator is None:
+        _validator = SchemaValidator()
+    return _validator
+
+
+def main() -> int:
+    from competitor_store import discover_competitor_files
+
+    validator = get_validator()
+    failed = 0
+    for path in discover_competitor_files():
+        with open(path, 'rb') as f:
+            raw = f.read()
+        try:
+            errors = validator.errors(json.loads(raw), raw)
+        except ValueError as e:
+            errors = [f"invalid JSON: {e}"]
+        name = os.path.relpath(path, BASE_DIR)
+        if errors:
+            failed += 1
+            print(f"❌ {name}")
+            for error in errors:
+                print(f"   - {error}")
+        else:
+            print(f"✅ {name}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
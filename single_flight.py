@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Single-flight Request Coalescing
+
+When many identical requests arrive at once (a kickoff event where every
+rep generates the same demo matrix), only the first one runs the
+computation. The others wait for it and receive the same result, which is
+then stored in the shared cache so later requests skip the work entirely.
+
+Coalescing happens between threads of one process; the cache carries the
+result across worker processes.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from cache_backends import CacheBackend
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run at most one computation per key at a time and share its result."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.cache_hits = 0
+
+    def do(self, key: str, fn: Callable[[], Any], cache: Optional[CacheBackend] = None,
+           ttl: Optional[float] = None) -> Any:
+        """Return fn() for this key, joining an in-flight call or the cache when possible."""
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                with self._lock:
+                    self.cache_hits += 1
+                return cached
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            # A previous leader may have cached the result between our cache
+            # miss above and claiming the key, so look once more before running
+            cached = cache.get(key) if cache is not None else None
+            if cached is not None:
+                with self._lock:
+                    self.cache_hits += 1
+                call.result = cached
+                return cached
+            with self._lock:
+                self.executions += 1
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        else:
+            # Cache before releasing the key so no request slips in between
+            if cache is not None:
+                try:
+                    cache.set(key, call.result, ttl)
+                except Exception as e:
+                    print(f"Warning: Could not cache result: {e}")
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'cache_hits': self.cache_hits
+            }
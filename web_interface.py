@@ -4,16 +4,38 @@ Web interface for the Requirements Matrix Generator.
 This provides a simple browser-based UI for generating compatibility matrices.
 """
 
+import gc
+import hashlib
+from html import escape
+from dataclasses import asdict
 import os
-import sys
-import json
+import sqlite3
+import tempfile
 from datetime import datetime
-from flask import Flask, render_template, request, send_file, redirect, url_for, abort
+from urllib.parse import urlencode
+from flask import Flask, Response, render_template, request, send_file, redirect, url_for, abort, jsonify
 from werkzeug.utils import secure_filename
 
+from admission_control import AdmissionRejected, create_admission_controller_from_env
+from analysis_executor import create_analysis_executor_from_env
+from artifact_retention import OUTPUT_DIR, DEFAULT_SWEEP_INTERVAL, artifact_id, create_retention_manager_from_env
+from cache_backends import MemoryLRUCache, get_cache, make_cache_key
+from capability_index import get_capability_index
+from catalog import load_catalog
+from catalog_db import get_catalog_db
+from dependency_tracking import catalog_dependencies, write_manifest
+from language_autocomplete import DEFAULT_LIMIT as AUTOCOMPLETE_LIMIT, MAX_COMPLETIONS, get_autocomplete_index
+from language_coverage import compute_language_coverage, parse_language_weights
+from language_resolver import get_language_resolver
+from lockfile_index import get_lockfile_index
+from progress_stream import ProgressError, ProgressStream
+from single_flight import SingleFlight
+
 # Import competitive analysis engine
 try:
-    from competitive_analysis import CompetitiveAnalysisEngine, ComparisonResult
+    from competitive_analysis import CompetitiveAnalysisEngine, ComparisonResult, analysis_to_dict, encode_json
+    from competitor_scoring import rank_competitors
+    from materialize_analyses import get_materialized
     COMPETITIVE_ANALYSIS_AVAILABLE = True
 except ImportError:
     COMPETITIVE_ANALYSIS_AVAILABLE = False
@@ -21,15 +43,36 @@ except ImportError:
 
 app = Flask(__name__)
 
-# Load language data from JSON
-LANGUAGES_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'languages.json')
-SCMS_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scms.json')
-
 TEMPLATE_FILE = 'web_interface_template.html'  # New static template file
 
+# Sample request used by the warm-up self-test before workers are forked
+SELF_TEST_REQUEST = {
+    'customer_name': 'Self Test',
+    'languages': ['python', 'java', 'javascript'],
+    'scm': 'GitHub',
+    'plan': 'GitHub Enterprise Cloud',
+    'competitors': [],
+    'analysis_focus': None,
+    'roi_data': None
+}
+
+# Shared state populated by preload_shared_state()
+_engine = None
+_languages_table_cache = {}
+_report_flight = SingleFlight()
+_admission = create_admission_controller_from_env()
+_retention = create_retention_manager_from_env()
+_analysis_executor = create_analysis_executor_from_env()
+# Just-rendered report HTML keyed by artifact ID, so the preview iframe that
+# follows every generation is answered without touching output/
+_preview_cache = MemoryLRUCache(
+    max_entries=256,
+    max_bytes=int(os.environ.get('MATRIX_PREVIEW_CACHE_BYTES', 32 * 1024 * 1024)),
+    default_ttl=None
+)
+
 def load_languages():
-    with open(LANGUAGES_JSON) as f:
-        return json.load(f)
+    return load_catalog().languages
 
 def get_language_info(language_name, languages):
     for lang in languages:
@@ -38,8 +81,7 @@ def get_language_info(language_name, languages):
     return None
 
 def load_scms():
-    with open(SCMS_JSON) as f:
-        return json.load(f)
+    return load_catalog().scms
 
 def get_scm_info(scm_name, scms):
     for scm in scms:
@@ -47,6 +89,19 @@ def get_scm_info(scm_name, scms):
             return scm
     return None
 
+def get_engine():
+    """Return the process-wide competitive analysis engine, creating it on first use.
+    
+    The engine's catalog-derived state is refreshed whenever languages.json
+    or scms.json changes, so edits are picked up without a restart.
+    """
+    global _engine
+    if _engine is None and COMPETITIVE_ANALYSIS_AVAILABLE:
+        _engine = CompetitiveAnalysisEngine(cache=get_cache())
+    elif _engine is not None:
+        _engine.refresh_catalog()
+    return _engine
+
 def calculate_roi_analysis(roi_data):
     """Calculate ROI comparing other scanners vs Semgrep with AI Assistant"""
     dev_count = roi_data['developer_count']
@@ -116,617 +171,356 @@ def calculate_roi_analysis(roi_data):
         }
     }
 
-# HTML template for the web interface
-HTML_TEMPLATE = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Semgrep Requirements Matrix Generator</title>
-    <meta name="viewport" content="width=device-width, initial-scale=1">
-    <style>
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            margin: 0;
-            padding: 20px;
-            max-width: 1400px;
-            margin: 0 auto;
-            background-color: #f8f9fa;
-        }
-        h1 {
-            color: #0974d7;
-            border-bottom: 2px solid #0974d7;
-            padding-bottom: 10px;
-        }
-        .form-group {
-            margin-bottom: 20px;
-        }
-        label {
-            display: block;
-            margin-bottom: 5px;
-            font-weight: bold;
-        }
-        input[type="text"], textarea, select {
-            width: 100%;
-            padding: 8px;
-            border: 1px solid #ddd;
-            border-radius: 4px;
-            box-sizing: border-box;
-        }
-        .inline-fields {
-            display: flex;
-            gap: 15px;
-            margin-bottom: 10px;
-        }
-        .field-half {
-            flex: 1;
-        }
-        .field-half select {
-            width: 100%;
-        }
-        button {
-            background-color: #0974d7;
-            color: white;
-            padding: 10px 15px;
-            border: none;
-            border-radius: 4px;
-            cursor: pointer;
-        }
-        button:hover {
-            background-color: #0757a0;
-        }
-        .result {
-            margin-top: 30px;
-            padding: 25px;
-            border: 1px solid #ddd;
-            border-radius: 10px;
-            background: linear-gradient(135deg, #f8f9fa, #e9ecef);
-            box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-        }
-        
-        .container {
-            background: white;
-            padding: 30px;
-            border-radius: 10px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }
-        .download-links {
-            margin-top: 20px;
-        }
-        .download-links a {
-            display: inline-block;
-            margin-right: 15px;
-            background-color: #4CAF50;
-            color: white;
-            padding: 8px 12px;
-            text-decoration: none;
-            border-radius: 4px;
-        }
-        .download-links a:hover {
-            background-color: #45a049;
-        }
-        .error {
-            color: red;
-            font-weight: bold;
-        }
-        .supported-list {
-            columns: 4;
-            margin-bottom: 20px;
-        }
-        .table-container {
-            width: 100%;
-            overflow-x: auto;
-            margin-bottom: 25px;
-            border-radius: 6px;
-            box-shadow: 0 2px 6px rgba(0,0,0,0.1);
-        }
-        .matrix-table { 
-            border-collapse: collapse; 
-            width: 100%; 
-            background: white;
-            font-size: 0.75em;
-        }
-        .matrix-table th, .matrix-table td { 
-            border: 1px solid #e0e0e0; 
-            padding: 10px 6px; 
-            text-align: left;
-            line-height: 1.4;
-            vertical-align: top;
-        }
-        .matrix-table th { 
-            background: linear-gradient(135deg, #0974d7, #0757a0);
-            color: white;
-            font-weight: 600;
-            font-size: 0.8em;
-            text-align: center;
-            position: sticky;
-            top: 0;
-            z-index: 10;
-            padding: 12px 6px;
-        }
-        .lang-col { min-width: 80px; max-width: 80px; }
-        .maturity-col { min-width: 45px; max-width: 45px; text-align: center; }
-        .dataflow-col { min-width: 60px; max-width: 60px; }
-        .rules-col { min-width: 40px; max-width: 40px; text-align: center; }
-        .yn-col { min-width: 35px; max-width: 35px; text-align: center; }
-        .list-col { min-width: 120px; max-width: 180px; }
-        .maturity-badge {
-            padding: 2px 4px;
-            border-radius: 3px;
-            font-size: 0.65em;
-            font-weight: bold;
-            text-transform: uppercase;
-            white-space: nowrap;
-        }
-        .maturity-ga { background: #28a745; color: white; }
-        .maturity-beta { background: #ffc107; color: #333; }
-        .maturity-experimental { background: #dc3545; color: white; }
-        .yes { color: #28a745; font-weight: bold; }
-        .no { color: #6c757d; }
-        .feature-list {
-            word-wrap: break-word;
-            font-size: 0.85em;
-            line-height: 1.4;
-            font-weight: 500;
-        }
-        .ga { background-color: #e6ffe6; } /* Light green */
-        .beta { background-color: #fff2e6; } /* Light orange */
-        .experimental { background-color: #ffe6e6; } /* Light red */
-        .maturity-legend {
-            margin-bottom: 15px;
-            font-size: 0.8em;
-        }
-        .maturity-legend span {
-            padding: 2px 8px;
-            margin-right: 10px;
-            border-radius: 3px;
-        }
-        .collapsible {
-            background-color: #f2f2f2;
-            color: #444;
-            cursor: pointer;
-            padding: 10px;
-            width: 100%;
-            border: none;
-            text-align: left;
-            outline: none;
-            font-size: 15px;
-            margin-bottom: 10px;
-        }
-        .active, .collapsible:hover {
-            background-color: #e6e6e6;
-        }
-        .content {
-            padding: 0 18px;
-            display: none;
-            overflow: hidden;
-            background-color: #f9f9f9;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-    <h1><img src="https://upload.wikimedia.org/wikipedia/commons/8/8e/Semgrep_logo.svg" alt="Semgrep" style="height: 32px; vertical-align: middle; margin-right: 10px;">Requirements Matrix Generator</h1>
-    <div style="margin-bottom: 18px; font-size: 1.1em;">
-      <a href="https://semgrep.dev/docs/semgrep/languages/" target="_blank" rel="noopener noreferrer" style="margin-right: 18px; color: #0974d7; font-weight: bold; text-decoration: underline;">Supported Languages</a>
-      <a href="https://semgrep.dev/docs/integrations/scm/" target="_blank" rel="noopener noreferrer" style="color: #0974d7; font-weight: bold; text-decoration: underline;">SCM Integrations</a>
-    </div>
-    
-    <div class="alert-info">
-      <strong>Data Source Transparency:</strong>
-      Language and SCM support information is sourced directly from the official Semgrep documentation.
-      See <a href="https://semgrep.dev/docs/semgrep/languages/" target="_blank" rel="noopener noreferrer">Supported Languages</a> and
-      <a href="https://semgrep.dev/docs/integrations/scm/" target="_blank" rel="noopener noreferrer">SCM Integrations</a>.
-    </div>
-    
-    <div class="form-group">
-        <p>This tool helps Sales generate custom compatibility
-        matrices based on customer requirements.</p>
-    </div>
-    
-    {% if error %}
-    <div class="error">{{ error }}</div>
-    {% endif %}
+# Save matrix as HTML and CSV using the JSON data
+import csv
+import io
+
+def _write_report_file(output_file, content):
+    """Write a report atomically so concurrent writers never leave a torn file."""
+    directory = os.path.dirname(os.path.abspath(output_file))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', newline='') as f:
+            f.write(content)
+        os.replace(tmp_path, output_file)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    print(f"Matrix saved to {output_file}")
+
+def render_matrix_csv(matrix):
+    """Render the matrix as CSV text."""
+    csvfile = io.StringIO()
+    writer = csv.writer(csvfile)
+    writer.writerow(["Semgrep Compatibility Matrix for " + matrix["customer_name"]])
+    writer.writerow(["Generated on", matrix["generated_at"]])
+    writer.writerow([])
+    writer.writerow(["LANGUAGE SUPPORT"])
+    writer.writerow([
+        "Language", "Maturity", "Dataflow Analysis", "# Pro Rules", "Reachability Analysis", "Open Source License Detection", "Malicious Dependency Detection", "Supported Package Managers", "Supported Lockfiles", "Scan Without Lockfiles"
+    ])
+    for lang in matrix["languages"]:
+        docs = lang.get("semgrep_docs", {})
+        writer.writerow([
+            lang.get("language", ""),
+            lang.get("maturity", ""),
+            docs.get("dataflow", ""),
+            docs.get("pro_rules", ""),
+            "Yes" if docs.get("reachability") else "No",
+            "Yes" if docs.get("open_source_licenses") else "No",
+            "Yes" if docs.get("malicious_dependencies") else "No",
+            ", ".join(docs.get("package_managers", [])),
+            ", ".join(docs.get("lockfiles", [])),
+            "Yes" if docs.get("scan_without_lockfiles") else "No"
+        ])
+    writer.writerow([])
+    coverage = matrix.get("language_coverage")
+    if coverage:
+        writer.writerow(["LANGUAGE COVERAGE"])
+        writer.writerow([f"Share of {_coverage_basis(coverage)} covered, by Semgrep maturity tier"])
+        writer.writerow(["Scanner", "Total %"] + [f"{_coverage_tier_label(tier)} %" for tier in coverage["tiers"]])
+        writer.writerow(["Customer code", 100.0] + [coverage["mix_by_tier"][tier] for tier in coverage["tiers"]])
+        for vendor in coverage["vendors"]:
+            writer.writerow([vendor["name"], vendor["coverage"]] +
+                            [vendor["by_tier"][tier] for tier in coverage["tiers"]])
+        writer.writerow([])
+    writer.writerow(["SOURCE CODE MANAGER SUPPORT"])
+    writer.writerow(["SCM", "Plan", "Unsupported Features"])
+    for scm in matrix["scms"]:
+        unsupported = scm.get("unsupported_features", "")
+        if isinstance(unsupported, list):
+            unsupported = ", ".join(unsupported)
+        elif isinstance(unsupported, str):
+            # Split on newlines or multiple spaces, filter out empty
+            unsupported = ", ".join([s.strip() for s in unsupported.replace('\r', '').replace('\n', '\n').split('\n') if s.strip()])
+        writer.writerow([
+            scm["scm"],
+            scm["plan"],
+            unsupported
+        ])
     
-    <form method="post" action="/">
-        <div class="form-group">
-            <label for="customer_name">Customer Name:</label>
-            <input type="text" id="customer_name" name="customer_name" required>
-        </div>
-        
-        <div class="form-group">
-            <label for="languages">Languages (comma-separated):</label>
-            <input type="text" id="languages" name="languages" placeholder="e.g., python, java, javascript" required>
-            
-            <button type="button" class="collapsible">View Supported Languages</button>
-            <div class="content">
-                <div class="maturity-legend">
-                    <p><strong>Maturity Levels:</strong>
-                    <span class="maturity-badge maturity-ga">GA</span>
-                    <span class="maturity-badge maturity-beta">Beta</span>
-                    <span class="maturity-badge maturity-experimental">Exp</span>
-                    </p>
-                </div>
-                
-                <div class="table-container">
-                    <table class="matrix-table">
-                        <tr>
-                            <th class="lang-col">Languages</th>
-                            <th class="maturity-col">Maturity</th>
-                            <th class="dataflow-col">Dataflow</th>
-                            <th class="rules-col">Rules</th>
-                            <th class="yn-col">Reachability</th>
-                            <th class="yn-col">License</th>
-                            <th class="yn-col">Mal Deps</th>
-                            <th class="list-col">Pkg Mgrs</th>
-                            <th class="list-col">Lockfiles</th>
-                            <th class="yn-col">Lockfileless</th>
-                        </tr>
-                        {% for lang in all_languages %}
-                        {% if lang.get('semgrep_docs') %}
-                        <tr class="{{ lang['maturity']|lower }}">
-                            <td class="lang-col"><strong>{{ lang.semgrep_docs.language }}</strong></td>
-                            <td class="maturity-col"><span class="maturity-badge maturity-{{ lang.semgrep_docs.maturity|lower }}">{{ lang.semgrep_docs.maturity }}</span></td>
-                            <td class="dataflow-col">{{ lang.semgrep_docs.dataflow or '-' }}</td>
-                            <td class="rules-col">{{ lang.semgrep_docs.pro_rules if lang.semgrep_docs.pro_rules else '-' }}</td>
-                            <td class="yn-col {{ 'yes' if lang.semgrep_docs.reachability else 'no' }}">{{ '✅' if lang.semgrep_docs.reachability else '❌' }}</td>
-                            <td class="yn-col {{ 'yes' if lang.semgrep_docs.open_source_licenses else 'no' }}">{{ '✅' if lang.semgrep_docs.open_source_licenses else '❌' }}</td>
-                            <td class="yn-col {{ 'yes' if lang.semgrep_docs.malicious_dependencies else 'no' }}">{{ '✅' if lang.semgrep_docs.malicious_dependencies else '❌' }}</td>
-                            <td class="list-col feature-list">{{ ', '.join(lang.semgrep_docs.package_managers) if lang.semgrep_docs.package_managers else '-' }}</td>
-                            <td class="list-col feature-list">{{ ', '.join(lang.semgrep_docs.lockfiles) if lang.semgrep_docs.lockfiles else '-' }}</td>
-                            <td class="yn-col {{ 'yes' if lang.semgrep_docs.scan_without_lockfiles else 'no' }}">{{ '✅' if lang.semgrep_docs.scan_without_lockfiles else '❌' }}</td>
-                        </tr>
-                        {% endif %}
-                        {% endfor %}
-                    </table>
-                </div>
-            </div>
-        </div>
+    # Add competitive analysis section if available
+    if matrix.get("competitive_analysis"):
+        writer.writerow([])
+        writer.writerow(["COMPETITIVE INTELLIGENCE ANALYSIS"])
+        writer.writerow(["Analysis Focus", matrix.get("analysis_focus", "all").replace("_", " ").title()])
+        writer.writerow([])
         
-        <div class="form-group">
-            <label>Source Code Manager & Plan:</label>
-            <div class="inline-fields">
-                <div class="field-half">
-                    <select id="scm" name="scm" required onchange="updatePlans()">
-                        <option value="">Select SCM...</option>
-                        <option value="GitHub">GitHub</option>
-                        <option value="GitLab">GitLab</option>
-                        <option value="Bitbucket">Bitbucket</option>
-                        <option value="Azure DevOps">Azure DevOps</option>
-                    </select>
-                </div>
-                <div class="field-half">
-                    <select id="plan" name="plan" required>
-                        <option value="">Select SCM first...</option>
-                    </select>
-                </div>
-            </div>
+        for analysis in matrix["competitive_analysis"]:
+            writer.writerow([f"SEMGREP vs {analysis['competitor_name']}"])
+            writer.writerow(["Overall Assessment", analysis["overall_assessment"].replace("_", " ").title()])
+            writer.writerow([])
             
-            <button type="button" class="collapsible">View Supported SCMs</button>
-            <div class="content">
-                <table class="language-table">
-                    <tr>
-                        <th>SCM</th>
-                        <th>Available Plans</th>
-                    </tr>
-                    <tr>
-                        <td>GitHub</td>
-                        <td>GitHub Free, GitHub Pro, GitHub Team, GitHub Enterprise Cloud, GitHub Enterprise Server</td>
-                    </tr>
-                    <tr>
-                        <td>GitLab</td>
-                        <td>GitLab Free, GitLab Premium, GitLab Ultimate, GitLab Dedicated / Dedicated for Government, GitLab Self-Managed Free, GitLab Self-Managed Premium, GitLab Self-Managed Ultimate</td>
-                    </tr>
-                    <tr>
-                        <td>Bitbucket</td>
-                        <td>Bitbucket Cloud Free, Bitbucket Cloud Standard, Bitbucket Cloud Premium, Bitbucket Data Center</td>
-                    </tr>
-                    <tr>
-                        <td>Azure DevOps</td>
-                        <td>Azure DevOps Cloud, Azure DevOps Server</td>
-                    </tr>
-                </table>
-            </div>
-        </div>
-        
-        <div class="form-group">
-            <label>
-                <input type="checkbox" id="include_competitive" name="include_competitive" onchange="toggleCompetitiveOptions()">
-                Include Competitive Intelligence Analysis
-            </label>
-            <small style="color: #666; display: block; margin-top: 5px;">
-                Compare Semgrep's capabilities against selected competitors using the same languages specified above.
-            </small>
-        </div>
-        
-        <div id="competitive-options" style="display: none; margin-top: 15px; padding: 15px; border: 1px solid #e0e0e0; border-radius: 8px; background: #f8f9fa;">
-            <div class="form-group">
-                <label for="competitors">Select Competitors for Analysis:</label>
-                <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 10px; margin-top: 10px;">
-                    {% if competitive_available %}
-                    {% for competitor in available_competitors %}
-                    <label style="display: flex; align-items: center; font-weight: normal;">
-                        <input type="checkbox" name="competitors" value="{{ competitor }}" style="margin-right: 8px;">
-                        {{ competitor }}
-                    </label>
-                    {% endfor %}
-                    {% else %}
-                    <p style="color: #dc3545; margin: 0;">Competitive analysis engine not available.</p>
-                    {% endif %}
-                </div>
-            </div>
+            writer.writerow(["CAPABILITY COMPARISONS"])
+            writer.writerow(["Capability", "Semgrep Status", "Competitor Status", "Result", "Notes"])
+            for cap in analysis["capability_comparisons"]:
+                writer.writerow([
+                    cap["capability"],
+                    cap["semgrep_status"],
+                    cap["competitor_status"],
+                    cap["result"].replace("_", " ").title(),
+                    cap["notes"]
+                ])
+            writer.writerow([])
             
-            <div class="form-group">
-                <label for="analysis_focus">Analysis Focus:</label>
-                <select id="analysis_focus" name="analysis_focus">
-                    <option value="all">All Capabilities (SAST, SCA, Secrets)</option>
-                    <option value="sast">SAST Cross-file Dataflow Analysis</option>
-                    <option value="sca">SCA Reachability Analysis</option>
-                    <option value="secrets">Secrets Validation</option>
-                </select>
-            </div>
-        </div>
-        
-        <div class="form-group">
-            <label>
-                <input type="checkbox" id="include_roi" name="include_roi" onchange="toggleROIOptions()">
-                Include ROI Analysis
-            </label>
-            <small style="color: #666; display: block; margin-top: 5px;">
-                Calculate return on investment comparing traditional scanners vs Semgrep with AI Assistant.
-            </small>
-        </div>
-        
-        <div id="roi-options" style="display: none; margin-top: 15px; padding: 15px; border: 1px solid #e0e0e0; border-radius: 8px; background: #f8f9fa;">
-            <h4 style="margin-top: 0; color: #0974d7;">ROI Calculator Inputs</h4>
+            writer.writerow(["LANGUAGE SUPPORT COMPARISON"])
+            writer.writerow(["Language", "Semgrep Support", "Competitor Support", "Advantage"])
+            for lang in analysis["language_comparisons"]:
+                advantage = lang["result"].replace("_", " ").title()
+                writer.writerow([
+                    lang["language"],
+                    lang["semgrep_support"],
+                    lang["competitor_support"],
+                    advantage
+                ])
+            writer.writerow([])
             
-            <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
-                <div>
-                    <h5 style="margin-bottom: 10px; color: #495057;">Team & Cost Parameters</h5>
-                    <div class="form-group">
-                        <label for="developer_count">Developer Count:</label>
-                        <input type="number" id="developer_count" name="developer_count" value="50" min="1">
-                    </div>
-                    <div class="form-group">
-                        <label for="hourly_cost">Developer Staff Cost / Hour ($):</label>
-                        <input type="number" id="hourly_cost" name="hourly_cost" value="100" min="1">
-                    </div>
-                    <div class="form-group">
-                        <label for="triage_time">Triage Time / Finding (Hours):</label>
-                        <input type="number" id="triage_time" name="triage_time" value="0.5" step="0.1" min="0.1">
-                    </div>
-                </div>
-                
-                <div>
-                    <h5 style="margin-bottom: 10px; color: #495057;">Scanner Performance</h5>
-                    <div class="form-group">
-                        <label for="other_findings_per_dev">Other Scanners - Findings/Dev/Year:</label>
-                        <input type="number" id="other_findings_per_dev" name="other_findings_per_dev" value="24.0" step="0.1" min="0">
-                    </div>
-                    <div class="form-group">
-                        <label for="other_false_positive_rate">Other Scanners - False Positive % (0-100):</label>
-                        <input type="number" id="other_false_positive_rate" name="other_false_positive_rate" value="50" min="0" max="100">
-                    </div>
-                    <div class="form-group">
-                        <label for="semgrep_findings_per_dev">Semgrep - Findings/Dev/Year:</label>
-                        <input type="number" id="semgrep_findings_per_dev" name="semgrep_findings_per_dev" value="13.2" step="0.1" min="0">
-                    </div>
-                    <div class="form-group">
-                        <label for="semgrep_false_positive_rate">Semgrep - False Positive % (0-100):</label>
-                        <input type="number" id="semgrep_false_positive_rate" name="semgrep_false_positive_rate" value="25" min="0" max="100">
-                    </div>
-                    <div class="form-group">
-                        <label for="semgrep_autotriage_rate">Semgrep - Auto-triage % (0-100):</label>
-                        <input type="number" id="semgrep_autotriage_rate" name="semgrep_autotriage_rate" value="80" min="0" max="100">
-                        <small style="color: #666; font-size: 0.8em;">Percentage of false positives automatically triaged by AI Assistant</small>
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <button type="submit">Generate Matrix</button>
-    </form>
+            writer.writerow(["SALES TALKING POINTS"])
+            for i, point in enumerate(analysis["sales_talking_points"], 1):
+                writer.writerow([f"{i}.", point])
+            writer.writerow([])
     
-    {% if result %}
-    <div class="result">
-        <h2>Matrix Generated!</h2>
-        <p>Customer: {{ customer_name }}</p>
-        <p>Generated on: {{ generated_at }}</p>
-        
-        <div class="download-links">
-            <a href="{{ url_for('download_file', filename='html', customer_name=customer_name) }}">Download HTML Report</a>
-            <a href="{{ url_for('download_file', filename='csv', customer_name=customer_name) }}">Download CSV Report</a>
-        </div>
+    # Add ROI analysis section if available
+    if matrix.get("roi_analysis"):
+        roi = matrix["roi_analysis"]
+        writer.writerow([])
+        writer.writerow(["ROI ANALYSIS"])
+        writer.writerow(["Comparison: Other Scanners vs Semgrep Code w/ AI Assistant"])
+        writer.writerow([])
         
-        <iframe src="{{ url_for('preview_html', customer_name=customer_name) }}" width="100%" height="800px" style="border: 1px solid #ddd; margin-top: 20px; border-radius: 8px; box-shadow: 0 4px 12px rgba(0,0,0,0.15);"></iframe>
-    </div>
-    {% endif %}
-    
-    <script>
-        var coll = document.getElementsByClassName("collapsible");
-        for (var i = 0; i < coll.length; i++) {
-            coll[i].addEventListener("click", function() {
-                this.classList.toggle("active");
-                var content = this.nextElementSibling;
-                if (content.style.display === "block") {
-                    content.style.display = "none";
-                } else {
-                    content.style.display = "block";
-                }
-            });
-        }
+        writer.writerow(["ROI INPUTS"])
+        writer.writerow(["Parameter", "Other Scanners", "Semgrep Code w/ AI Assistant"])
+        writer.writerow(["Developer count", roi["inputs"]["developer_count"], roi["inputs"]["developer_count"]])
+        writer.writerow(["Developer Staff Cost / Hour", f"${roi['inputs']['hourly_cost']}", f"${roi['inputs']['hourly_cost']}"])
+        writer.writerow(["Findings / Dev / Year", roi["inputs"]["other_findings_per_dev"], roi["inputs"]["semgrep_findings_per_dev"]])
+        writer.writerow(["Findings, Total", f"{roi['other_scanners']['findings_total']:,.0f}", f"{roi['semgrep']['findings_total']:,.0f}"])
+        writer.writerow(["Findings, False Positive %", f"{roi['inputs']['other_false_positive_rate']}%", f"{roi['inputs']['semgrep_false_positive_rate']}%"])
+        writer.writerow(["Findings, False Positive %, Autotriaged", "", f"{roi['inputs']['semgrep_autotriage_rate']}%"])
+        writer.writerow(["Triage Time / Finding (Hours)", roi["inputs"]["triage_time"], roi["inputs"]["triage_time"]])
+        writer.writerow([])
         
-        function updatePlans() {
-            const scm = document.getElementById('scm').value;
-            const planSelect = document.getElementById('plan');
-            
-            // Clear current options
-            planSelect.innerHTML = '<option value="">Select plan...</option>';
-            
-            const plans = {
-                'GitHub': ['GitHub Free', 'GitHub Pro', 'GitHub Team', 'GitHub Enterprise Cloud', 'GitHub Enterprise Server'],
-                'GitLab': ['GitLab Free', 'GitLab Premium', 'GitLab Ultimate', 'GitLab Dedicated', 'GitLab Self-Managed Free', 'GitLab Self-Managed Premium', 'GitLab Self-Managed Ultimate'],
-                'Bitbucket': ['Bitbucket Cloud Free', 'Bitbucket Cloud Standard', 'Bitbucket Cloud Premium', 'Bitbucket Data Center'],
-                'Azure DevOps': ['Azure DevOps Cloud', 'Azure DevOps Server']
-            };
-            
-            if (plans[scm]) {
-                plans[scm].forEach(plan => {
-                    const option = document.createElement('option');
-                    option.value = plan;
-                    option.textContent = plan;
-                    planSelect.appendChild(option);
-                });
-            }
-        }
+        writer.writerow(["PROGRAM ACTIVITY"])
+        writer.writerow(["Metric", "Other Scanners", "Semgrep Code w/ AI Assistant"])
+        writer.writerow(["Findings, Total Reviewed", f"{roi['other_scanners']['findings_reviewed']:,.0f}", f"{roi['semgrep']['findings_reviewed']:,.0f}"])
+        writer.writerow(["Findings, False Positive, Reviewed", f"{roi['other_scanners']['false_positives_reviewed']:,.0f}", f"{roi['semgrep']['false_positives_reviewed']:,.0f}"])
+        writer.writerow(["Time, Total Triage", f"{roi['other_scanners']['triage_time_hours']:,.1f} hours", f"{roi['semgrep']['triage_time_hours']:,.1f} hours"])
+        writer.writerow([])
         
-        function toggleCompetitiveOptions() {
-            const checkbox = document.getElementById('include_competitive');
-            const options = document.getElementById('competitive-options');
-            
-            if (checkbox.checked) {
-                options.style.display = 'block';
-            } else {
-                options.style.display = 'none';
-            }
-        }
+        writer.writerow(["PROGRAM COST"])
+        writer.writerow(["Cost Category", "Other Scanners", "Semgrep Code w/ AI Assistant"])
+        writer.writerow(["Cost, Triage Total", f"${roi['other_scanners']['triage_cost']:,.0f}", f"${roi['semgrep']['triage_cost']:,.0f}"])
+        writer.writerow(["Cost, Wasted on False Positives", f"${roi['other_scanners']['false_positive_cost']:,.0f}", f"${roi['semgrep']['false_positive_cost']:,.0f}"])
+        writer.writerow(["Savings through avoiding FPs", "$0", f"${roi['savings']['false_positive_cost_avoided']:,.0f}"])
+        writer.writerow([])
+    
+    return csvfile.getvalue()
+
+def save_matrix_as_csv(matrix, output_file):
+    _write_report_file(output_file, render_matrix_csv(matrix))
+
+def _cached_section(name, payload, render):
+    """Return a rendered report section from the shared cache, rendering it on a miss."""
+    cache = get_cache()
+    if cache is None:
+        return render(payload)
+    key = make_cache_key('section', name, payload)
+    section = cache.get(key)
+    if section is None:
+        section = render(payload)
+        cache.set(key, section)
+    return section
+
+def _render_language_rows(languages):
+    html = ""
+    for lang in languages:
+        docs = lang.get("semgrep_docs", {})
+        maturity = lang.get('maturity', '').lower()
+        maturity_class = f"maturity-{maturity}" if maturity in ['ga', 'beta', 'experimental'] else ""
+        row_class = maturity
         
-        function toggleROIOptions() {
-            const checkbox = document.getElementById('include_roi');
-            const options = document.getElementById('roi-options');
-            
-            if (checkbox.checked) {
-                options.style.display = 'block';
-            } else {
-                options.style.display = 'none';
-            }
-        }
-    </script>
-    </div>
-</body>
-</html>
-"""
+        html += f"""
+                    <tr class="{row_class}">
+                        <td class="lang-col"><strong>{lang.get('language', '')}</strong></td>
+                        <td class="maturity-col"><span class="maturity-badge {maturity_class}">{lang.get('maturity', '')}</span></td>
+                        <td class="dataflow-col">{docs.get('dataflow', '-')}</td>
+                        <td class="rules-col">{docs.get('pro_rules', 0) if docs.get('pro_rules') else '-'}</td>
+                        <td class="yn-col {'yes' if docs.get('reachability') else 'no'}">{'✅' if docs.get('reachability') else '❌'}</td>
+                        <td class="yn-col {'yes' if docs.get('open_source_licenses') else 'no'}">{'✅' if docs.get('open_source_licenses') else '❌'}</td>
+                        <td class="yn-col {'yes' if docs.get('malicious_dependencies') else 'no'}">{'✅' if docs.get('malicious_dependencies') else '❌'}</td>
+                        <td class="list-col feature-list">{', '.join(docs.get('package_managers', [])) or '-'}</td>
+                        <td class="list-col feature-list">{', '.join(docs.get('lockfiles', [])) or '-'}</td>
+                        <td class="yn-col {'yes' if docs.get('scan_without_lockfiles') else 'no'}">{'✅' if docs.get('scan_without_lockfiles') else '❌'}</td>
+                    </tr>"""
+    return html
 
-# Save matrix as HTML and CSV using the JSON data
-import csv
+def _coverage_basis(coverage):
+    if coverage["weighted"]:
+        return "weighted language mix"
+    return "selected languages (each counted once)"
 
-def save_matrix_as_csv(matrix, output_file):
-    with open(output_file, 'w', newline='') as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(["Semgrep Compatibility Matrix for " + matrix["customer_name"]])
-        writer.writerow(["Generated on", matrix["generated_at"]])
-        writer.writerow([])
-        writer.writerow(["LANGUAGE SUPPORT"])
-        writer.writerow([
-            "Language", "Maturity", "Dataflow Analysis", "# Pro Rules", "Reachability Analysis", "Open Source License Detection", "Malicious Dependency Detection", "Supported Package Managers", "Supported Lockfiles", "Scan Without Lockfiles"
-        ])
-        for lang in matrix["languages"]:
-            docs = lang.get("semgrep_docs", {})
-            writer.writerow([
-                lang.get("language", ""),
-                lang.get("maturity", ""),
-                docs.get("dataflow", ""),
-                docs.get("pro_rules", ""),
-                "Yes" if docs.get("reachability") else "No",
-                "Yes" if docs.get("open_source_licenses") else "No",
-                "Yes" if docs.get("malicious_dependencies") else "No",
-                ", ".join(docs.get("package_managers", [])),
-                ", ".join(docs.get("lockfiles", [])),
-                "Yes" if docs.get("scan_without_lockfiles") else "No"
-            ])
-        writer.writerow([])
-        writer.writerow(["SOURCE CODE MANAGER SUPPORT"])
-        writer.writerow(["SCM", "Plan", "Unsupported Features"])
-        for scm in matrix["scms"]:
-            unsupported = scm.get("unsupported_features", "")
-            if isinstance(unsupported, list):
-                unsupported = ", ".join(unsupported)
-            elif isinstance(unsupported, str):
-                # Split on newlines or multiple spaces, filter out empty
-                unsupported = ", ".join([s.strip() for s in unsupported.replace('\r', '').replace('\n', '\n').split('\n') if s.strip()])
-            writer.writerow([
-                scm["scm"],
-                scm["plan"],
-                unsupported
-            ])
+def _coverage_tier_label(tier):
+    return "Not supported by Semgrep" if tier == "Not supported" else tier
+
+def _render_language_coverage(coverage):
+    html = f"""
+            <h2>📊 Language Coverage</h2>
+            <div class="info">
+                <p>Share of the {_coverage_basis(coverage)} covered by each scanner, split by Semgrep's maturity for each language.</p>
+            </div>
+            <div class="table-container">
+                <table>
+                    <tr>
+                        <th style="min-width: 120px;">Scanner</th>
+                        <th>Total</th>"""
+    for tier in coverage["tiers"]:
+        html += f"""
+                        <th>{_coverage_tier_label(tier)}</th>"""
+    html += """
+                    </tr>
+                    <tr>
+                        <td><em>Customer code</em></td>
+                        <td>100%</td>"""
+    for tier in coverage["tiers"]:
+        html += f"""
+                        <td>{coverage['mix_by_tier'][tier]}%</td>"""
+    html += """
+                    </tr>"""
+    for vendor in coverage["vendors"]:
+        html += f"""
+                    <tr>
+                        <td><strong>{vendor['name']}</strong></td>
+                        <td><strong>{vendor['coverage']}%</strong></td>"""
+        for tier in coverage["tiers"]:
+            html += f"""
+                        <td>{vendor['by_tier'][tier]}%</td>"""
+        html += """
+                    </tr>"""
+    html += """
+                </table>
+            </div>"""
+    return html
+
+def _render_language_cards(languages):
+    html = ""
+    for lang in languages:
+        docs = lang.get("semgrep_docs", {})
+        maturity = lang.get('maturity', '')
+        maturity_class = f"maturity-{maturity.lower()}" if maturity.lower() in ['ga', 'beta', 'experimental'] else ""
         
-        # Add competitive analysis section if available
-        if matrix.get("competitive_analysis"):
-            writer.writerow([])
-            writer.writerow(["COMPETITIVE INTELLIGENCE ANALYSIS"])
-            writer.writerow(["Analysis Focus", matrix.get("analysis_focus", "all").replace("_", " ").title()])
-            writer.writerow([])
-            
-            for analysis in matrix["competitive_analysis"]:
-                writer.writerow([f"SEMGREP vs {analysis['competitor_name']}"])
-                writer.writerow(["Overall Assessment", analysis["overall_assessment"].replace("_", " ").title()])
-                writer.writerow([])
+        html += f"""
+                <div class="lang-card">
+                    <h3>{lang.get('language', '')} <span class="maturity-badge {maturity_class}">{maturity}</span></h3>
+                    <div class="lang-detail"><strong>Dataflow:</strong> <span>{docs.get('dataflow', '-')}</span></div>
+                    <div class="lang-detail"><strong>Pro Rules:</strong> <span>{docs.get('pro_rules', 0) if docs.get('pro_rules') else '-'}</span></div>
+                    <div class="lang-detail"><strong>Reachability:</strong> <span class="{'yes' if docs.get('reachability') else 'no'}">{'✅ Yes' if docs.get('reachability') else '❌ No'}</span></div>
+                    <div class="lang-detail"><strong>License Detection:</strong> <span class="{'yes' if docs.get('open_source_licenses') else 'no'}">{'✅ Yes' if docs.get('open_source_licenses') else '❌ No'}</span></div>
+                    <div class="lang-detail"><strong>Malicious Deps:</strong> <span class="{'yes' if docs.get('malicious_dependencies') else 'no'}">{'✅ Yes' if docs.get('malicious_dependencies') else '❌ No'}</span></div>
+                    <div class="lang-detail"><strong>Package Managers:</strong> <span>{', '.join(docs.get('package_managers', [])) or '-'}</span></div>
+                    <div class="lang-detail"><strong>Lockfiles:</strong> <span>{', '.join(docs.get('lockfiles', [])) or '-'}</span></div>
+                    <div class="lang-detail"><strong>Scan w/o Lock:</strong> <span class="{'yes' if docs.get('scan_without_lockfiles') else 'no'}">{'✅ Yes' if docs.get('scan_without_lockfiles') else '❌ No'}</span></div>
+                </div>"""
+    return html
+
+def _render_competitor_analysis(analysis):
+    html = ""
+    competitor_name = analysis["competitor_name"]
+    overall = analysis["overall_assessment"]
+    
+    # Determine overall assessment display
+    if overall == "semgrep_advantage":
+        overall_badge = '<span style="background: #d4edda; color: #155724; padding: 4px 8px; border-radius: 4px; font-size: 0.9em; font-weight: bold;">✅ Semgrep Advantage</span>'
+    elif overall == "competitor_advantage":
+        overall_badge = '<span style="background: #f8d7da; color: #721c24; padding: 4px 8px; border-radius: 4px; font-size: 0.9em; font-weight: bold;">⚠️ Competitor Advantage</span>'
+    else:
+        overall_badge = '<span style="background: #e2e3e5; color: #383d41; padding: 4px 8px; border-radius: 4px; font-size: 0.9em; font-weight: bold;">🔄 Equivalent</span>'
+    
+    html += f"""
+            <div style="margin: 20px 0; padding: 20px; border: 1px solid #e0e0e0; border-radius: 8px; background: white;">
+                <h3 style="margin-top: 0; color: #0974d7; display: flex; justify-content: space-between; align-items: center;">
+                    <span>Semgrep vs {competitor_name}</span>
+                    {overall_badge}
+                </h3>
                 
-                writer.writerow(["CAPABILITY COMPARISONS"])
-                writer.writerow(["Capability", "Semgrep Status", "Competitor Status", "Result", "Notes"])
-                for cap in analysis["capability_comparisons"]:
-                    writer.writerow([
-                        cap["capability"],
-                        cap["semgrep_status"],
-                        cap["competitor_status"],
-                        cap["result"].replace("_", " ").title(),
-                        cap["notes"]
-                    ])
-                writer.writerow([])
+                <h4>🔍 Key Capability Comparisons</h4>
+                <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 15px;">"""
+    
+    for cap in analysis["capability_comparisons"]:
+        if cap["result"] == "semgrep_advantage":
+            icon = "✅"
+            bg_color = "#f8fff9"
+            border_color = "#28a745"
+        elif cap["result"] == "competitor_advantage":
+            icon = "⚠️"
+            bg_color = "#fff8f8"
+            border_color = "#dc3545"
+        else:
+            icon = "🔄"
+            bg_color = "#f8f9fa"
+            border_color = "#6c757d"
+        
+        html += f"""
+                    <div style="padding: 10px; border-left: 4px solid {border_color}; background: {bg_color}; border-radius: 4px;">
+                        <strong>{icon} {cap["capability"]}</strong><br>
+                        <small style="color: #666;">{cap["notes"]}</small>
+                    </div>"""
+    
+    html += """
+                </div>
                 
-                writer.writerow(["LANGUAGE SUPPORT COMPARISON"])
-                writer.writerow(["Language", "Semgrep Support", "Competitor Support", "Advantage"])
-                for lang in analysis["language_comparisons"]:
-                    advantage = lang["result"].replace("_", " ").title()
-                    writer.writerow([
-                        lang["language"],
-                        lang["semgrep_support"],
-                        lang["competitor_support"],
-                        advantage
-                    ])
-                writer.writerow([])
+                <h4>🎯 Sales Talking Points</h4>
+                <div style="background: #e8f4fd; padding: 15px; border-radius: 6px;">
+                    <ul style="margin: 0; padding-left: 20px;">"""
+    
+    for point in analysis["sales_talking_points"]:
+        html += f"<li>{point}</li>"
+    
+    html += """
+                    </ul>
+                </div>
                 
-                writer.writerow(["SALES TALKING POINTS"])
-                for i, point in enumerate(analysis["sales_talking_points"], 1):
-                    writer.writerow([f"{i}.", point])
-                writer.writerow([])
+                <h4>🌐 Language Support Comparison</h4>
+                <div class="table-container">
+                    <table style="width: 100%; border-collapse: collapse; font-size: 0.85em;">
+                        <tr style="background: #f8f9fa;">
+                            <th style="border: 1px solid #e0e0e0; padding: 8px; text-align: left;">Language</th>
+                            <th style="border: 1px solid #e0e0e0; padding: 8px; text-align: center;">Semgrep</th>
+                            <th style="border: 1px solid #e0e0e0; padding: 8px; text-align: center;">""" + competitor_name + """</th>
+                            <th style="border: 1px solid #e0e0e0; padding: 8px; text-align: center;">Advantage</th>
+                        </tr>"""
+    
+    for lang in analysis["language_comparisons"]:
+        if lang["result"] == "semgrep_advantage":
+            advantage_text = "🟢 Semgrep"
+        elif lang["result"] == "competitor_advantage":
+            advantage_text = "🔴 " + competitor_name
+        else:
+            advantage_text = "🟡 Equivalent"
         
-        # Add ROI analysis section if available
-        if matrix.get("roi_analysis"):
-            roi = matrix["roi_analysis"]
-            writer.writerow([])
-            writer.writerow(["ROI ANALYSIS"])
-            writer.writerow(["Comparison: Other Scanners vs Semgrep Code w/ AI Assistant"])
-            writer.writerow([])
-            
-            writer.writerow(["ROI INPUTS"])
-            writer.writerow(["Parameter", "Other Scanners", "Semgrep Code w/ AI Assistant"])
-            writer.writerow(["Developer count", roi["inputs"]["developer_count"], roi["inputs"]["developer_count"]])
-            writer.writerow(["Developer Staff Cost / Hour", f"${roi['inputs']['hourly_cost']}", f"${roi['inputs']['hourly_cost']}"])
-            writer.writerow(["Findings / Dev / Year", roi["inputs"]["other_findings_per_dev"], roi["inputs"]["semgrep_findings_per_dev"]])
-            writer.writerow(["Findings, Total", f"{roi['other_scanners']['findings_total']:,.0f}", f"{roi['semgrep']['findings_total']:,.0f}"])
-            writer.writerow(["Findings, False Positive %", f"{roi['inputs']['other_false_positive_rate']}%", f"{roi['inputs']['semgrep_false_positive_rate']}%"])
-            writer.writerow(["Findings, False Positive %, Autotriaged", "", f"{roi['inputs']['semgrep_autotriage_rate']}%"])
-            writer.writerow(["Triage Time / Finding (Hours)", roi["inputs"]["triage_time"], roi["inputs"]["triage_time"]])
-            writer.writerow([])
-            
-            writer.writerow(["PROGRAM ACTIVITY"])
-            writer.writerow(["Metric", "Other Scanners", "Semgrep Code w/ AI Assistant"])
-            writer.writerow(["Findings, Total Reviewed", f"{roi['other_scanners']['findings_reviewed']:,.0f}", f"{roi['semgrep']['findings_reviewed']:,.0f}"])
-            writer.writerow(["Findings, False Positive, Reviewed", f"{roi['other_scanners']['false_positives_reviewed']:,.0f}", f"{roi['semgrep']['false_positives_reviewed']:,.0f}"])
-            writer.writerow(["Time, Total Triage", f"{roi['other_scanners']['triage_time_hours']:,.1f} hours", f"{roi['semgrep']['triage_time_hours']:,.1f} hours"])
-            writer.writerow([])
-            
-            writer.writerow(["PROGRAM COST"])
-            writer.writerow(["Cost Category", "Other Scanners", "Semgrep Code w/ AI Assistant"])
-            writer.writerow(["Cost, Triage Total", f"${roi['other_scanners']['triage_cost']:,.0f}", f"${roi['semgrep']['triage_cost']:,.0f}"])
-            writer.writerow(["Cost, Wasted on False Positives", f"${roi['other_scanners']['false_positive_cost']:,.0f}", f"${roi['semgrep']['false_positive_cost']:,.0f}"])
-            writer.writerow(["Savings through avoiding FPs", "$0", f"${roi['savings']['false_positive_cost_avoided']:,.0f}"])
-            writer.writerow([])
+        html += f"""
+                        <tr>
+                            <td style="border: 1px solid #e0e0e0; padding: 8px;"><strong>{lang["language"]}</strong></td>
+                            <td style="border: 1px solid #e0e0e0; padding: 8px; text-align: center;">{lang["semgrep_support"]}</td>
+                            <td style="border: 1px solid #e0e0e0; padding: 8px; text-align: center;">{lang["competitor_support"]}</td>
+                            <td style="border: 1px solid #e0e0e0; padding: 8px; text-align: center; font-size: 0.8em;">{advantage_text}</td>
+                        </tr>"""
     
-    print(f"Matrix saved to {output_file}")
+    html += """
+                    </table>
+                </div>
+                <h4>📚 Data Sources</h4>
+                <div style="font-size: 0.8em; color: #666;">"""
+    for source in analysis["data_sources"]:
+        html += f'<p>📄 <a href="{source["url"]}" target="_blank">{source["title"]}</a> - {source["description"]}</p>'
+    html += """
+                    <p><em>💡 All competitive intelligence sourced from public information and official documentation.</em></p>
+                </div>"""
+    
+    html += "</div>"  # Close competitor analysis div
+    return html
 
-def save_matrix_as_html(matrix, output_file):
+def render_matrix_html(matrix):
+    """Render the matrix as a standalone HTML page."""
     html = f"""
     <!DOCTYPE html>
     <html>
@@ -909,25 +703,7 @@ def save_matrix_as_html(matrix, output_file):
                         <th class="yn-col">No Lock</th>
                     </tr>"""
     
-    for lang in matrix["languages"]:
-        docs = lang.get("semgrep_docs", {})
-        maturity = lang.get('maturity', '').lower()
-        maturity_class = f"maturity-{maturity}" if maturity in ['ga', 'beta', 'experimental'] else ""
-        row_class = maturity
-        
-        html += f"""
-                    <tr class="{row_class}">
-                        <td class="lang-col"><strong>{lang.get('language', '')}</strong></td>
-                        <td class="maturity-col"><span class="maturity-badge {maturity_class}">{lang.get('maturity', '')}</span></td>
-                        <td class="dataflow-col">{docs.get('dataflow', '-')}</td>
-                        <td class="rules-col">{docs.get('pro_rules', 0) if docs.get('pro_rules') else '-'}</td>
-                        <td class="yn-col {'yes' if docs.get('reachability') else 'no'}">{'✅' if docs.get('reachability') else '❌'}</td>
-                        <td class="yn-col {'yes' if docs.get('open_source_licenses') else 'no'}">{'✅' if docs.get('open_source_licenses') else '❌'}</td>
-                        <td class="yn-col {'yes' if docs.get('malicious_dependencies') else 'no'}">{'✅' if docs.get('malicious_dependencies') else '❌'}</td>
-                        <td class="list-col feature-list">{', '.join(docs.get('package_managers', [])) or '-'}</td>
-                        <td class="list-col feature-list">{', '.join(docs.get('lockfiles', [])) or '-'}</td>
-                        <td class="yn-col {'yes' if docs.get('scan_without_lockfiles') else 'no'}">{'✅' if docs.get('scan_without_lockfiles') else '❌'}</td>
-                    </tr>"""
+    html += _cached_section("language_rows", matrix["languages"], _render_language_rows)
     
     html += """
                 </table>
@@ -936,167 +712,64 @@ def save_matrix_as_html(matrix, output_file):
             <!-- Mobile Cards -->
             <div class="mobile-cards">"""
     
-    for lang in matrix["languages"]:
-        docs = lang.get("semgrep_docs", {})
-        maturity = lang.get('maturity', '')
-        maturity_class = f"maturity-{maturity.lower()}" if maturity.lower() in ['ga', 'beta', 'experimental'] else ""
-        
-        html += f"""
-                <div class="lang-card">
-                    <h3>{lang.get('language', '')} <span class="maturity-badge {maturity_class}">{maturity}</span></h3>
-                    <div class="lang-detail"><strong>Dataflow:</strong> <span>{docs.get('dataflow', '-')}</span></div>
-                    <div class="lang-detail"><strong>Pro Rules:</strong> <span>{docs.get('pro_rules', 0) if docs.get('pro_rules') else '-'}</span></div>
-                    <div class="lang-detail"><strong>Reachability:</strong> <span class="{'yes' if docs.get('reachability') else 'no'}">{'✅ Yes' if docs.get('reachability') else '❌ No'}</span></div>
-                    <div class="lang-detail"><strong>License Detection:</strong> <span class="{'yes' if docs.get('open_source_licenses') else 'no'}">{'✅ Yes' if docs.get('open_source_licenses') else '❌ No'}</span></div>
-                    <div class="lang-detail"><strong>Malicious Deps:</strong> <span class="{'yes' if docs.get('malicious_dependencies') else 'no'}">{'✅ Yes' if docs.get('malicious_dependencies') else '❌ No'}</span></div>
-                    <div class="lang-detail"><strong>Package Managers:</strong> <span>{', '.join(docs.get('package_managers', [])) or '-'}</span></div>
-                    <div class="lang-detail"><strong>Lockfiles:</strong> <span>{', '.join(docs.get('lockfiles', [])) or '-'}</span></div>
-                    <div class="lang-detail"><strong>Scan w/o Lock:</strong> <span class="{'yes' if docs.get('scan_without_lockfiles') else 'no'}">{'✅ Yes' if docs.get('scan_without_lockfiles') else '❌ No'}</span></div>
-                </div>"""
+    html += _cached_section("language_cards", matrix["languages"], _render_language_cards)
+    
+    html += """
+            </div>"""
+    
+    if matrix.get("language_coverage"):
+        html += _render_language_coverage(matrix["language_coverage"])
     
     html += """
-            </div>
             
             <h2>🔗 Source Code Manager Support</h2>
             <div class="table-container">
                 <table>
                     <tr>
-                        <th style="min-width: 100px;">SCM</th>
-                        <th style="min-width: 150px;">Plan</th>
-                        <th>Unsupported Features</th>
-                    </tr>"""
-    
-    for scm in matrix["scms"]:
-        unsupported = scm.get('unsupported_features', '')
-        if isinstance(unsupported, list):
-            unsupported = ', '.join(unsupported) if unsupported else 'All features supported ✅'
-        elif isinstance(unsupported, str):
-            unsupported = ', '.join([s.strip() for s in unsupported.replace('\r', '').replace('\n', '\n').split('\n') if s.strip()]) if unsupported.strip() else 'All features supported ✅'
-        else:
-            unsupported = 'All features supported ✅'
-            
-        html += f"""
-                    <tr>
-                        <td><strong>{scm['scm']}</strong></td>
-                        <td>{scm['plan']}</td>
-                        <td class="feature-list">{unsupported}</td>
-                    </tr>"""
-    
-    html += """
-                </table>
-            </div>
-            
-            <div class="info" style="margin-top: 30px;">
-                <p><strong>Legend:</strong>
-                <span class="maturity-badge maturity-ga">GA</span> Generally Available &nbsp;
-                <span class="maturity-badge maturity-beta">Beta</span> Beta Release &nbsp;
-                <span class="maturity-badge maturity-experimental">Exp</span> Experimental
-                </p>
-            </div>"""
-    
-    # Add competitive analysis section if available
-    if matrix.get("competitive_analysis"):
-        html += """
-            <h2>🥊 Competitive Intelligence Analysis</h2>
-            <div class="info">
-                <p><strong>Analysis Focus:</strong> """ + (matrix.get("analysis_focus", "all").replace("_", " ").title()) + """</p>
-                <p>Comparing Semgrep's capabilities against selected competitors for the languages specified above.</p>
-            </div>"""
-        
-        for analysis in matrix["competitive_analysis"]:
-            competitor_name = analysis["competitor_name"]
-            overall = analysis["overall_assessment"]
-            
-            # Determine overall assessment display
-            if overall == "semgrep_advantage":
-                overall_badge = '<span style="background: #d4edda; color: #155724; padding: 4px 8px; border-radius: 4px; font-size: 0.9em; font-weight: bold;">✅ Semgrep Advantage</span>'
-            elif overall == "competitor_advantage":
-                overall_badge = '<span style="background: #f8d7da; color: #721c24; padding: 4px 8px; border-radius: 4px; font-size: 0.9em; font-weight: bold;">⚠️ Competitor Advantage</span>'
-            else:
-                overall_badge = '<span style="background: #e2e3e5; color: #383d41; padding: 4px 8px; border-radius: 4px; font-size: 0.9em; font-weight: bold;">🔄 Equivalent</span>'
-            
-            html += f"""
-            <div style="margin: 20px 0; padding: 20px; border: 1px solid #e0e0e0; border-radius: 8px; background: white;">
-                <h3 style="margin-top: 0; color: #0974d7; display: flex; justify-content: space-between; align-items: center;">
-                    <span>Semgrep vs {competitor_name}</span>
-                    {overall_badge}
-                </h3>
-                
-                <h4>🔍 Key Capability Comparisons</h4>
-                <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 15px;">"""
-            
-            for cap in analysis["capability_comparisons"]:
-                if cap["result"] == "semgrep_advantage":
-                    icon = "✅"
-                    bg_color = "#f8fff9"
-                    border_color = "#28a745"
-                elif cap["result"] == "competitor_advantage":
-                    icon = "⚠️"
-                    bg_color = "#fff8f8"
-                    border_color = "#dc3545"
-                else:
-                    icon = "🔄"
-                    bg_color = "#f8f9fa"
-                    border_color = "#6c757d"
-                
-                html += f"""
-                    <div style="padding: 10px; border-left: 4px solid {border_color}; background: {bg_color}; border-radius: 4px;">
-                        <strong>{icon} {cap["capability"]}</strong><br>
-                        <small style="color: #666;">{cap["notes"]}</small>
-                    </div>"""
-            
-            html += """
-                </div>
-                
-                <h4>🎯 Sales Talking Points</h4>
-                <div style="background: #e8f4fd; padding: 15px; border-radius: 6px;">
-                    <ul style="margin: 0; padding-left: 20px;">"""
-            
-            for point in analysis["sales_talking_points"]:
-                html += f"<li>{point}</li>"
-            
-            html += """
-                    </ul>
-                </div>
-                
-                <h4>🌐 Language Support Comparison</h4>
-                <div class="table-container">
-                    <table style="width: 100%; border-collapse: collapse; font-size: 0.85em;">
-                        <tr style="background: #f8f9fa;">
-                            <th style="border: 1px solid #e0e0e0; padding: 8px; text-align: left;">Language</th>
-                            <th style="border: 1px solid #e0e0e0; padding: 8px; text-align: center;">Semgrep</th>
-                            <th style="border: 1px solid #e0e0e0; padding: 8px; text-align: center;">""" + competitor_name + """</th>
-                            <th style="border: 1px solid #e0e0e0; padding: 8px; text-align: center;">Advantage</th>
-                        </tr>"""
-            
-            for lang in analysis["language_comparisons"]:
-                if lang["result"] == "semgrep_advantage":
-                    advantage_text = "🟢 Semgrep"
-                elif lang["result"] == "competitor_advantage":
-                    advantage_text = "🔴 " + competitor_name
-                else:
-                    advantage_text = "🟡 Equivalent"
-                
-                html += f"""
-                        <tr>
-                            <td style="border: 1px solid #e0e0e0; padding: 8px;"><strong>{lang["language"]}</strong></td>
-                            <td style="border: 1px solid #e0e0e0; padding: 8px; text-align: center;">{lang["semgrep_support"]}</td>
-                            <td style="border: 1px solid #e0e0e0; padding: 8px; text-align: center;">{lang["competitor_support"]}</td>
-                            <td style="border: 1px solid #e0e0e0; padding: 8px; text-align: center; font-size: 0.8em;">{advantage_text}</td>
-                        </tr>"""
+                        <th style="min-width: 100px;">SCM</th>
+                        <th style="min-width: 150px;">Plan</th>
+                        <th>Unsupported Features</th>
+                    </tr>"""
+    
+    for scm in matrix["scms"]:
+        unsupported = scm.get('unsupported_features', '')
+        if isinstance(unsupported, list):
+            unsupported = ', '.join(unsupported) if unsupported else 'All features supported ✅'
+        elif isinstance(unsupported, str):
+            unsupported = ', '.join([s.strip() for s in unsupported.replace('\r', '').replace('\n', '\n').split('\n') if s.strip()]) if unsupported.strip() else 'All features supported ✅'
+        else:
+            unsupported = 'All features supported ✅'
             
-            html += """
-                    </table>
-                </div>
-                <h4>📚 Data Sources</h4>
-                <div style="font-size: 0.8em; color: #666;">"""
-            for source in analysis["data_sources"]:
-                html += f'<p>📄 <a href="{source["url"]}" target="_blank">{source["title"]}</a> - {source["description"]}</p>'
-            html += """
-                    <p><em>💡 All competitive intelligence sourced from public information and official documentation.</em></p>
-                </div>"""
+        html += f"""
+                    <tr>
+                        <td><strong>{scm['scm']}</strong></td>
+                        <td>{scm['plan']}</td>
+                        <td class="feature-list">{unsupported}</td>
+                    </tr>"""
+    
+    html += """
+                </table>
+            </div>
             
-            html += "</div>"  # Close competitor analysis div
+            <div class="info" style="margin-top: 30px;">
+                <p><strong>Legend:</strong>
+                <span class="maturity-badge maturity-ga">GA</span> Generally Available &nbsp;
+                <span class="maturity-badge maturity-beta">Beta</span> Beta Release &nbsp;
+                <span class="maturity-badge maturity-experimental">Exp</span> Experimental
+                </p>
+            </div>"""
+    
+    # Add competitive analysis section if available
+    if matrix.get("competitive_analysis"):
+        html += """
+            <h2>🥊 Competitive Intelligence Analysis</h2>
+            <div class="info">
+                <p><strong>Analysis Focus:</strong> """ + (matrix.get("analysis_focus", "all").replace("_", " ").title()) + """</p>
+                <p>Comparing Semgrep's capabilities against selected competitors for the languages specified above.</p>
+            </div>"""
+        
+        for analysis in matrix["competitive_analysis"]:
+            html += _cached_section("competitor_analysis", analysis, _render_competitor_analysis)
     
     # Add ROI analysis section if available
     if matrix.get("roi_analysis"):
@@ -1231,186 +904,204 @@ def save_matrix_as_html(matrix, output_file):
     </body>
     </html>
     """
-    with open(output_file, 'w') as f:
-        f.write(html)
-    print(f"Matrix saved to {output_file}")
+    return html
 
-@app.route('/', methods=['GET', 'POST'])
-def index():
-    result = None
-    error = None
-    customer_name = ""
-    generated_at = ""
-    all_languages = load_languages()
-    all_scms = load_scms()
+def save_matrix_as_html(matrix, output_file):
+    _write_report_file(output_file, render_matrix_html(matrix))
+
+def _ignore_progress(stage, **data):
+    pass
+
+def generate_report(report_request, progress=_ignore_progress):
+    """Build the matrix for one form submission and render both report formats.
     
-    # Load available competitors
-    available_competitors = []
-    if COMPETITIVE_ANALYSIS_AVAILABLE:
+    progress(stage, **data) is called as each stage finishes: catalog,
+    competitor (once per competitor), roi, html and csv.
+    """
+    # Taken before any data is read, so a concurrent update makes the
+    # report look stale rather than current
+    dependencies = report_dependencies(report_request)
+    catalog = load_catalog()
+    all_scms = catalog.scms
+    customer_name = report_request['customer_name']
+    languages = report_request['languages']
+    selected_competitors = report_request['competitors']
+    roi_data = report_request['roi_data']
+    # Create scm_plan_pairs in the expected format
+    scm_plan_pairs = [{"scm": report_request['scm'], "plan": report_request['plan']}]
+    # Build the matrix from the JSON data
+    selected_languages = []
+    for lang_name in languages:
+        lang_info = catalog.get_language_info(lang_name)
+        if lang_info:
+            selected_languages.append(lang_info)
+        else:
+            selected_languages.append({
+                "language": lang_name,
+                "maturity": "N/A",
+                "milan_comments": "Not currently supported by Semgrep."
+            })
+    selected_scms = []
+    for pair in scm_plan_pairs:
+        scm_name = pair.get('scm')
+        plan = pair.get('plan')
+        scm_info = next((s for s in all_scms if s['scm'] == scm_name), None)
+        if scm_info and plan in scm_info['plans']:
+            unsupported = scm_info['unsupported_features_by_plan'].get(plan, "")
+            selected_scms.append({
+                "scm": scm_name,
+                "plan": plan,
+                "unsupported_features": unsupported
+            })
+        else:
+            selected_scms.append({
+                "scm": scm_name,
+                "plan": plan,
+                "unsupported_features": "Not currently supported by Semgrep."
+            })
+    language_weights = report_request.get('language_weights') or {lang.lower(): 1.0 for lang in languages}
+    competitor_languages = {}
+    if selected_competitors and COMPETITIVE_ANALYSIS_AVAILABLE:
+        # Unknown or rejected competitors are left out; the analysis step reports them
+        competitor_languages = get_engine().competitor_languages(selected_competitors)
+    language_coverage = compute_language_coverage(language_weights, catalog.languages, competitor_languages,
+                                                  weighted=bool(report_request.get('language_weights')))
+    progress('catalog',
+             languages=[lang.get('language') for lang in selected_languages],
+             unsupported=[lang['language'] for lang in selected_languages if lang.get('maturity') == 'N/A'])
+    # Generate competitive analysis if requested
+    competitive_analysis = None
+    if selected_competitors and COMPETITIVE_ANALYSIS_AVAILABLE:
         try:
-            engine = CompetitiveAnalysisEngine()
-            available_competitors = engine.get_available_competitors()
-        except Exception as e:
-            print(f"Error loading competitors: {e}")
-            available_competitors = []
-    
-    if request.method == 'POST':
-        customer_name = request.form.get('customer_name', '').strip()
-        languages_input = request.form.get('languages', '').strip()
-        scm = request.form.get('scm', '').strip()
-        plan = request.form.get('plan', '').strip()
-        
-        # Competitive intelligence options
-        include_competitive = request.form.get('include_competitive') == 'on'
-        selected_competitors = request.form.getlist('competitors') if include_competitive else []
-        analysis_focus = request.form.get('analysis_focus', 'all') if include_competitive else 'all'
-        
-        # ROI analysis options
-        include_roi = request.form.get('include_roi') == 'on'
-        roi_data = {}
-        if include_roi:
-            def safe_float(value_str, default_val):
-                """Safely convert string to float, preventing NaN injection"""
-                if value_str is None:
-                    return default_val
-                value_str = str(value_str).strip().lower()
-                if value_str in ['nan', 'inf', '-inf', 'infinity', '-infinity']:
-                    return default_val
-                try:
-                    result = float(value_str)
-                    if str(result).lower() in ['nan', 'inf', '-inf']:
-                        return default_val
-                    return result
-                except (ValueError, TypeError):
-                    return default_val
+            engine = get_engine()
+            entries = [None] * len(selected_competitors)
+            completed = 0
             
-            def safe_int(value_str, default_val):
-                """Safely convert string to int"""
-                if value_str is None:
-                    return default_val
-                try:
-                    return int(float(str(value_str).strip()))
-                except (ValueError, TypeError):
-                    return default_val
+            def record(index, competitor, entry):
+                nonlocal completed
+                completed += 1
+                entries[index] = entry
+                progress('competitor', competitor=competitor, completed=completed,
+                         total=len(selected_competitors), analysis=entry)
             
-            roi_data = {
-                'developer_count': safe_int(request.form.get('developer_count'), 50),
-                'hourly_cost': safe_float(request.form.get('hourly_cost'), 100.0),
-                'triage_time': safe_float(request.form.get('triage_time'), 0.5),
-                'other_findings_per_dev': safe_float(request.form.get('other_findings_per_dev'), 24.0),
-                'other_false_positive_rate': safe_float(request.form.get('other_false_positive_rate'), 50.0),
-                'semgrep_findings_per_dev': safe_float(request.form.get('semgrep_findings_per_dev'), 13.2),
-                'semgrep_false_positive_rate': safe_float(request.form.get('semgrep_false_positive_rate'), 25.0),
-                'semgrep_autotriage_rate': safe_float(request.form.get('semgrep_autotriage_rate'), 80.0)
-            }
-        
-        if not customer_name or not languages_input or not scm or not plan:
-            error = "All fields are required."
-        elif include_competitive and not selected_competitors:
-            error = "Please select at least one competitor for analysis."
-        else:
-            languages = [lang.strip() for lang in languages_input.split(",") if lang.strip()]
-            # Create scm_plan_pairs in the expected format
-            scm_plan_pairs = [{"scm": scm, "plan": plan}]
-            # Build the matrix from the JSON data
-            selected_languages = []
-            for lang_name in languages:
-                lang_info = get_language_info(lang_name, all_languages)
-                if lang_info:
-                    selected_languages.append(lang_info)
-                else:
-                    selected_languages.append({
-                        "language": lang_name,
-                        "maturity": "N/A",
-                        "milan_comments": "Not currently supported by Semgrep."
-                    })
-            selected_scms = []
-            for pair in scm_plan_pairs:
-                scm_name = pair.get('scm')
-                plan = pair.get('plan')
-                scm_info = next((s for s in all_scms if s['scm'] == scm_name), None)
-                if scm_info and plan in scm_info['plans']:
-                    unsupported = scm_info['unsupported_features_by_plan'].get(plan, "")
-                    selected_scms.append({
-                        "scm": scm_name,
-                        "plan": plan,
-                        "unsupported_features": unsupported
-                    })
+            # Precomputed analyses are used as-is; only the rest reach the engine
+            materialized = get_materialized()
+            pending = []
+            for index, competitor in enumerate(selected_competitors):
+                entry = materialized.get(engine, competitor, languages)
+                if entry is None:
+                    pending.append(index)
                 else:
-                    selected_scms.append({
-                        "scm": scm_name,
-                        "plan": plan,
-                        "unsupported_features": "Not currently supported by Semgrep."
-                    })
-            # Generate competitive analysis if requested
-            competitive_analysis = None
-            if include_competitive and selected_competitors and COMPETITIVE_ANALYSIS_AVAILABLE:
-                try:
-                    engine = CompetitiveAnalysisEngine()
-                    competitive_analysis = []
-                    for competitor in selected_competitors:
-                        analysis = engine.analyze_competitor(competitor, languages)
-                        competitive_analysis.append({
-                            'competitor_name': analysis.competitor_name,
-                            'overall_assessment': analysis.overall_assessment.value,
-                            'capability_comparisons': [
-                                {
-                                    'capability': cap.capability,
-                                    'semgrep_status': cap.semgrep_status,
-                                    'competitor_status': cap.competitor_status,
-                                    'result': cap.result.value,
-                                    'notes': cap.notes,
-                                    'importance': cap.importance
-                                }
-                                for cap in analysis.capability_comparisons
-                            ],
-                            'language_comparisons': [
-                                {
-                                    'language': lang.language,
-                                    'semgrep_support': lang.semgrep_support,
-                                    'competitor_support': lang.competitor_support,
-                                    'result': lang.result.value
-                                }
-                                for lang in analysis.language_comparisons
-                            ],
-                            'sales_talking_points': analysis.sales_talking_points,
-                            'data_sources': engine.get_competitor_summary(competitor).get('data_sources', [])
-                        })
-                except Exception as e:
-                    print(f"Error generating competitive analysis: {e}")
-                    competitive_analysis = None
+                    record(index, competitor, entry)
             
-            # Generate ROI analysis if requested
-            roi_analysis = None
-            if include_roi and roi_data:
-                try:
-                    roi_analysis = calculate_roi_analysis(roi_data)
-                except Exception as e:
-                    print(f"Error generating ROI analysis: {e}")
-                    roi_analysis = None
+            def record_analysis(position, competitor, analysis):
+                entry = None
+                if analysis is not None:
+                    entry = analysis_to_dict(
+                        analysis, engine.get_competitor_summary(competitor).get('data_sources', []))
+                record(pending[position], competitor, entry)
             
-            matrix = {
-                "generated_at": datetime.now().isoformat(),
-                "customer_name": customer_name,
-                "languages": selected_languages,
-                "scms": selected_scms,
-                "competitive_analysis": competitive_analysis,
-                "analysis_focus": analysis_focus if include_competitive else None,
-                "roi_analysis": roi_analysis
-            }
-            generated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
-            os.makedirs(output_dir, exist_ok=True)
-            safe_customer_name = secure_filename(customer_name) or "unknown"
-            html_file = os.path.join(output_dir, f"{safe_customer_name}_matrix.html")
-            csv_file = os.path.join(output_dir, f"{safe_customer_name}_matrix.csv")
-            save_matrix_as_html(matrix, html_file)
-            save_matrix_as_csv(matrix, csv_file)
-            result = True
+            # Competitors are analyzed concurrently; entries keep selection order
+            if pending:
+                _analysis_executor.analyze(engine, [selected_competitors[i] for i in pending], languages,
+                                           on_result=record_analysis)
+            competitive_analysis = [entry for entry in entries if entry is not None]
+        except Exception as e:
+            print(f"Error generating competitive analysis: {e}")
+            competitive_analysis = None
+    
+    # Generate ROI analysis if requested
+    roi_analysis = None
+    if roi_data:
+        try:
+            roi_analysis = calculate_roi_analysis(roi_data)
+        except Exception as e:
+            print(f"Error generating ROI analysis: {e}")
+            roi_analysis = None
+        progress('roi', roi_analysis=roi_analysis)
+    
+    matrix = {
+        "generated_at": datetime.now().isoformat(),
+        "customer_name": customer_name,
+        "languages": selected_languages,
+        "scms": selected_scms,
+        "language_coverage": language_coverage,
+        "competitive_analysis": competitive_analysis,
+        "analysis_focus": report_request['analysis_focus'],
+        "roi_analysis": roi_analysis
+    }
+    html = render_matrix_html(matrix)
+    progress('html', bytes=len(html))
+    csv_text = render_matrix_csv(matrix)
+    progress('csv', bytes=len(csv_text))
+    return {
+        "customer_name": customer_name,
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "html": html,
+        "csv": csv_text,
+        "etag": content_etag(html.encode('utf-8')),
+        "request": report_request,
+        "dependencies": dependencies
+    }
+
+def report_dependencies(report_request):
+    """Fingerprints of the catalog records and competitor files a report reads."""
+    dependencies = catalog_dependencies(load_catalog(), report_request['languages'], [report_request['scm']])
+    if report_request['competitors'] and COMPETITIVE_ANALYSIS_AVAILABLE:
+        engine = get_engine()
+        for competitor in report_request['competitors']:
+            dependencies.update(engine.analysis_dependencies(competitor))
+    return dependencies
+
+def get_report(report_request, progress=_ignore_progress):
+    """Return the report for a request, coalescing identical concurrent requests.
+    
+    The first request for a given input computes the report; concurrent
+    duplicates wait for it and the result is stored in the shared cache.
+    The key includes fingerprints of exactly the catalog records and
+    competitor files the report reads, so a data update never serves a
+    stale report and leaves unrelated reports cached. Only the computing
+    request reports progress stages, and only it takes an admission slot,
+    so it alone can raise AdmissionRejected (its followers see the same error).
+    """
+    key = make_cache_key('report', report_dependencies(report_request), report_request)
+    
+    def admitted_generate():
+        # Only the computing request takes a generation slot; duplicates just wait for it
+        with _admission.slot():
+            return generate_report(report_request, progress)
+    
+    return _report_flight.do(key, admitted_generate, cache=get_cache())
+
+def content_etag(body):
+    """Strong validator for a rendered artifact."""
+    return hashlib.sha256(body).hexdigest()[:32]
+
+def write_report_files(report, output_dir=OUTPUT_DIR):
+    """Write a rendered report to output_dir (output/ by default) and return the HTML and CSV paths.
+    
+    The HTML is also kept in the preview cache for the iframe that follows,
+    and a manifest of the report's inputs and dependencies lets
+    incremental_rebuild.py regenerate it when its sources change.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    safe_customer_name = secure_filename(report["customer_name"]) or "unknown"
+    html_file = os.path.join(output_dir, f"{safe_customer_name}_matrix.html")
+    csv_file = os.path.join(output_dir, f"{safe_customer_name}_matrix.csv")
+    _write_report_file(html_file, report["html"])
+    _write_report_file(csv_file, report["csv"])
+    write_manifest(html_file, report["request"], report["dependencies"])
+    _preview_cache.set(artifact_id(html_file), (report["etag"], report["html"].encode('utf-8')))
+    return html_file, csv_file
+
+def render_languages_table(catalog):
+    """Render the supported-languages reference rows, once per catalog version."""
+    cached = _languages_table_cache.get(catalog.version)
+    if cached is not None:
+        return cached
     
-    # Build the languages table for the form
     languages_table = ""
-    for lang in all_languages:
+    for lang in catalog.languages:
         if lang.get('semgrep_docs'):
             docs = lang.get('semgrep_docs', {})
             maturity = docs.get('maturity', '').lower()
@@ -1418,7 +1109,7 @@ def index():
             row_class = maturity
             
             languages_table += f"""
-                        <tr class="{row_class}">
+                        <tr class="{row_class}" data-language="{lang['language']}">
                             <td class="lang-col"><strong>{docs.get('language', '')}</strong></td>
                             <td class="maturity-col"><span class="maturity-badge {maturity_class}">{docs.get('maturity', '')}</span></td>
                             <td class="dataflow-col">{docs.get('dataflow', '-') if docs.get('dataflow') else '-'}</td>
@@ -1431,9 +1122,182 @@ def index():
                             <td class="yn-col {'yes' if docs.get('scan_without_lockfiles') else 'no'}">{'✅' if docs.get('scan_without_lockfiles') else '❌'}</td>
                         </tr>"""
     
+    _languages_table_cache.clear()
+    _languages_table_cache[catalog.version] = languages_table
+    return languages_table
+
+def busy_response(rejection):
+    """Fast 503 for requests turned away by admission control."""
+    message = "The matrix generator is busy right now. Please try again in a few seconds."
+    response = app.make_response((render_template('error.html', message=message), 503))
+    response.headers['Retry-After'] = str(rejection.retry_after)
+    return response
+
+def resolve_language_names(names, language_weights=None):
+    """Map typed language names to canonical ones; return (names, weights, notes).
+    
+    Lockfiles and package managers ("poetry.lock", "pnpm") stand for the
+    languages that use them. Typos and aliases ("Javascipt", "golang",
+    "c++") resolve to the catalog spelling; names resolving to the same
+    language are merged. Each note describes one interpretation or a
+    suggestion for a name left as typed.
+    """
+    catalog = load_catalog()
+    resolver = get_language_resolver(catalog, get_engine() if COMPETITIVE_ANALYSIS_AVAILABLE else None)
+    lockfiles = get_lockfile_index(catalog)
+    
+    def canonical_names(name):
+        """Languages a name stands for, and a note if it was not an exact language name."""
+        match = lockfiles.match(name)
+        if match.entries:
+            return match.languages, f"Interpreted \"{name}\" as {', '.join(match.languages)}"
+        resolution = resolver.resolve(name)
+        if resolution.method in ('alias', 'part', 'fuzzy'):
+            return [resolution.language], f"Interpreted \"{name}\" as {resolution.language}"
+        if resolution.method == 'unresolved' and resolution.suggestions:
+            return [name], f"Unknown language \"{name}\"; did you mean {' or '.join(resolution.suggestions)}?"
+        return [resolution.language or name], None
+    
+    resolved_names = []
+    resolved_weights = None
+    notes = []
+    for name in names:
+        canonical, note = canonical_names(name)
+        if note:
+            notes.append(note)
+        for language in canonical:
+            if language.lower() not in (resolved.lower() for resolved in resolved_names):
+                resolved_names.append(language)
+    if language_weights is not None:
+        resolved_weights = {}
+        for name, weight in language_weights.items():
+            # A lockfile shared by several languages splits its weight evenly
+            canonical = canonical_names(name)[0]
+            for language in canonical:
+                key = language.lower()
+                resolved_weights[key] = resolved_weights.get(key, 0.0) + weight / len(canonical)
+    return resolved_names, resolved_weights, notes
+
+def parse_report_request(form):
+    """Validate submitted form fields; return (report_request, error, language_notes)."""
+    customer_name = form.get('customer_name', '').strip()
+    languages_input = form.get('languages', '').strip()
+    scm = form.get('scm', '').strip()
+    plan = form.get('plan', '').strip()
+    
+    # Competitive intelligence options
+    include_competitive = form.get('include_competitive') == 'on'
+    selected_competitors = form.getlist('competitors') if include_competitive else []
+    analysis_focus = form.get('analysis_focus', 'all') if include_competitive else 'all'
+    
+    # ROI analysis options
+    include_roi = form.get('include_roi') == 'on'
+    roi_data = {}
+    if include_roi:
+        def safe_float(value_str, default_val):
+            """Safely convert string to float, preventing NaN injection"""
+            if value_str is None:
+                return default_val
+            value_str = str(value_str).strip().lower()
+            if value_str in ['nan', 'inf', '-inf', 'infinity', '-infinity']:
+                return default_val
+            try:
+                result = float(value_str)
+                if str(result).lower() in ['nan', 'inf', '-inf']:
+                    return default_val
+                return result
+            except (ValueError, TypeError):
+                return default_val
+        
+        def safe_int(value_str, default_val):
+            """Safely convert string to int"""
+            if value_str is None:
+                return default_val
+            try:
+                return int(float(str(value_str).strip()))
+            except (ValueError, TypeError):
+                return default_val
+        
+        roi_data = {
+            'developer_count': safe_int(form.get('developer_count'), 50),
+            'hourly_cost': safe_float(form.get('hourly_cost'), 100.0),
+            'triage_time': safe_float(form.get('triage_time'), 0.5),
+            'other_findings_per_dev': safe_float(form.get('other_findings_per_dev'), 24.0),
+            'other_false_positive_rate': safe_float(form.get('other_false_positive_rate'), 50.0),
+            'semgrep_findings_per_dev': safe_float(form.get('semgrep_findings_per_dev'), 13.2),
+            'semgrep_false_positive_rate': safe_float(form.get('semgrep_false_positive_rate'), 25.0),
+            'semgrep_autotriage_rate': safe_float(form.get('semgrep_autotriage_rate'), 80.0)
+        }
+    
+    if not customer_name or not languages_input or not scm or not plan:
+        return None, "All fields are required.", []
+    try:
+        language_weights = parse_language_weights(languages_input)
+    except ValueError as e:
+        return None, str(e), []
+    if include_competitive and not selected_competitors:
+        return None, "Please select at least one competitor for analysis.", []
+    languages, language_weights, language_notes = resolve_language_names(
+        [token.partition(':')[0].strip() for token in languages_input.split(",") if token.partition(':')[0].strip()],
+        language_weights
+    )
+    return {
+        'customer_name': customer_name,
+        'languages': languages,
+        # Lines of code or repo counts per language ("python:120000"); None
+        # when no weights were given and every language counts once
+        'language_weights': language_weights if ':' in languages_input else None,
+        'scm': scm,
+        'plan': plan,
+        'competitors': selected_competitors,
+        'analysis_focus': analysis_focus if include_competitive else None,
+        'roi_data': roi_data if include_roi else None
+    }, None, language_notes
+
+@app.route('/', methods=['GET', 'POST'])
+def index():
+    result = None
+    error = None
+    customer_name = ""
+    generated_at = ""
+    catalog = load_catalog()
+    
+    # Load available competitors
+    available_competitors = []
+    if COMPETITIVE_ANALYSIS_AVAILABLE:
+        try:
+            engine = get_engine()
+            available_competitors = engine.get_available_competitors()
+        except Exception as e:
+            print(f"Error loading competitors: {e}")
+            available_competitors = []
+    
+    language_notes = []
+    if request.method == 'POST':
+        customer_name = request.form.get('customer_name', '').strip()
+        report_request, error, language_notes = parse_report_request(request.form)
+        if report_request:
+            try:
+                report = get_report(report_request)
+                write_report_files(report)
+            except AdmissionRejected as e:
+                return busy_response(e)
+            generated_at = report["generated_at"]
+            preview_version = report["etag"]
+            result = True
+    
+    languages_table = render_languages_table(catalog)
+    autocomplete_version = autocomplete_index().version
+    
     # Show error if present
     error_html = f'<div class="error">{error}</div>' if error else ''
     
+    # Corrections made to typed language names
+    notes_html = ""
+    if language_notes:
+        notes_html = '<ul class="language-notes">' + ''.join(
+            f'<li>{escape(note)}</li>' for note in language_notes) + '</ul>'
+    
     # Show result section if matrix was generated
     result_html = ""
     if result:
@@ -1442,13 +1306,13 @@ def index():
         <h2>Matrix Generated!</h2>
         <p>Customer: {customer_name}</p>
         <p>Generated on: {generated_at}</p>
-        
+        {notes_html}
         <div class="download-links">
             <a href="/download/html?customer_name={customer_name}">Download HTML Report</a>
             <a href="/download/csv?customer_name={customer_name}">Download CSV Report</a>
         </div>
         
-        <iframe src="/preview?customer_name={customer_name}" width="100%" height="800px" style="border: 1px solid #ddd; margin-top: 20px; border-radius: 8px; box-shadow: 0 4px 12px rgba(0,0,0,0.15);"></iframe>
+        <iframe src="/preview?customer_name={customer_name}&v={preview_version}" width="100%" height="800px" style="border: 1px solid #ddd; margin-top: 20px; border-radius: 8px; box-shadow: 0 4px 12px rgba(0,0,0,0.15);"></iframe>
     </div>"""
     
     # Generate the complete HTML
@@ -1554,6 +1418,48 @@ def index():
             font-weight: bold;
             margin-bottom: 20px;
         }}
+        .progress-log {{
+            list-style: none;
+            padding-left: 0;
+            margin: 10px 0 0 0;
+        }}
+        .progress-log li {{
+            padding: 4px 0;
+        }}
+        .language-notes {{
+            color: #8a6d3b;
+            padding-left: 20px;
+        }}
+        .suggestion-list {{
+            list-style: none;
+            margin: 0;
+            padding: 0;
+            border: 1px solid #ddd;
+            border-top: none;
+            background: white;
+            max-width: 400px;
+        }}
+        .suggestion-list:empty {{
+            display: none;
+        }}
+        .suggestion-list li {{
+            padding: 4px 8px;
+            cursor: pointer;
+        }}
+        .suggestion-list li:hover {{
+            background-color: #e9f2fb;
+        }}
+        .suggestion-list small {{
+            color: #888;
+            margin-left: 6px;
+        }}
+        .ranking-list {{
+            margin: 5px 0 0 0;
+            padding-left: 20px;
+        }}
+        .ranking-list li {{
+            padding: 2px 0;
+        }}
         .table-container {{
             width: 100%;
             overflow-x: auto;
@@ -1647,7 +1553,7 @@ def index():
 
     {error_html}
 
-    <form method="post" action="/">
+    <form id="matrix-form" method="post" action="/">
         <div class="form-group">
             <label for="customer_name">Customer Name:</label>
             <input type="text" id="customer_name" name="customer_name" required>
@@ -1655,12 +1561,21 @@ def index():
         
         <div class="form-group">
             <label for="languages">Languages (comma-separated):</label>
-            <input type="text" id="languages" name="languages" placeholder="e.g., python, java, javascript" required>
+            <input type="text" id="languages" name="languages" placeholder="e.g., python, java, javascript" autocomplete="off" required>
+            <ul id="language-suggestions" class="suggestion-list"></ul>
+            <small style="color: #666; display: block; margin-top: 5px;">
+                Optionally weight each language by lines of code or repo count, e.g. python:120000, java:40000, to see how much of the codebase each scanner covers.
+                Lockfiles and package managers work too: poetry.lock, pnpm-lock.yaml, gradle.lockfile.
+            </small>
             
             <button type="button" class="collapsible">View Supported Languages</button>
             <div class="content">
+                <input type="text" id="capability-query" placeholder="Filter by capability, e.g. ga and cross-file and reachability and not lockfileless" autocomplete="off">
+                <small id="capability-status" style="color: #666; display: block; margin: 5px 0 10px 0;">
+                    Terms: ga, beta, experimental, cross-file, cross-function, reachability, licenses, malicious, lockfileless, frameworks; combine with and, or, not and parentheses.
+                </small>
                 <div class="table-container">
-                    <table class="matrix-table">
+                    <table class="matrix-table" id="languages-table">
                         <tr>
                             <th class="lang-col">Languages</th>
                             <th class="maturity-col">Maturity</th>
@@ -1685,10 +1600,6 @@ def index():
                 <div class="field-half">
                     <select id="scm" name="scm" required onchange="updatePlans()">
                         <option value="">Select SCM...</option>
-                        <option value="GitHub">GitHub</option>
-                        <option value="GitLab">GitLab</option>
-                        <option value="Bitbucket">Bitbucket</option>
-                        <option value="Azure DevOps">Azure DevOps</option>
                     </select>
                 </div>
                 <div class="field-half">
@@ -1700,27 +1611,11 @@ def index():
             
             <button type="button" class="collapsible">View Supported SCMs</button>
             <div class="content">
-                <table class="language-table">
+                <table class="language-table" id="scm-table">
                     <tr>
                         <th>SCM</th>
                         <th>Available Plans</th>
                     </tr>
-                    <tr>
-                        <td>GitHub</td>
-                        <td>GitHub Free, GitHub Pro, GitHub Team, GitHub Enterprise Cloud, GitHub Enterprise Server</td>
-                    </tr>
-                    <tr>
-                        <td>GitLab</td>
-                        <td>GitLab Free, GitLab Premium, GitLab Ultimate, GitLab Dedicated / Dedicated for Government, GitLab Self-Managed Free, GitLab Self-Managed Premium, GitLab Self-Managed Ultimate</td>
-                    </tr>
-                    <tr>
-                        <td>Bitbucket</td>
-                        <td>Bitbucket Cloud Free, Bitbucket Cloud Standard, Bitbucket Cloud Premium, Bitbucket Data Center</td>
-                    </tr>
-                    <tr>
-                        <td>Azure DevOps</td>
-                        <td>Azure DevOps Cloud, Azure DevOps Server</td>
-                    </tr>
                 </table>
             </div>
         </div>
@@ -1743,6 +1638,14 @@ def index():
                 </div>
             </div>
             
+            <div class="form-group">
+                <label>Closest Competitors for These Languages:</label>
+                <ol id="competitor-ranking" class="ranking-list"></ol>
+                <small style="color: #666; display: block; margin-top: 5px;">
+                    Semgrep's net advantage from -1 to 1, weighting capabilities by importance and languages by priority (e.g. python:3, java:1).
+                </small>
+            </div>
+            
             <div class="form-group">
                 <label for="analysis_focus">Analysis Focus:</label>
                 <select id="analysis_focus" name="analysis_focus">
@@ -1814,6 +1717,7 @@ def index():
         <button type="submit">Generate Matrix</button>
     </form>
     
+    <div id="live-result"></div>
     {result_html}
     
     <script>
@@ -1830,12 +1734,36 @@ def index():
             }});
         }}
         
-        var scmPlans = {{
-            "GitHub": ["GitHub Free", "GitHub Pro", "GitHub Team", "GitHub Enterprise Cloud", "GitHub Enterprise Server"],
-            "GitLab": ["GitLab Free", "GitLab Premium", "GitLab Ultimate", "GitLab Dedicated / Dedicated for Government", "GitLab Self-Managed Free", "GitLab Self-Managed Premium", "GitLab Self-Managed Ultimate"],
-            "Bitbucket": ["Bitbucket Cloud Free", "Bitbucket Cloud Standard", "Bitbucket Cloud Premium", "Bitbucket Data Center"],
-            "Azure DevOps": ["Azure DevOps Cloud", "Azure DevOps Server"]
-        }};
+        // SCMs and plans come from the catalog API; the version lets the
+        // browser reuse its copy until scms.json changes
+        var catalogVersion = "{catalog.version}";
+        var scmPlans = {{}};
+        
+        function loadScms() {{
+            if (!window.fetch) {{
+                return;
+            }}
+            fetch("/api/catalog/scms?v=" + encodeURIComponent(catalogVersion))
+                .then(function(response) {{ return response.json(); }})
+                .then(function(scms) {{
+                    var scmSelect = document.getElementById("scm");
+                    var table = document.getElementById("scm-table");
+                    scms.forEach(function(scm) {{
+                        scmPlans[scm.scm] = scm.plans;
+                        var option = document.createElement("option");
+                        option.value = scm.scm;
+                        option.text = scm.scm;
+                        scmSelect.appendChild(option);
+                        var row = table.insertRow(-1);
+                        row.insertCell(-1).textContent = scm.scm;
+                        row.insertCell(-1).textContent = scm.plans.join(", ");
+                    }});
+                    updatePlans();
+                }})
+                .catch(function() {{}});
+        }}
+        
+        loadScms();
         
         function updatePlans() {{
             var scmSelect = document.getElementById("scm");
@@ -1867,11 +1795,180 @@ def index():
             
             if (checkbox.checked) {{
                 options.style.display = 'block';
+                refreshRanking();
             }} else {{
                 options.style.display = 'none';
             }}
         }}
         
+        // Re-rank competitors as the languages change; only the latest
+        // response is shown
+        var rankingTimer = null;
+        var rankingRequest = 0;
+        
+        function formatScore(value) {{
+            return (value > 0 ? "+" : "") + value.toFixed(2);
+        }}
+        
+        function refreshRanking() {{
+            var list = document.getElementById("competitor-ranking");
+            if (!list || !window.fetch || !window.URLSearchParams || !document.getElementById("include_competitive").checked) {{
+                return;
+            }}
+            clearTimeout(rankingTimer);
+            rankingTimer = setTimeout(function() {{
+                var requestId = ++rankingRequest;
+                var params = new URLSearchParams({{languages: document.getElementById("languages").value, k: "3"}});
+                fetch("/api/competitor-ranking?" + params.toString())
+                    .then(function(response) {{ return response.json(); }})
+                    .then(function(data) {{
+                        if (requestId !== rankingRequest) {{
+                            return;
+                        }}
+                        list.innerHTML = "";
+                        if (data.error) {{
+                            var message = document.createElement("li");
+                            message.textContent = data.error;
+                            list.appendChild(message);
+                            return;
+                        }}
+                        data.ranking.forEach(function(entry) {{
+                            var item = document.createElement("li");
+                            item.textContent = entry.competitor_name + ": " + formatScore(entry.score) +
+                                " (capabilities " + formatScore(entry.contributions.capabilities) +
+                                ", languages " + formatScore(entry.contributions.languages) + ")";
+                            list.appendChild(item);
+                        }});
+                    }})
+                    .catch(function() {{}});
+            }}, 150);
+        }}
+        
+        document.getElementById("languages").addEventListener("input", refreshRanking);
+        
+        // Filter the supported-languages table by a capability query
+        var capabilityTimer = null;
+        var capabilityRequest = 0;
+        
+        function filterLanguagesTable() {{
+            if (!window.fetch || !window.URLSearchParams) {{
+                return;
+            }}
+            clearTimeout(capabilityTimer);
+            capabilityTimer = setTimeout(function() {{
+                var requestId = ++capabilityRequest;
+                var query = document.getElementById("capability-query").value;
+                var status = document.getElementById("capability-status");
+                var params = new URLSearchParams({{q: query, v: catalogVersion}});
+                fetch("/api/capabilities?" + params.toString())
+                    .then(function(response) {{ return response.json(); }})
+                    .then(function(data) {{
+                        if (requestId !== capabilityRequest) {{
+                            return;
+                        }}
+                        if (data.error) {{
+                            status.textContent = data.error;
+                            return;
+                        }}
+                        var matches = {{}};
+                        data.languages.forEach(function(name) {{ matches[name] = true; }});
+                        var rows = document.querySelectorAll("#languages-table tr[data-language]");
+                        for (var i = 0; i < rows.length; i++) {{
+                            rows[i].style.display = matches[rows[i].getAttribute("data-language")] ? "" : "none";
+                        }}
+                        status.textContent = query.trim()
+                            ? data.languages.length + " of " + data.total + " languages match"
+                            : "";
+                    }})
+                    .catch(function() {{}});
+            }}, 150);
+        }}
+        
+        document.getElementById("capability-query").addEventListener("input", filterLanguagesTable);
+        
+        // Complete the language being typed (the text after the last comma);
+        // the version pins responses the browser may cache
+        var autocompleteVersion = "{autocomplete_version}";
+        var kindLabels = {{
+            "competitor_language": "competitor language",
+            "alias": "alias",
+            "framework": "framework",
+            "package_manager": "package manager",
+            "lockfile": "lockfile"
+        }};
+        var suggestTimer = null;
+        var suggestRequest = 0;
+        
+        function currentLanguageToken(value) {{
+            return value.slice(value.lastIndexOf(",") + 1).split(":")[0].trim();
+        }}
+        
+        function chooseSuggestion(input, language) {{
+            var start = input.value.lastIndexOf(",") + 1;
+            var token = input.value.slice(start);
+            var weight = token.indexOf(":") >= 0 ? token.slice(token.indexOf(":")).trim() : "";
+            input.value = input.value.slice(0, start) + (start ? " " : "") + language + weight + ", ";
+            document.getElementById("language-suggestions").innerHTML = "";
+            input.focus();
+            refreshRanking();
+        }}
+        
+        function refreshSuggestions() {{
+            var input = document.getElementById("languages");
+            var list = document.getElementById("language-suggestions");
+            if (!window.fetch || !window.URLSearchParams) {{
+                return;
+            }}
+            clearTimeout(suggestTimer);
+            var prefix = currentLanguageToken(input.value);
+            if (!prefix) {{
+                suggestRequest++;
+                list.innerHTML = "";
+                return;
+            }}
+            suggestTimer = setTimeout(function() {{
+                var requestId = ++suggestRequest;
+                var params = new URLSearchParams({{q: prefix, v: autocompleteVersion}});
+                fetch("/api/autocomplete?" + params.toString())
+                    .then(function(response) {{ return response.json(); }})
+                    .then(function(data) {{
+                        if (requestId !== suggestRequest) {{
+                            return;
+                        }}
+                        list.innerHTML = "";
+                        data.completions.forEach(function(completion) {{
+                            var item = document.createElement("li");
+                            item.textContent = completion.text === completion.language
+                                ? completion.text : completion.text + " → " + completion.language;
+                            if (kindLabels[completion.kind]) {{
+                                var kind = document.createElement("small");
+                                kind.textContent = kindLabels[completion.kind];
+                                item.appendChild(kind);
+                            }}
+                            // mousedown fires before the input loses focus
+                            item.addEventListener("mousedown", function(e) {{
+                                e.preventDefault();
+                                chooseSuggestion(input, completion.language);
+                            }});
+                            list.appendChild(item);
+                        }});
+                    }})
+                    .catch(function() {{}});
+            }}, 80);
+        }}
+        
+        document.getElementById("languages").addEventListener("input", refreshSuggestions);
+        document.getElementById("languages").addEventListener("blur", function() {{
+            suggestRequest++;
+            document.getElementById("language-suggestions").innerHTML = "";
+        }});
+        document.getElementById("languages").addEventListener("keydown", function(e) {{
+            if (e.key === "Escape") {{
+                suggestRequest++;
+                document.getElementById("language-suggestions").innerHTML = "";
+            }}
+        }});
+        
         function toggleROIOptions() {{
             var checkbox = document.getElementById('include_roi');
             var options = document.getElementById('roi-options');
@@ -1882,26 +1979,247 @@ def index():
                 options.style.display = 'none';
             }}
         }}
+        
+        // Stream generation progress over Server-Sent Events; browsers
+        // without EventSource fall back to the plain form POST
+        var stageLabels = {{
+            "catalog": "Languages and SCM plan looked up",
+            "roi": "ROI analysis calculated",
+            "html": "HTML report rendered",
+            "csv": "CSV report rendered",
+            "saved": "Reports saved"
+        }};
+        
+        function addProgressLine(log, text, marker) {{
+            var item = document.createElement("li");
+            item.textContent = (marker || "✓") + " " + text;
+            log.appendChild(item);
+        }}
+        
+        function showGeneratedReport(panel, report) {{
+            panel.innerHTML = "";
+            var heading = document.createElement("h2");
+            heading.textContent = "Matrix Generated!";
+            var customer = document.createElement("p");
+            customer.textContent = "Customer: " + report.customer_name;
+            var generated = document.createElement("p");
+            generated.textContent = "Generated on: " + report.generated_at;
+            var links = document.createElement("div");
+            links.className = "download-links";
+            [["Download HTML Report", report.html_url], ["Download CSV Report", report.csv_url]].forEach(function(link) {{
+                var anchor = document.createElement("a");
+                anchor.textContent = link[0];
+                anchor.href = link[1];
+                links.appendChild(anchor);
+            }});
+            var preview = document.createElement("iframe");
+            preview.src = report.preview_url;
+            preview.width = "100%";
+            preview.height = "800px";
+            preview.style.cssText = "border: 1px solid #ddd; margin-top: 20px; border-radius: 8px; box-shadow: 0 4px 12px rgba(0,0,0,0.15);";
+            [heading, customer, generated, links, preview].forEach(function(node) {{ panel.appendChild(node); }});
+        }}
+        
+        document.getElementById("matrix-form").addEventListener("submit", function(event) {{
+            if (!window.EventSource || !window.URLSearchParams || !window.FormData) {{
+                return;
+            }}
+            event.preventDefault();
+            var form = this;
+            var params = new URLSearchParams(new FormData(form));
+            var panel = document.getElementById("live-result");
+            panel.className = "result";
+            panel.innerHTML = "<h2>Generating Matrix...</h2>";
+            var log = document.createElement("ul");
+            log.className = "progress-log";
+            panel.appendChild(log);
+            var received = false;
+            var source = new EventSource("/progress?" + params.toString());
+            
+            Object.keys(stageLabels).forEach(function(stage) {{
+                source.addEventListener(stage, function() {{
+                    received = true;
+                    addProgressLine(log, stageLabels[stage]);
+                }});
+            }});
+            source.addEventListener("resolved", function(e) {{
+                received = true;
+                JSON.parse(e.data).notes.forEach(function(note) {{
+                    addProgressLine(log, note, "↪");
+                }});
+            }});
+            source.addEventListener("competitor", function(e) {{
+                received = true;
+                var data = JSON.parse(e.data);
+                var outcome = data.analysis ? data.analysis.overall_assessment : "analysis unavailable";
+                addProgressLine(log, "Semgrep vs " + data.competitor + ": " + outcome +
+                    " (" + data.completed + "/" + data.total + ")");
+            }});
+            source.addEventListener("done", function(e) {{
+                source.close();
+                showGeneratedReport(panel, JSON.parse(e.data));
+            }});
+            source.addEventListener("failed", function(e) {{
+                source.close();
+                var data = JSON.parse(e.data);
+                var message = document.createElement("div");
+                message.className = "error";
+                message.textContent = data.retry_after
+                    ? "The matrix generator is busy right now. Please try again in " + data.retry_after + " seconds."
+                    : data.message;
+                panel.innerHTML = "";
+                panel.className = "";
+                panel.appendChild(message);
+            }});
+            source.onerror = function() {{
+                source.close();
+                panel.innerHTML = "";
+                panel.className = "";
+                if (!received) {{
+                    // Streaming unavailable (e.g. blocked by a proxy); submit normally
+                    form.submit();
+                    return;
+                }}
+                // The stream dropped part-way; clear the stale progress and let the user retry
+                var message = document.createElement("div");
+                message.className = "error";
+                message.textContent = "Lost the connection while generating the matrix. Please submit the form again.";
+                panel.appendChild(message);
+            }};
+        }});
     </script>
     </div>
 </body>
 </html>"""
     
-    from flask import Response
     return Response(html, mimetype='text/html')
 
+@app.route('/progress')
+def report_progress():
+    """Generate a report and stream each finished stage as Server-Sent Events.
+    
+    Takes the form fields as a query string because EventSource only issues
+    GET requests. No job state is kept on the server, so any worker can
+    serve the stream.
+    """
+    report_request, error, language_notes = parse_report_request(request.args)
+    
+    def task(progress):
+        if error:
+            raise ProgressError(error)
+        if language_notes:
+            progress('resolved', notes=language_notes)
+        report = get_report(report_request, progress)
+        write_report_files(report)
+        progress('saved')
+        query = urlencode({'customer_name': report['customer_name']})
+        return {
+            'customer_name': report['customer_name'],
+            'generated_at': report['generated_at'],
+            'html_url': f"/download/html?{query}",
+            'csv_url': f"/download/csv?{query}",
+            'preview_url': f"/preview?{query}&v={report['etag']}"
+        }
+    
+    return Response(
+        ProgressStream(task).events(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/competitor-ranking')
+def competitor_ranking():
+    """Rank competitors for weighted languages, e.g. ?languages=python:3,java&k=3."""
+    if not COMPETITIVE_ANALYSIS_AVAILABLE:
+        return jsonify({'error': 'Competitive analysis engine not available'}), 503
+    try:
+        language_weights = parse_language_weights(request.args.get('languages', ''))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    _, language_weights, _ = resolve_language_names(list(language_weights), language_weights)
+    top_k = request.args.get('k', type=int)
+    if top_k is not None and top_k < 1:
+        return jsonify({'error': 'k must be a positive integer'}), 400
+    ranking = rank_competitors(get_engine(), language_weights, top_k=top_k,
+                               competitors=request.args.getlist('competitors') or None)
+    return Response(encode_json({
+        'languages': language_weights,
+        'ranking': [asdict(score) for score in ranking]
+    }), mimetype='application/json')
+
+def autocomplete_index():
+    return get_autocomplete_index(load_catalog(), get_engine() if COMPETITIVE_ANALYSIS_AVAILABLE else None)
+
+@app.route('/api/autocomplete')
+def autocomplete():
+    """Ranked completions for a language, framework, package manager or lockfile prefix, e.g. ?q=jav.
+    
+    The page requests ?v=<index version>; a response for the current
+    version never changes, so browsers may reuse it until the data does.
+    """
+    index = autocomplete_index()
+    prefix = request.args.get('q', '')
+    limit = min(max(request.args.get('limit', AUTOCOMPLETE_LIMIT, type=int), 1), MAX_COMPLETIONS)
+    response = jsonify({
+        'query': prefix,
+        'version': index.version,
+        'completions': [asdict(completion) for completion in index.complete(prefix, limit)]
+    })
+    return versioned_response(response, f"{index.version}-{content_etag(f'{prefix}|{limit}'.encode('utf-8'))[:12]}",
+                              index.version)
+
+def versioned_response(response, etag, version):
+    """Add a strong ETag; let browsers reuse the response while ?v= names the current data version."""
+    response.set_etag(etag)
+    if request.args.get('v') == version:
+        response.headers['Cache-Control'] = 'public, max-age=86400'
+    else:
+        response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+@app.route('/api/capabilities')
+def capability_query():
+    """Catalog languages matching a capability query, e.g. ?q=ga and reachability and not lockfileless."""
+    catalog = load_catalog()
+    index = get_capability_index(catalog)
+    query = request.args.get('q', '')
+    try:
+        languages = index.query(query)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    response = jsonify({
+        'query': query,
+        'languages': languages,
+        'total': len(index.languages)
+    })
+    return versioned_response(response, f"{catalog.version}-{content_etag(query.encode('utf-8'))[:12]}",
+                              catalog.version)
+
+@app.route('/api/catalog/languages')
+def catalog_languages():
+    """languages.json as served from the catalog snapshot, serialized once per data version."""
+    catalog = load_catalog()
+    return versioned_response(Response(catalog.languages_json, mimetype='application/json'),
+                              catalog.languages_etag, catalog.version)
+
+@app.route('/api/catalog/scms')
+def catalog_scms():
+    """scms.json as served from the catalog snapshot; the form reads SCMs and plans from here."""
+    catalog = load_catalog()
+    return versioned_response(Response(catalog.scms_json, mimetype='application/json'),
+                              catalog.scms_etag, catalog.version)
+
 @app.route('/download/<filename>')
 def download_file(filename):
     customer_name = request.args.get('customer_name', 'unknown')
     safe_customer_name = secure_filename(customer_name) or "unknown"
-    output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
     if filename == 'html':
-        file_path = os.path.join(output_dir, f"{safe_customer_name}_matrix.html")
+        file_path = os.path.join(OUTPUT_DIR, f"{safe_customer_name}_matrix.html")
     elif filename == 'csv':
-        file_path = os.path.join(output_dir, f"{safe_customer_name}_matrix.csv")
+        file_path = os.path.join(OUTPUT_DIR, f"{safe_customer_name}_matrix.csv")
     else:
         return redirect(url_for('index'))
-    if not os.path.exists(file_path):
+    if not _retention.record_access(file_path):
         abort(404)
     return send_file(
         file_path,
@@ -1909,28 +2227,134 @@ def download_file(filename):
         download_name=os.path.basename(file_path)
     )
 
+@app.route('/metrics')
+def metrics():
+    """Report generation, coalescing and cache counters as JSON."""
+    cache = get_cache()
+    return jsonify({
+        'admission': _admission.stats(),
+        'single_flight': _report_flight.stats(),
+        'cache': cache.stats() if cache else None,
+        'retention': _retention.stats(),
+        'preview_cache': _preview_cache.stats(),
+        'materialized': get_materialized().stats() if COMPETITIVE_ANALYSIS_AVAILABLE else None
+    })
+
 @app.route('/preview')
 def preview_html():
     customer_name = request.args.get('customer_name', 'unknown')
     safe_customer_name = secure_filename(customer_name) or "unknown"
-    output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
-    html_file = os.path.join(output_dir, f"{safe_customer_name}_matrix.html")
-    if os.path.exists(html_file):
-        with open(html_file, 'r') as f:
-            return f.read()
-    else:
+    html_file = os.path.join(OUTPUT_DIR, f"{safe_customer_name}_matrix.html")
+    key = artifact_id(html_file)
+    if not _retention.record_access(html_file):
+        _preview_cache.delete(key)
         return '<html><body><h1>Preview not available</h1><p>File not found.</p></body></html>'
+    
+    # The result page pins the version it just generated (v=<etag>); another
+    # worker may have regenerated the same customer since this one cached it
+    cached = _preview_cache.get(key)
+    requested_version = request.args.get('v')
+    if cached is None or (requested_version and cached[0] != requested_version):
+        try:
+            with open(html_file, 'rb') as f:
+                body = f.read()
+        except FileNotFoundError:
+            return '<html><body><h1>Preview not available</h1><p>File not found.</p></body></html>'
+        cached = (content_etag(body), body)
+        _preview_cache.set(key, cached)
+    
+    etag, body = cached
+    response = Response(body, mimetype='text/html')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
 
-if __name__ == '__main__':
+def preload_shared_state():
+    """Load the catalog, competitor data and rendered fragments before workers fork."""
+    catalog = load_catalog()
+    render_languages_table(catalog)
+    app.jinja_env.get_template('error.html')
+    engine = get_engine()
+    competitors = engine.get_available_competitors() if engine else []
+    if engine:
+        engine.competitors.load_all()
+        # Loads the artifact for the current data, if one was materialized
+        get_materialized().get(engine, '', [])
+    get_language_resolver(catalog, engine)
+    autocomplete_index()
+    get_capability_index(catalog)
+    get_lockfile_index(catalog)
+    # Bring the optional SQLite catalog up to date once at boot; requests
+    # only read it (competitor languages), never sync or write it
     try:
-        import flask
-    except ImportError:
-        print("Flask is not installed. Installing...")
-        import subprocess
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "flask"])
+        get_catalog_db()
+    except sqlite3.Error as e:
+        print(f"Warning: Could not sync the SQLite catalog: {e}")
+    # Move everything loaded so far into the permanent GC generation so the
+    # collector never touches (and copies) these pages in forked workers
+    gc.collect()
+    gc.freeze()
+    print(f"Preloaded catalog {catalog.version} ({len(catalog.languages)} languages, "
+          f"{len(catalog.scms)} SCMs) and {len(competitors)} competitors")
+
+def run_warmup_self_test():
+    """Exercise the page, the analysis engine and both report writers once.
+    
+    Raises RuntimeError so a broken deployment fails at boot instead of on
+    the first customer request.
+    """
+    with app.test_client() as client:
+        response = client.get('/')
+        if response.status_code != 200:
+            raise RuntimeError(f"Self-test: GET / returned {response.status_code}")
+    
+    catalog = load_catalog()
+    if not all(catalog.get_language_info(name) for name in SELF_TEST_REQUEST['languages']):
+        raise RuntimeError("Self-test: sample languages missing from languages.json")
+    scm_info = catalog.get_scm_info(SELF_TEST_REQUEST['scm'])
+    if not scm_info or SELF_TEST_REQUEST['plan'] not in scm_info['plans']:
+        raise RuntimeError("Self-test: sample SCM plan missing from scms.json")
+    
+    engine = get_engine()
+    competitors = engine.get_available_competitors()[:1] if engine else []
+    report = generate_report(dict(
+        SELF_TEST_REQUEST,
+        competitors=competitors,
+        analysis_focus='all' if competitors else None
+    ))
+    for competitor in competitors:
+        if f"Semgrep vs {competitor}" not in report["html"]:
+            raise RuntimeError(f"Self-test: competitive analysis against {competitor} failed")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _write_report_file(os.path.join(tmp_dir, "self_test_matrix.html"), report["html"])
+        _write_report_file(os.path.join(tmp_dir, "self_test_matrix.csv"), report["csv"])
+    print("✅ Warm-up self-test passed")
+
+def start_background_tasks():
+    """Start per-process background threads; call in each worker after forking."""
+    interval = float(os.environ.get('MATRIX_RETENTION_SWEEP_INTERVAL', DEFAULT_SWEEP_INTERVAL))
+    if interval > 0:
+        _retention.start_background(interval)
+
+def create_app(preload=True, self_test=True):
+    """Application factory used by the production WSGI entry point (wsgi.py).
+    
+    Under a pre-forking server such as gunicorn with preload_app, this runs
+    once in the master so every worker inherits the loaded state copy-on-write.
+    """
+    if preload:
+        preload_shared_state()
+    if self_test:
+        run_warmup_self_test()
+    return app
+
+if __name__ == '__main__':
     print("\n=== Requirements Matrix Generator Web Interface ===")
-    print("Starting web server at http://127.0.0.1:5000")
+    create_app()
+    start_background_tasks()
+    print("Starting development server at http://127.0.0.1:5000")
+    print("For production use: gunicorn -c gunicorn.conf.py wsgi:app")
     print("Press Ctrl+C to stop the server")
     # Only enable debug if FLASK_DEBUG=1 in the environment
     debug_mode = os.environ.get('FLASK_DEBUG', '0') == '1'
-    app.run(debug=debug_mode, host='127.0.0.1', port=5000) 
\ No newline at end of file
+    app.run(debug=debug_mode, host='127.0.0.1', port=5000) 
@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+Production WSGI entry point.
+
+Builds the Requirements Matrix Generator app through its factory so the
+catalog, competitor data and rendered fragments are loaded once. Serve with:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+from web_interface import create_app
+
+app = create_app()